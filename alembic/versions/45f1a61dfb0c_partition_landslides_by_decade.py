@@ -0,0 +1,246 @@
+"""partition landslides by decade
+
+Revision ID: 45f1a61dfb0c
+Revises: 58fe806304aa
+Create Date: 2026-10-19 16:02:31.208734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from geoalchemy2 import Geometry
+
+# revision identifiers, used by Alembic.
+revision: str = '45f1a61dfb0c'
+down_revision: Union[str, Sequence[str], None] = '58fe806304aa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Partitions created up front, later decades are added on import (see
+# db.partitions)
+FIRST_DECADE, LAST_DECADE = 1900, 2020
+
+# Columns copied between the old and new table, geometry_3857 is generated
+COLUMNS = (
+    "id, datetime, report, report_source, report_url, "
+    "original_classification, geometry, classification_id, source_id"
+)
+
+VIEW = """
+    CREATE OR REPLACE VIEW public.landslides_view AS
+    SELECT
+        l.id,
+        l.datetime,
+        l.report,
+        l.report_source,
+        l.report_url,
+        l.original_classification,
+        c.name AS classification_name,
+        l.source_id,
+        s.name AS source_name,
+        s.doi AS source_doi,
+        l.geometry
+    FROM
+        public.landslides l
+    JOIN
+        public.classification c ON l.classification_id = c.id
+    JOIN
+        public.sources s ON l.source_id = s.id;
+"""
+
+# Body of public.landslides_clustered, see revision c2d0850cd6a8
+CLUSTERED_FUNCTION = """
+    CREATE OR REPLACE FUNCTION public.landslides_clustered(
+        z integer,
+        x integer,
+        y integer,
+        year_from integer DEFAULT 1,
+        year_to integer DEFAULT 9999,
+        classification text DEFAULT '',
+        cluster_until_zoom integer DEFAULT 10
+    )
+    RETURNS bytea
+    AS $$
+    DECLARE
+        tile bytea;
+        -- width of a grid cell in Web Mercator meters
+        cell_size float8 := 2 * 20037508.342789244 / (2 ^ z) / 16;
+    BEGIN
+        IF z <= cluster_until_zoom THEN
+            WITH bounds AS (
+                SELECT ST_TileEnvelope(z, x, y) AS geom
+            ),
+            filtered AS (
+                SELECT
+                    l.geometry_3857 AS geom,
+                    c.name AS classification_name
+                FROM public.landslides l
+                JOIN public.classification c ON l.classification_id = c.id,
+                    bounds
+                WHERE l.geometry_3857 && bounds.geom
+                    AND {year_filter}
+                    AND (
+                        classification = ''
+                        OR c.name = ANY(string_to_array(classification, ','))
+                    )
+            ),
+            per_classification AS (
+                SELECT
+                    floor(ST_X(geom) / cell_size) AS cell_x,
+                    floor(ST_Y(geom) / cell_size) AS cell_y,
+                    classification_name,
+                    count(*) AS n,
+                    ST_Collect(geom) AS geom
+                FROM filtered
+                GROUP BY 1, 2, 3
+            ),
+            clusters AS (
+                SELECT
+                    ST_Centroid(ST_Collect(geom)) AS geom,
+                    sum(n)::integer AS count,
+                    (array_agg(classification_name ORDER BY n DESC))[1]
+                        AS dominant_classification,
+                    jsonb_object_agg(classification_name, n)::text
+                        AS classification_counts
+                FROM per_classification
+                GROUP BY cell_x, cell_y
+            ),
+            mvt AS (
+                SELECT
+                    ST_AsMVTGeom(clusters.geom, bounds.geom) AS geom,
+                    count,
+                    dominant_classification,
+                    classification_counts
+                FROM clusters, bounds
+            )
+            SELECT ST_AsMVT(mvt, 'landslides_clustered', 4096, 'geom')
+            INTO tile
+            FROM mvt
+            WHERE geom IS NOT NULL;
+        ELSE
+            WITH bounds AS (
+                SELECT ST_TileEnvelope(z, x, y) AS geom
+            ),
+            mvt AS (
+                SELECT
+                    ST_AsMVTGeom(l.geometry_3857, bounds.geom) AS geom,
+                    l.id,
+                    l.datetime::text AS datetime,
+                    c.name AS classification_name,
+                    1 AS count
+                FROM public.landslides l
+                JOIN public.classification c ON l.classification_id = c.id,
+                    bounds
+                WHERE l.geometry_3857 && bounds.geom
+                    AND {year_filter}
+                    AND (
+                        classification = ''
+                        OR c.name = ANY(string_to_array(classification, ','))
+                    )
+            )
+            SELECT ST_AsMVT(mvt, 'landslides_clustered', 4096, 'geom')
+            INTO tile
+            FROM mvt
+            WHERE geom IS NOT NULL;
+        END IF;
+
+        RETURN tile;
+    END;
+    $$
+    LANGUAGE plpgsql STABLE PARALLEL SAFE;
+"""
+
+# Filters on the years of the events. A range on the partition key prunes
+# the decade partitions, an expression on it doesn't.
+YEAR_RANGE = (
+    "l.datetime >= make_date(year_from, 1, 1) "
+    "AND l.datetime < make_date(year_to + 1, 1, 1)"
+)
+YEAR_EXTRACT = "EXTRACT(YEAR FROM l.datetime) BETWEEN year_from AND year_to"
+
+
+def _landslides_columns() -> list[sa.Column]:
+    return [
+        sa.Column('id', sa.Integer(), server_default=sa.text("nextval('landslides_id_seq'::regclass)"), nullable=False),
+        sa.Column('datetime', sa.DateTime(), nullable=False),
+        sa.Column('report', sa.String(), nullable=True),
+        sa.Column('report_source', sa.String(), nullable=True),
+        sa.Column('report_url', sa.String(), nullable=True),
+        sa.Column('original_classification', sa.String(), nullable=False),
+        sa.Column('geometry', Geometry(geometry_type='POINT', srid=32632, dimension=2, spatial_index=False, from_text='ST_GeomFromEWKT', name='geometry', nullable=False), nullable=False),
+        sa.Column('geometry_3857', Geometry(geometry_type='POINT', srid=3857, dimension=2, spatial_index=False, from_text='ST_GeomFromEWKT', name='geometry'), sa.Computed('ST_Transform(geometry, 3857)', persisted=True), nullable=False),
+        sa.Column('classification_id', sa.Integer(), nullable=False),
+        sa.Column('source_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['classification_id'], ['classification.id'], ),
+        sa.ForeignKeyConstraint(['source_id'], ['sources.id'], ),
+    ]
+
+
+def _set_aside_landslides(name: str) -> None:
+    """Rename the current landslides table (and its relations, which would
+    clash with the new table) to `name`."""
+    op.execute("DROP VIEW IF EXISTS public.landslides_view;")
+    op.execute(f"ALTER TABLE public.landslides RENAME TO {name};")
+    op.execute(
+        f"ALTER TABLE public.{name} "
+        f"RENAME CONSTRAINT landslides_pkey TO {name}_pkey;"
+    )
+    op.execute("DROP INDEX public.idx_landslides_geometry;")
+    op.execute("DROP INDEX public.idx_landslides_geometry_3857;")
+
+
+def _move_landslides(name: str) -> None:
+    """Copy all records of `name` to the new landslides table and drop it.
+    The ID sequence is kept."""
+    op.execute("ALTER SEQUENCE landslides_id_seq OWNED BY public.landslides.id;")
+    op.execute(
+        f"INSERT INTO public.landslides ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM public.{name};"
+    )
+    op.execute(f"DROP TABLE public.{name} CASCADE;")
+
+    op.create_geospatial_index('idx_landslides_geometry', 'landslides', ['geometry'], unique=False, postgresql_using='gist', postgresql_ops={})
+    op.create_geospatial_index('idx_landslides_geometry_3857', 'landslides', ['geometry_3857'], unique=False, postgresql_using='gist', postgresql_ops={})
+    op.execute(VIEW)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _set_aside_landslides("landslides_unpartitioned")
+
+    # The partition key has to be part of the primary key
+    op.create_table('landslides',
+    *_landslides_columns(),
+    sa.PrimaryKeyConstraint('id', 'datetime'),
+    postgresql_partition_by='RANGE (datetime)'
+    )
+    op.execute(f"""
+        CREATE TABLE public.landslides_before_{FIRST_DECADE}
+        PARTITION OF public.landslides
+        FOR VALUES FROM (MINVALUE) TO ('{FIRST_DECADE}-01-01');
+    """)
+    for decade in range(FIRST_DECADE, LAST_DECADE + 1, 10):
+        op.execute(f"""
+            CREATE TABLE public.landslides_{decade}s
+            PARTITION OF public.landslides
+            FOR VALUES FROM ('{decade}-01-01') TO ('{decade + 10}-01-01');
+        """)
+
+    # Indexes on the partitioned table are created on each partition
+    _move_landslides("landslides_unpartitioned")
+    op.execute(CLUSTERED_FUNCTION.format(year_filter=YEAR_RANGE))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _set_aside_landslides("landslides_partitioned")
+
+    op.create_table('landslides',
+    *_landslides_columns(),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    # drops all partitions as well
+    _move_landslides("landslides_partitioned")
+    op.execute(CLUSTERED_FUNCTION.format(year_filter=YEAR_EXTRACT))
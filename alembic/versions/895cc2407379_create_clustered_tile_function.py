@@ -0,0 +1,139 @@
+"""create clustered tile function
+
+Revision ID: 895cc2407379
+Revises: 3f1a2b7c9d04
+Create Date: 2026-10-19 15:02:54.881406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '895cc2407379'
+down_revision: Union[str, Sequence[str], None] = '3f1a2b7c9d04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Function layer, automatically published by pg_tileserv. Up to zoom
+    # `cluster_until_zoom` points are aggregated on a 16x16 grid per tile,
+    # beyond single points are returned.
+    op.execute("""
+    CREATE OR REPLACE FUNCTION public.landslides_clustered(
+        z integer,
+        x integer,
+        y integer,
+        year_from integer DEFAULT 1,
+        year_to integer DEFAULT 9999,
+        classification text DEFAULT '',
+        cluster_until_zoom integer DEFAULT 10
+    )
+    RETURNS bytea
+    AS $$
+    DECLARE
+        tile bytea;
+        -- width of a grid cell in Web Mercator meters
+        cell_size float8 := 2 * 20037508.342789244 / (2 ^ z) / 16;
+    BEGIN
+        IF z <= cluster_until_zoom THEN
+            WITH bounds AS (
+                SELECT ST_TileEnvelope(z, x, y) AS geom
+            ),
+            filtered AS (
+                SELECT
+                    ST_Transform(l.geometry, 3857) AS geom,
+                    c.name AS classification_name
+                FROM public.landslides l
+                JOIN public.classification c ON l.classification_id = c.id,
+                    bounds
+                WHERE l.geometry && ST_Transform(bounds.geom, ST_SRID(l.geometry))
+                    AND EXTRACT(YEAR FROM l.datetime) BETWEEN year_from AND year_to
+                    AND (
+                        classification = ''
+                        OR c.name = ANY(string_to_array(classification, ','))
+                    )
+            ),
+            per_classification AS (
+                SELECT
+                    floor(ST_X(geom) / cell_size) AS cell_x,
+                    floor(ST_Y(geom) / cell_size) AS cell_y,
+                    classification_name,
+                    count(*) AS n,
+                    ST_Collect(geom) AS geom
+                FROM filtered
+                GROUP BY 1, 2, 3
+            ),
+            clusters AS (
+                SELECT
+                    ST_Centroid(ST_Collect(geom)) AS geom,
+                    sum(n)::integer AS count,
+                    (array_agg(classification_name ORDER BY n DESC))[1]
+                        AS dominant_classification,
+                    jsonb_object_agg(classification_name, n)::text
+                        AS classification_counts
+                FROM per_classification
+                GROUP BY cell_x, cell_y
+            ),
+            mvt AS (
+                SELECT
+                    ST_AsMVTGeom(clusters.geom, bounds.geom) AS geom,
+                    count,
+                    dominant_classification,
+                    classification_counts
+                FROM clusters, bounds
+            )
+            SELECT ST_AsMVT(mvt, 'landslides_clustered', 4096, 'geom')
+            INTO tile
+            FROM mvt
+            WHERE geom IS NOT NULL;
+        ELSE
+            WITH bounds AS (
+                SELECT ST_TileEnvelope(z, x, y) AS geom
+            ),
+            mvt AS (
+                SELECT
+                    ST_AsMVTGeom(
+                        ST_Transform(l.geometry, 3857), bounds.geom
+                    ) AS geom,
+                    l.id,
+                    l.datetime::text AS datetime,
+                    c.name AS classification_name,
+                    1 AS count
+                FROM public.landslides l
+                JOIN public.classification c ON l.classification_id = c.id,
+                    bounds
+                WHERE l.geometry && ST_Transform(bounds.geom, ST_SRID(l.geometry))
+                    AND EXTRACT(YEAR FROM l.datetime) BETWEEN year_from AND year_to
+                    AND (
+                        classification = ''
+                        OR c.name = ANY(string_to_array(classification, ','))
+                    )
+            )
+            SELECT ST_AsMVT(mvt, 'landslides_clustered', 4096, 'geom')
+            INTO tile
+            FROM mvt
+            WHERE geom IS NOT NULL;
+        END IF;
+
+        RETURN tile;
+    END;
+    $$
+    LANGUAGE plpgsql STABLE PARALLEL SAFE;
+
+    COMMENT ON FUNCTION public.landslides_clustered IS
+        'Landslides clustered on a grid up to cluster_until_zoom, single '
+        'events beyond. Filter by year_from, year_to and classification '
+        '(comma-separated names).';
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+    DROP FUNCTION IF EXISTS public.landslides_clustered(
+        integer, integer, integer, integer, integer, text, integer
+    );
+    """)
@@ -0,0 +1,53 @@
+"""unique sources
+
+Revision ID: 9ec3ffee8769
+Revises: 6b53cd7fdf10
+Create Date: 2026-10-19 14:02:11.512946
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9ec3ffee8769'
+down_revision: Union[str, Sequence[str], None] = '6b53cd7fdf10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Previous imports added a new source record on every run. Point all
+    # landslides to the first record of each (name, downloaded) pair and
+    # remove the redundant ones.
+    op.execute("""
+        WITH canonical AS (
+            SELECT
+                id,
+                MIN(id) OVER (PARTITION BY name, downloaded) AS keep_id
+            FROM public.sources
+        )
+        UPDATE public.landslides l
+        SET source_id = c.keep_id
+        FROM canonical c
+        WHERE l.source_id = c.id AND c.id <> c.keep_id;
+
+        DELETE FROM public.sources s
+        USING public.sources k
+        WHERE s.name = k.name
+            AND s.downloaded = k.downloaded
+            AND s.id > k.id;
+    """)
+    op.create_unique_constraint(
+        'sources_name_downloaded_key', 'sources', ['name', 'downloaded']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(
+        'sources_name_downloaded_key', 'sources', type_='unique'
+    )
@@ -0,0 +1,150 @@
+"""add web mercator geometry
+
+Revision ID: c2d0850cd6a8
+Revises: 895cc2407379
+Create Date: 2026-10-19 15:20:13.094532
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from geoalchemy2 import Geometry
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2d0850cd6a8'
+down_revision: Union[str, Sequence[str], None] = '895cc2407379'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Body of public.landslides_clustered, see revision 895cc2407379
+CLUSTERED_FUNCTION = """
+    CREATE OR REPLACE FUNCTION public.landslides_clustered(
+        z integer,
+        x integer,
+        y integer,
+        year_from integer DEFAULT 1,
+        year_to integer DEFAULT 9999,
+        classification text DEFAULT '',
+        cluster_until_zoom integer DEFAULT 10
+    )
+    RETURNS bytea
+    AS $$
+    DECLARE
+        tile bytea;
+        -- width of a grid cell in Web Mercator meters
+        cell_size float8 := 2 * 20037508.342789244 / (2 ^ z) / 16;
+    BEGIN
+        IF z <= cluster_until_zoom THEN
+            WITH bounds AS (
+                SELECT ST_TileEnvelope(z, x, y) AS geom
+            ),
+            filtered AS (
+                SELECT
+                    {geom} AS geom,
+                    c.name AS classification_name
+                FROM public.landslides l
+                JOIN public.classification c ON l.classification_id = c.id,
+                    bounds
+                WHERE {bbox_filter}
+                    AND EXTRACT(YEAR FROM l.datetime) BETWEEN year_from AND year_to
+                    AND (
+                        classification = ''
+                        OR c.name = ANY(string_to_array(classification, ','))
+                    )
+            ),
+            per_classification AS (
+                SELECT
+                    floor(ST_X(geom) / cell_size) AS cell_x,
+                    floor(ST_Y(geom) / cell_size) AS cell_y,
+                    classification_name,
+                    count(*) AS n,
+                    ST_Collect(geom) AS geom
+                FROM filtered
+                GROUP BY 1, 2, 3
+            ),
+            clusters AS (
+                SELECT
+                    ST_Centroid(ST_Collect(geom)) AS geom,
+                    sum(n)::integer AS count,
+                    (array_agg(classification_name ORDER BY n DESC))[1]
+                        AS dominant_classification,
+                    jsonb_object_agg(classification_name, n)::text
+                        AS classification_counts
+                FROM per_classification
+                GROUP BY cell_x, cell_y
+            ),
+            mvt AS (
+                SELECT
+                    ST_AsMVTGeom(clusters.geom, bounds.geom) AS geom,
+                    count,
+                    dominant_classification,
+                    classification_counts
+                FROM clusters, bounds
+            )
+            SELECT ST_AsMVT(mvt, 'landslides_clustered', 4096, 'geom')
+            INTO tile
+            FROM mvt
+            WHERE geom IS NOT NULL;
+        ELSE
+            WITH bounds AS (
+                SELECT ST_TileEnvelope(z, x, y) AS geom
+            ),
+            mvt AS (
+                SELECT
+                    ST_AsMVTGeom({geom}, bounds.geom) AS geom,
+                    l.id,
+                    l.datetime::text AS datetime,
+                    c.name AS classification_name,
+                    1 AS count
+                FROM public.landslides l
+                JOIN public.classification c ON l.classification_id = c.id,
+                    bounds
+                WHERE {bbox_filter}
+                    AND EXTRACT(YEAR FROM l.datetime) BETWEEN year_from AND year_to
+                    AND (
+                        classification = ''
+                        OR c.name = ANY(string_to_array(classification, ','))
+                    )
+            )
+            SELECT ST_AsMVT(mvt, 'landslides_clustered', 4096, 'geom')
+            INTO tile
+            FROM mvt
+            WHERE geom IS NOT NULL;
+        END IF;
+
+        RETURN tile;
+    END;
+    $$
+    LANGUAGE plpgsql STABLE PARALLEL SAFE;
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.add_column('landslides', sa.Column('geometry_3857', Geometry(geometry_type='POINT', srid=3857, dimension=2, spatial_index=False, from_text='ST_GeomFromEWKT', name='geometry'), sa.Computed('ST_Transform(geometry, 3857)', persisted=True), nullable=False))
+    op.create_geospatial_index('idx_landslides_geometry_3857', 'landslides', ['geometry_3857'], unique=False, postgresql_using='gist', postgresql_ops={})
+    # ### end Alembic commands ###
+
+    # Clip and filter tiles on the stored Web Mercator geometries instead
+    # of re-projecting every point per request
+    op.execute(CLUSTERED_FUNCTION.format(
+        geom='l.geometry_3857',
+        bbox_filter='l.geometry_3857 && bounds.geom',
+    ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(CLUSTERED_FUNCTION.format(
+        geom='ST_Transform(l.geometry, 3857)',
+        bbox_filter=(
+            'l.geometry && ST_Transform(bounds.geom, ST_SRID(l.geometry))'
+        ),
+    ))
+
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_geospatial_index('idx_landslides_geometry_3857', table_name='landslides', postgresql_using='gist', column_name='geometry_3857')
+    op.drop_column('landslides', 'geometry_3857')
+    # ### end Alembic commands ###
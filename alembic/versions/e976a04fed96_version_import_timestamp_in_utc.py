@@ -0,0 +1,44 @@
+"""version import timestamp in utc
+
+Revision ID: e976a04fed96
+Revises: 3b8e51f0c9a7
+Create Date: 2026-10-19 20:11:52.430218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e976a04fed96'
+down_revision: Union[str, Sequence[str], None] = '3b8e51f0c9a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # now() was stored in the time zone of the session, convert existing
+    # timestamps to UTC (assuming the time zone of this session)
+    op.execute(
+        "UPDATE public.version "
+        "SET imported_at = imported_at::timestamptz AT TIME ZONE 'UTC';"
+    )
+    op.alter_column('version', 'imported_at',
+               existing_type=sa.DateTime(),
+               server_default=sa.text("timezone('utc', now())"),
+               existing_nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('version', 'imported_at',
+               existing_type=sa.DateTime(),
+               server_default=sa.text('now()'),
+               existing_nullable=False)
+    op.execute(
+        "UPDATE public.version "
+        "SET imported_at = (imported_at AT TIME ZONE 'UTC')::timestamp;"
+    )
@@ -0,0 +1,30 @@
+# Audit the data base for potential duplicates across all sources
+from pathlib import Path
+
+import typer
+
+from db.audit import audit_duplicates
+
+
+def audit(
+    output_file: Path = Path("./db-dump/duplicate-audit.csv"),
+    search_radius_meters: float = 2000,
+    days: int = 0,
+):
+    """Find all pairs of events within `search_radius_meters` and `days` of
+    each other, grouped into clusters, and write them to a CSV or Parquet
+    file.
+
+    Args:
+        output_file (Path, optional): CSV or Parquet file. Defaults to
+            ./db-dump/duplicate-audit.csv.
+        search_radius_meters (float, optional): Maximum distance of two
+            events. Defaults to 2000.
+        days (int, optional): Maximum number of days between two events.
+            Defaults to 0, i.e., the same date.
+    """
+    audit_duplicates(search_radius_meters, days, output_file=output_file)
+
+
+if __name__ == "__main__":
+    typer.run(audit)
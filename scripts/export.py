@@ -1,21 +1,27 @@
 # Connect to the db and export the landslide_view as GeoPackage
 from pathlib import Path
 
-import geopandas as gpd
+import typer
 
-from db.utils import create_db_session
+from db.export import EXPORT_FILE, export_full, export_incremental
 
-out_path = Path("./db-dump")
-out_path.mkdir(parents=True, exist_ok=True)
-out_file = out_path / "ocomma-db.gpkg"
 
-# always remove file (overwriting a GeoPackage leads to issues!)
-out_file.unlink(missing_ok=True)
+def export(out_file: Path = EXPORT_FILE, full: bool = False):
+    """Export the landslides_view as GeoPackage. An existing export is
+    updated incrementally (new records are appended, removed ones deleted).
 
-Session = create_db_session()
-with Session() as session:
-    landslide_view = gpd.read_postgis(
-        "SELECT * FROM landslides_view", session.bind, geom_col="geometry"
-    )
-    landslide_view.to_file(out_file, driver="GPKG")
-    print("Exported!")
+    Args:
+        out_file (Path, optional): The GeoPackage. Defaults to
+            ./db-dump/ocomma-db.gpkg.
+        full (bool, optional): Re-write the whole export. Defaults to False.
+    """
+    if full:
+        n_exported = export_full(out_file)
+        print(f"Exported {n_exported} records!")
+    else:
+        n_appended, n_deleted = export_incremental(out_file)
+        print(f"Exported! Appended {n_appended}, deleted {n_deleted} records.")
+
+
+if __name__ == "__main__":
+    typer.run(export)
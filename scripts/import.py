@@ -1,51 +1,175 @@
 # Dedicated import script
+import asyncio
 from pathlib import Path
 
 import typer
 
-from db import WLV, GeoSphere, GlobalFatalLandslides, LandKaernten, Nasa
-from db.utils import import_version
+from db import get_processor
+from db.aggregates import refresh_grid
+from db.maintenance import optimize as optimize_db
+from db.runs import finish_run, start_run
+from db.settings import BACKEND
+from db.utils import import_version, max_landslide_id
 
 in_base_path, out_base_path = (
     Path("./data/raw"),
     Path("./data/processed-layers"),
 )
 
+# Processors are resolved by name, only the selected ones are imported
 processors = [
     # GeoSphere must be first, to populate the classification table
-    (GeoSphere, "geosphere/geosphere.gpkg"),
+    ("GeoSphere", "geosphere/geosphere.gpkg"),
     (
-        GlobalFatalLandslides,
+        "GlobalFatalLandslides",
         "global-fatal-landslides/global-fatal-landslides.gpkg",
     ),
-    (Nasa, "nasa-coolr/nasa-coolr-reports-point.gpkg"),
-    (WLV, "wlv/wlv.gpkg"),
-    (LandKaernten, "kaernten/kaernten.gpkg"),
+    ("Nasa", "nasa-coolr/nasa-coolr-reports-point.gpkg"),
+    ("WLV", "wlv/wlv.gpkg"),
+    ("LandKaernten", "kaernten/kaernten.gpkg"),
 ]
 
 
-def import_data(dump_layers: bool = False):
+def _file_dump(rel_path: str, dump_layers: bool) -> Path | None:
+    if not dump_layers:
+        return None
+
+    out_path = out_base_path / rel_path
+    # create parent folders if they don't exist
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    return out_path
+
+
+async def _import_data_async(
+    selected: list[tuple[str, str]],
+    dump_layers: bool,
+    chunk_size: int | None,
+    run_id: int | None,
+    resilient: bool = False,
+) -> dict[str, dict[str, int]]:
+    """Read and process all sources concurrently, while importing them one
+    after the other in the order of `processors`. The order is kept, as the
+    duplicate check of each source relies on all previously imported ones.
+    Returns the counts per source.
+    """
+
+    async def prepare(name, rel_path):
+        proc = await asyncio.to_thread(
+            get_processor(name),
+            file_path=in_base_path / rel_path,
+            chunk_size=chunk_size,
+        )
+        proc.run_id = run_id
+        proc.resilient = resilient
+        await proc.prepare_async()
+        return proc
+
+    tasks = [
+        asyncio.create_task(prepare(name, rel_path))
+        for name, rel_path in selected
+    ]
+    counts = {}
+    for (name, rel_path), task in zip(selected, tasks, strict=True):
+        proc = await task
+        file_dump = _file_dump(rel_path, dump_layers)
+        if chunk_size is None:
+            await proc.import_to_db_async(file_dump=file_dump)
+        else:
+            await proc.run_async(file_dump=file_dump)
+        counts[name] = proc.counts
+    return counts
+
+
+def import_data(
+    dump_layers: bool = False,
+    chunk_size: int | None = None,
+    use_async: bool = False,
+    optimize: bool = False,
+    sources: list[str] | None = None,
+    resilient: bool = False,
+):
     """Import and process data files from various sources.
 
     Args:
         dump_layers (bool, optional): Dump each processed data source as an
             individual file. Defaults to False.
+        chunk_size (int | None, optional): Stream each source in chunks of
+            this many features to bound memory usage. By default, each
+            source is read at once.
+        use_async (bool, optional): Process all sources concurrently and
+            import them with the asyncio engine. Defaults to False.
+        optimize (bool, optional): Cluster the records spatially after the
+            import. Rewrites and locks the landslides table, use it for
+            large imports (e.g., the initial one). The statistics are
+            refreshed and the indexes verified after every import. Defaults
+            to False.
+        sources (list[str] | None, optional): Names of the processors to
+            run, e.g., `--sources Nasa --sources WLV`. By default, all.
+        resilient (bool, optional): Quarantine records which fail to insert
+            (e.g., violate a constraint) and import all others, instead of
+            rolling back the whole batch. Defaults to False.
     """
-    # Add the current package version to a dedicated table
+    names = [name for name, _ in processors]
+    unknown = set(sources or []) - set(names)
+    if unknown:
+        raise typer.BadParameter(
+            f"Unknown sources {sorted(unknown)}, choose from {names}."
+        )
+    selected = [
+        (name, rel_path)
+        for name, rel_path in processors
+        if sources is None or name in sources
+    ]
+
+    # Records above are added by this import
+    since_id = max_landslide_id()
+    # The ledger of import runs is kept in PostGIS only
+    run_id = start_run() if BACKEND == "postgis" else None
+
+    counts = {}
+    try:
+        if use_async:
+            counts = asyncio.run(
+                _import_data_async(
+                    selected, dump_layers, chunk_size, run_id, resilient
+                )
+            )
+        else:
+            for name, rel_path in selected:
+                in_path = in_base_path / rel_path
+                proc = get_processor(name)(
+                    file_path=in_path, chunk_size=chunk_size
+                )
+                proc.run_id = run_id
+                proc.resilient = resilient
+                proc(file_dump=_file_dump(rel_path, dump_layers))
+                counts[name] = proc.counts
+    except Exception:
+        if run_id is not None:
+            # keep the counts of the sources imported so far
+            finish_run(run_id, counts, status="failed")
+        # records of the sources imported so far are committed
+        import_version()
+        raise
+
+    if run_id is not None:
+        status = finish_run(run_id, counts)
+        print(f"Import run {run_id} {status}.")
+    # Add the current package version to a dedicated table. The caches of
+    # db.query and the feature API (ETag, Last-Modified) are keyed on the
+    # latest version, hence it is added once the run completed (not upon
+    # start).
     import_version()
 
-    for proc_class, rel_path in processors:
-        in_path = in_base_path / rel_path
-        proc = proc_class(file_path=in_path)
+    if BACKEND == "embedded":
+        # aggregates and physical optimization are specific to PostGIS
+        return
 
-        if dump_layers:
-            out_path = out_base_path / rel_path
+    # Update the aggregates of all grid cells with new records
+    refresh_grid(since_id=since_id)
 
-            # create parent folders if they don't exist
-            out_path.parent.mkdir(parents=True, exist_ok=True)
-            proc(file_dump=out_path)
-        else:
-            proc()
+    # Vacuum, refresh the statistics and verify the indexes
+    optimize_db(cluster=optimize)
 
 
 if __name__ == "__main__":
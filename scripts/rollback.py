@@ -0,0 +1,19 @@
+# Remove all records of a single import run
+import typer
+
+from db.runs import rollback_run
+
+
+def rollback_import(run_id: int):
+    """Delete the records added by an import run (see the `import_runs`
+    table) and rebuild the grid aggregates. Re-render the tile cache
+    afterwards with `scripts/tiles.py --full`.
+
+    Args:
+        run_id (int): ID of the import run.
+    """
+    rollback_run(run_id)
+
+
+if __name__ == "__main__":
+    typer.run(rollback_import)
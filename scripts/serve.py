@@ -0,0 +1,18 @@
+# Serve the read-only feature API
+import typer
+
+from db.api import serve
+
+
+def serve_features(host: str = "127.0.0.1", port: int = 7801):
+    """Serve the landslides as GeoJSON/NDJSON features.
+
+    Args:
+        host (str, optional): Host to bind to. Defaults to 127.0.0.1.
+        port (int, optional): Port to listen on. Defaults to 7801.
+    """
+    serve(host=host, port=port)
+
+
+if __name__ == "__main__":
+    typer.run(serve_features)
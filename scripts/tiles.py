@@ -0,0 +1,37 @@
+# Pre-render the vector tiles after an import
+from pathlib import Path
+
+import typer
+
+from db.tiles import render_tiles
+
+
+def build_tile_cache(
+    output_file: Path = Path("./data/tiles/landslides.mbtiles"),
+    max_zoom: int = 12,
+    min_zoom: int = 0,
+    full: bool = False,
+    workers: int = 8,
+):
+    """Render the landslide vector tiles into an MBTiles file. Only tiles
+    touched by new records are re-rendered.
+
+    Args:
+        output_file (Path, optional): The MBTiles file. Defaults to
+            ./data/tiles/landslides.mbtiles.
+        max_zoom (int, optional): Highest zoom level. Defaults to 12.
+        min_zoom (int, optional): Lowest zoom level. Defaults to 0.
+        full (bool, optional): Re-render all tiles. Defaults to False.
+        workers (int, optional): Tiles rendered in parallel. Defaults to 8.
+    """
+    render_tiles(
+        output_file,
+        max_zoom=max_zoom,
+        min_zoom=min_zoom,
+        full=full,
+        workers=workers,
+    )
+
+
+if __name__ == "__main__":
+    typer.run(build_tile_cache)
@@ -1,7 +1,60 @@
-from db.processors.fatal_landslides import GlobalFatalLandslides
-from db.processors.geosphere import GeoSphere
-from db.processors.kaernten import LandKaernten
-from db.processors.nasa import Nasa
-from db.processors.wlv import WLV
+from importlib import import_module
+from importlib.metadata import entry_points
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from db.processors.base import BaseProcessor
+    from db.processors.fatal_landslides import GlobalFatalLandslides
+    from db.processors.geosphere import GeoSphere
+    from db.processors.kaernten import LandKaernten
+    from db.processors.nasa import Nasa
+    from db.processors.wlv import WLV
+
+# Built-in processors (class name -> module), imported on first access. Thus,
+# importing e.g. `db.models` does not load geopandas or the Austrian border.
+PROCESSORS = {
+    "GeoSphere": "db.processors.geosphere",
+    "GlobalFatalLandslides": "db.processors.fatal_landslides",
+    "Nasa": "db.processors.nasa",
+    "WLV": "db.processors.wlv",
+    "LandKaernten": "db.processors.kaernten",
+}
+# Additional processors can be registered by other packages under this entry
+# point group, e.g., `MySource = "my_package.processors:MySource"`
+ENTRY_POINT_GROUP = "ocomma_db.processors"
+
+
+def get_processor(name: str) -> type["BaseProcessor"]:
+    """
+    Resolve a processor class by name, either a built-in one or one
+    registered under the `ocomma_db.processors` entry point group.
+
+    Args:
+        name (str): Name of the processor, e.g., "GeoSphere".
+    Returns:
+        type[BaseProcessor]: The processor class.
+    """
+    if name in PROCESSORS:
+        return getattr(import_module(PROCESSORS[name]), name)
+
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP, name=name):
+        return entry_point.load()
+
+    raise ValueError(
+        f"Unknown processor {name}. Available: {available_processors()}"
+    )
+
+
+def available_processors() -> list[str]:
+    """Names of all built-in and registered processors."""
+    registered = [ep.name for ep in entry_points(group=ENTRY_POINT_GROUP)]
+    return [*PROCESSORS, *sorted(set(registered) - set(PROCESSORS))]
+
+
+def __getattr__(name: str):
+    if name in PROCESSORS:
+        return get_processor(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ["GlobalFatalLandslides", "GeoSphere", "Nasa", "WLV", "LandKaernten"]
@@ -0,0 +1,111 @@
+from sqlalchemy import text
+
+from db.constants import TARGET_CRS
+from db.utils import create_db_engine
+
+# Edge lengths (in meters) of the square grids, a coarse one for overviews
+# and a finer one for heatmaps
+GRID_CELL_SIZES = (1_000, 10_000)
+
+# Cells (indices) of all landslides with an ID above :since_id
+_AFFECTED_CELLS = """
+    SELECT DISTINCT
+        floor(ST_X(geometry) / :cell_size)::integer AS cell_x,
+        floor(ST_Y(geometry) / :cell_size)::integer AS cell_y
+    FROM public.landslides
+    WHERE id > :since_id
+"""
+
+_DELETE_CELLS = text(f"""
+    DELETE FROM public.landslides_grid g
+    USING ({_AFFECTED_CELLS}) a
+    WHERE g.cell_size = :cell_size
+        AND g.cell_x = a.cell_x
+        AND g.cell_y = a.cell_y
+""")
+
+# Aggregates all landslides within the affected cells; the envelope of each
+# cell restricts the join via the spatial index, the cell indices assign
+# points on a cell border to a single cell
+_INSERT_CELLS = text(f"""
+    INSERT INTO public.landslides_grid (
+        cell_size, cell_x, cell_y, year, classification_id, source_id,
+        count, geometry
+    )
+    SELECT
+        :cell_size,
+        cell_x,
+        cell_y,
+        year,
+        classification_id,
+        source_id,
+        count(*),
+        ST_MakeEnvelope(
+            cell_x * :cell_size,
+            cell_y * :cell_size,
+            (cell_x + 1) * :cell_size,
+            (cell_y + 1) * :cell_size,
+            :srid
+        )
+    FROM (
+        SELECT
+            a.cell_x,
+            a.cell_y,
+            EXTRACT(YEAR FROM l.datetime)::integer AS year,
+            l.classification_id,
+            l.source_id
+        FROM ({_AFFECTED_CELLS}) a
+        JOIN public.landslides l
+            ON l.geometry && ST_MakeEnvelope(
+                a.cell_x * :cell_size,
+                a.cell_y * :cell_size,
+                (a.cell_x + 1) * :cell_size,
+                (a.cell_y + 1) * :cell_size,
+                :srid
+            )
+        WHERE floor(ST_X(l.geometry) / :cell_size)::integer = a.cell_x
+            AND floor(ST_Y(l.geometry) / :cell_size)::integer = a.cell_y
+    ) AS cells
+    GROUP BY cell_x, cell_y, year, classification_id, source_id
+""")
+
+
+def refresh_grid(since_id: int = 0) -> int:
+    """Refresh the `landslides_grid` aggregates of all cells containing
+    landslides with an ID above `since_id`. Only these cells are
+    re-aggregated (from all of their landslides), the remaining rows are
+    kept.
+
+    Args:
+        since_id (int, optional): Highest landslide ID already reflected in
+            the aggregates, i.e., the maximum ID before an import. Defaults
+            to 0, which rebuilds the whole grid. An empty grid is always
+            rebuilt.
+
+    Returns:
+        int: Number of (re-)aggregated rows.
+    """
+    engine = create_db_engine()
+    n_rows = 0
+    with engine.begin() as conn:
+        # an empty grid (e.g., right after the migration) is built at once
+        if since_id > 0 and not conn.scalar(
+            text("SELECT EXISTS (SELECT 1 FROM public.landslides_grid)")
+        ):
+            since_id = 0
+        if since_id == 0:
+            conn.execute(text("TRUNCATE public.landslides_grid"))
+
+        for cell_size in GRID_CELL_SIZES:
+            params = {
+                "cell_size": cell_size,
+                "since_id": since_id,
+                "srid": TARGET_CRS,
+            }
+            if since_id > 0:
+                conn.execute(_DELETE_CELLS, params)
+            n_rows += conn.execute(_INSERT_CELLS, params).rowcount
+    engine.dispose()
+
+    print(f"Refreshed {n_rows} rows of the landslides grid.")
+    return n_rows
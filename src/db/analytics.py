@@ -0,0 +1,224 @@
+from importlib.resources import files
+from pathlib import Path
+
+import pandas as pd
+
+from db.constants import TARGET_CRS_SRS
+
+try:
+    import duckdb
+except ImportError as e:
+    raise ImportError(
+        "The analytics module requires duckdb, install the `analytics` "
+        "extra, e.g., `uv sync --extra analytics`."
+    ) from e
+
+EXPORT_FILE = Path("./db-dump/ocomma-db.gpkg")
+PROCESSED_LAYERS_DIR = Path("./data/processed-layers")
+NUTS_FILE = files("db").joinpath("data/NUTS_RG_03M_2024_4326.gpkg")
+
+
+def _literal(value: str | Path) -> str:
+    """Quoted SQL string literal, e.g., of a path, for statements that don't
+    take prepared parameters (views, COPY)."""
+    return "'{}'".format(str(value).replace("'", "''"))
+
+
+class Analytics:
+    """
+    Embedded DuckDB (with the spatial extension) over exported or processed
+    layers, no data base server needed. Files are attached as views with the
+    geometry column `geom` (in the CRS of the data base); queries run
+    multi-threaded.
+
+    Example:
+        >>> analytics = Analytics()
+        >>> analytics.attach("./db-dump/ocomma-db.gpkg", "landslides")
+        >>> analytics.yearly_counts()
+    """
+
+    def __init__(self, threads: int | None = None):
+        """
+        Args:
+            threads (int | None, optional): Number of threads used by DuckDB.
+                By default, all cores.
+        """
+        self.con = duckdb.connect()
+        self.con.install_extension("spatial")
+        self.con.load_extension("spatial")
+        if threads is not None:
+            self.con.execute(f"SET threads = {int(threads)}")
+
+    def attach(self, path: str | Path, name: str) -> str:
+        """
+        Attach a GeoPackage (read with GDAL) or a GeoParquet file as view.
+
+        Args:
+            path (str | Path): File to attach.
+            name (str): Name of the view.
+        Returns:
+            str: Name of the view.
+        """
+        path = Path(path)
+        if path.suffix == ".parquet":
+            source = (
+                f"SELECT * EXCLUDE (geometry), geometry AS geom "
+                f"FROM read_parquet({_literal(path)})"
+            )
+        else:
+            source = f"SELECT * FROM ST_Read({_literal(path)})"
+        self.con.execute(f'CREATE OR REPLACE VIEW "{name}" AS {source}')
+        return name
+
+    def attach_defaults(self) -> list[str]:
+        """Attach the export (`db-dump/ocomma-db.gpkg`) as `landslides` and
+        each processed layer (`data/processed-layers`) by its file name,
+        e.g., `wlv`. Missing files are skipped.
+
+        Returns:
+            list[str]: Names of the attached views.
+        """
+        names = []
+        if EXPORT_FILE.exists():
+            names.append(self.attach(EXPORT_FILE, "landslides"))
+        for path in sorted(PROCESSED_LAYERS_DIR.glob("*/*.gpkg")):
+            names.append(self.attach(path, path.stem.replace("-", "_")))
+        return names
+
+    def sql(
+        self, query: str, params: dict | list | None = None
+    ) -> pd.DataFrame:
+        """Run an ad-hoc query, returns the result as DataFrame."""
+        return self.con.execute(query, params).df()
+
+    def to_parquet(self, name: str, output_file: str | Path):
+        """Write an attached view as GeoParquet."""
+        self.con.execute(
+            f'COPY (SELECT * FROM "{name}") TO {_literal(output_file)} '
+            "(FORMAT parquet)"
+        )
+
+    def yearly_counts(self, table: str = "landslides") -> pd.DataFrame:
+        """Number of events per year, source and classification of the
+        (exported) landslides."""
+        return self.sql(f"""
+            SELECT
+                year(datetime) AS year,
+                source_name,
+                classification_name,
+                count(*) AS count
+            FROM "{table}"
+            GROUP BY ALL
+            ORDER BY ALL
+        """)
+
+    def regional_counts(
+        self, table: str = "landslides", level: int = 2
+    ) -> pd.DataFrame:
+        """
+        Number of events per Austrian NUTS region.
+
+        Args:
+            table (str, optional): Attached view. Defaults to "landslides".
+            level (int, optional): NUTS level, 2 for the federal states, 3
+                for groups of districts. Defaults to 2.
+        Returns:
+            pd.DataFrame: NUTS ID, name and number of events per region.
+        """
+        return self.sql(
+            f"""
+            WITH regions AS (
+                SELECT NUTS_ID, NAME_LATN, geom
+                FROM ST_Read({_literal(NUTS_FILE)})
+                WHERE CNTR_CODE = 'AT' AND LEVL_CODE = $level
+            ),
+            events AS (
+                SELECT ST_Transform(
+                    geom, '{TARGET_CRS_SRS}', 'EPSG:4326', always_xy := true
+                ) AS geom
+                FROM "{table}"
+            )
+            SELECT
+                r.NUTS_ID AS nuts_id,
+                r.NAME_LATN AS name,
+                count(e.geom) AS count
+            FROM regions r
+            LEFT JOIN events e ON ST_Contains(r.geom, e.geom)
+            GROUP BY ALL
+            ORDER BY count DESC
+            """,
+            {"level": level},
+        )
+
+    def cross_source_overlap(
+        self, table: str = "landslides", search_radius_meters: int = 2000
+    ) -> pd.DataFrame:
+        """
+        Events with a counterpart of another source at the same date within
+        `search_radius_meters` (the criteria of the duplicate check), per
+        pair of sources.
+
+        Args:
+            table (str, optional): Attached view. Defaults to "landslides".
+            search_radius_meters (int, optional): Search radius. Defaults to
+                2000.
+        Returns:
+            pd.DataFrame: Source, other source and the number of events of
+            the source with a counterpart.
+        """
+        return self.sql(
+            f"""
+            SELECT
+                a.source_name AS source,
+                b.source_name AS other_source,
+                count(DISTINCT a.id) AS count
+            FROM "{table}" a
+            JOIN "{table}" b
+                ON a.datetime::DATE = b.datetime::DATE
+                AND a.source_name <> b.source_name
+                AND ST_DWithin(a.geom, b.geom, $radius)
+            GROUP BY ALL
+            ORDER BY ALL
+            """,
+            {"radius": search_radius_meters},
+        )
+
+    def nearest_events(
+        self,
+        x: float,
+        y: float,
+        k: int = 5,
+        crs: str = TARGET_CRS_SRS,
+        table: str = "landslides",
+    ) -> pd.DataFrame:
+        """
+        The `k` events nearest to a location.
+
+        Args:
+            x (float): X coordinate (longitude for EPSG:4326).
+            y (float): Y coordinate (latitude for EPSG:4326).
+            k (int, optional): Number of events. Defaults to 5.
+            crs (str, optional): CRS of the location. Defaults to the CRS of
+                the data base.
+            table (str, optional): Attached view. Defaults to "landslides".
+        Returns:
+            pd.DataFrame: Events (without geometry) and their distance in
+            meters, nearest first.
+        """
+        return self.sql(
+            f"""
+            WITH location AS (
+                SELECT ST_Transform(
+                    ST_Point($x, $y), $crs, '{TARGET_CRS_SRS}',
+                    always_xy := true
+                ) AS geom
+            )
+            SELECT
+                l.* EXCLUDE (geom),
+                ST_Distance(l.geom, location.geom) AS distance
+            FROM "{table}" l, location
+            ORDER BY distance
+            LIMIT $k
+            """,
+            {"x": x, "y": y, "crs": crs, "k": k},
+        )
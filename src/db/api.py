@@ -0,0 +1,248 @@
+import hashlib
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from geoalchemy2.functions import ST_AsGeoJSON, ST_Transform
+from sqlalchemy import select
+
+from db.query import filter_landslides, landslides_view, latest_import
+from db.utils import create_db_engine
+
+# Attributes returned as feature properties
+PROPERTIES = (
+    "datetime",
+    "report",
+    "report_source",
+    "report_url",
+    "original_classification",
+    "classification_name",
+    "source_id",
+    "source_name",
+    "source_doi",
+)
+DEFAULT_LIMIT, MAX_LIMIT = 1000, 10_000
+# Rows fetched per round-trip from the server-side cursor
+FETCH_SIZE = 500
+
+MEDIA_TYPES = {
+    "geojson": "application/geo+json",
+    "ndjson": "application/x-ndjson",
+}
+
+
+class BadRequestError(ValueError):
+    pass
+
+
+def _as_utc(timestamp: datetime) -> datetime:
+    # version.imported_at is stored without time zone in UTC
+    return timestamp.replace(tzinfo=timezone.utc)
+
+
+def _etag(version_id: int, path: str) -> str:
+    # a new import changes the tags of all requests
+    return '"{}"'.format(
+        hashlib.sha1(f"{version_id}:{path}".encode()).hexdigest()
+    )
+
+
+def parse_params(query: str) -> dict:
+    """
+    Parse the query string of a /landslides request.
+
+    Supported parameters: `bbox` (xmin,ymin,xmax,ymax in EPSG:4326), `start`
+    & `end` (ISO 8601), `classification` (repeatable or comma-separated),
+    `after_id` & `limit` (keyset pagination) and `f` (geojson or ndjson).
+    """
+    params = parse_qs(query)
+
+    def single(name: str) -> str | None:
+        values = params.get(name)
+        return values[-1] if values else None
+
+    try:
+        parsed = {
+            "after_id": int(single("after_id") or 0) or None,
+            "limit": int(single("limit") or DEFAULT_LIMIT),
+            "start": single("start")
+            and datetime.fromisoformat(single("start")),
+            "end": single("end") and datetime.fromisoformat(single("end")),
+        }
+        if single("bbox"):
+            bbox = tuple(float(v) for v in single("bbox").split(","))
+            if len(bbox) != 4:
+                raise BadRequestError("bbox requires four values.")
+            parsed["bbox"] = bbox
+    except ValueError as e:
+        raise BadRequestError(str(e)) from e
+
+    if not 0 < parsed["limit"] <= MAX_LIMIT:
+        raise BadRequestError(f"limit must be within 1 and {MAX_LIMIT}.")
+
+    classifications = [
+        name
+        for value in params.get("classification", [])
+        for name in value.split(",")
+        if name
+    ]
+    if classifications:
+        parsed["classifications"] = classifications
+
+    output_format = single("f") or "geojson"
+    if output_format not in MEDIA_TYPES:
+        raise BadRequestError(f"f must be one of {tuple(MEDIA_TYPES)}.")
+    parsed["f"] = output_format
+
+    return parsed
+
+
+class FeatureHandler(BaseHTTPRequestHandler):
+    """Read-only access to the `landslides_view` as GeoJSON or NDJSON."""
+
+    # chunked transfer encoding is needed for streamed responses
+    protocol_version = "HTTP/1.1"
+    engine = None
+
+    def do_GET(self):  # noqa: N802
+        url = urlsplit(self.path)
+        if url.path != "/landslides":
+            self._send_error(HTTPStatus.NOT_FOUND, "Use /landslides")
+            return
+
+        try:
+            params = parse_params(url.query)
+        except BadRequestError as e:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+            return
+
+        # Responses only change once an import run completed
+        version_id, imported_at = latest_import()
+        etag = _etag(version_id, self.path)
+        if self._not_modified(etag, imported_at):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self._send_cache_headers(etag, imported_at)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        output_format = params.pop("f")
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", MEDIA_TYPES[output_format])
+        self.send_header("Transfer-Encoding", "chunked")
+        self._send_cache_headers(etag, imported_at)
+        self.end_headers()
+
+        if output_format == "geojson":
+            self._stream_geojson(url.query, params)
+        else:
+            self._stream_ndjson(params)
+        # terminating chunk
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _features(self, params: dict):
+        """Yield (id, feature) of the requested page, fetched with a
+        server-side cursor."""
+        stmt = filter_landslides(
+            select(
+                landslides_view.c.id,
+                *(landslides_view.c[name] for name in PROPERTIES),
+                ST_AsGeoJSON(
+                    ST_Transform(landslides_view.c.geometry, 4326)
+                ).label("geojson"),
+            ),
+            crs=4326,
+            **params,
+        )
+        with self.engine.connect() as conn:
+            rows = conn.execution_options(
+                stream_results=True, yield_per=FETCH_SIZE
+            ).execute(stmt)
+            for row in rows:
+                properties = json.dumps(
+                    {name: row._mapping[name] for name in PROPERTIES},
+                    default=str,
+                )
+                # the geometry is already serialized by PostGIS
+                yield (
+                    row.id,
+                    f'{{"type":"Feature","id":{row.id},'
+                    f'"geometry":{row.geojson},"properties":{properties}}}',
+                )
+
+    def _stream_geojson(self, query: str, params: dict):
+        self._write_chunk('{"type":"FeatureCollection","features":[')
+        n_features, last_id = 0, None
+        for feature_id, feature in self._features(params):
+            self._write_chunk(("," if n_features else "") + feature)
+            n_features, last_id = n_features + 1, feature_id
+
+        links = []
+        if n_features == params["limit"]:
+            # keyset pagination, continue after the last returned ID
+            next_query = parse_qs(query)
+            next_query["after_id"] = [str(last_id)]
+            links.append(
+                {
+                    "rel": "next",
+                    "type": MEDIA_TYPES["geojson"],
+                    "href": f"/landslides?{urlencode(next_query, doseq=True)}",
+                }
+            )
+        self._write_chunk(
+            f'],"numberReturned":{n_features},"links":{json.dumps(links)}}}'
+        )
+
+    def _stream_ndjson(self, params: dict):
+        # the next page starts after the ID of the last feature
+        for _, feature in self._features(params):
+            self._write_chunk(feature + "\n")
+
+    def _write_chunk(self, text: str):
+        data = text.encode()
+        self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+
+    def _not_modified(self, etag: str, imported_at: datetime | None) -> bool:
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            return etag in (tag.strip() for tag in if_none_match.split(","))
+
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since and imported_at is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            if since.tzinfo is None:
+                since = _as_utc(since)
+            return _as_utc(imported_at).replace(microsecond=0) <= since
+        return False
+
+    def _send_cache_headers(self, etag: str, imported_at: datetime | None):
+        self.send_header("ETag", etag)
+        if imported_at is not None:
+            self.send_header(
+                "Last-Modified",
+                format_datetime(_as_utc(imported_at), usegmt=True),
+            )
+        # clients and proxies may cache, but have to revalidate
+        self.send_header("Cache-Control", "public, no-cache")
+
+    def _send_error(self, status: HTTPStatus, message: str):
+        body = json.dumps({"error": message}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve(host: str = "127.0.0.1", port: int = 7801):
+    """Serve the feature API until interrupted."""
+    FeatureHandler.engine = create_db_engine()
+    with ThreadingHTTPServer((host, port), FeatureHandler) as server:
+        print(f"Serving landslides on http://{host}:{port}/landslides")
+        server.serve_forever()
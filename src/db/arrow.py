@@ -0,0 +1,222 @@
+import json
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import cache
+from typing import Any
+
+import geopandas as gpd
+import pandas as pd
+from sqlalchemy import Executable, make_url, text
+from sqlalchemy.dialects import postgresql
+
+from db.constants import TARGET_CRS
+from db.settings import DB_URI
+from db.utils import create_db_engine
+
+try:
+    import adbc_driver_postgresql.dbapi as adbc_postgresql
+except ImportError:
+    # the `arrow` extra is not installed, fall back to gpd.read_postgis
+    adbc_postgresql = None
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+ARROW_AVAILABLE = adbc_postgresql is not None and pa is not None
+
+# Renders bound parameters as $1, $2, ... as expected by libpq
+_DIALECT = postgresql.psycopg.dialect(paramstyle="numeric_dollar")
+
+
+@cache
+def _adbc_uri() -> str:
+    return (
+        make_url(DB_URI)
+        .set(drivername="postgresql")
+        .render_as_string(hide_password=False)
+    )
+
+
+@cache
+def _engine():
+    return create_db_engine()
+
+
+def _compile(
+    query: str | Executable, params: dict[str, Any] | None
+) -> tuple[str, list[Any]]:
+    """Compile a query into SQL with positional parameters."""
+    if isinstance(query, str):
+        query = text(query)
+    compiled = query.compile(
+        dialect=_DIALECT, compile_kwargs={"render_postcompile": True}
+    )
+    values = compiled.construct_params(params)
+    return compiled.string, [values[name] for name in compiled.positiontup]
+
+
+@contextmanager
+def snapshot() -> Iterator[Any]:
+    """
+    Open a connection whose reads all see the same snapshot of the data
+    base (a read-only REPEATABLE READ transaction). Pass it as `connection`
+    to the read functions of this module.
+
+    Yields:
+        An ADBC connection with the `arrow` extra, otherwise a SQLAlchemy
+        connection.
+    """
+    if not ARROW_AVAILABLE:
+        with _engine().connect() as conn:
+            conn = conn.execution_options(isolation_level="REPEATABLE READ")
+            with conn.begin():
+                yield conn
+        return
+
+    # without autocommit, the connection is in a transaction, the snapshot
+    # is taken by its first query
+    with (
+        adbc_postgresql.connect(_adbc_uri(), autocommit=False) as conn,
+        conn.cursor() as cursor,
+    ):
+        cursor.execute(
+            "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY"
+        )
+        try:
+            yield conn
+        finally:
+            conn.rollback()
+
+
+def read_arrow(
+    query: str | Executable,
+    params: dict[str, Any] | None = None,
+    connection: Any = None,
+) -> "pa.Table":
+    """
+    Fetch a result set as Arrow table via ADBC, i.e., with the binary COPY
+    protocol of PostgreSQL and without creating Python objects per value.
+    Geometries are returned as (E)WKB.
+
+    Args:
+        query (str | Executable): SQL string or SQLAlchemy statement.
+        params (dict[str, Any] | None, optional): Values of named
+            parameters. Defaults to None.
+        connection (optional): ADBC connection, e.g., of `snapshot()`. By
+            default, a new connection is opened.
+    Returns:
+        pa.Table: The result set.
+    """
+    if not ARROW_AVAILABLE:
+        raise ImportError(
+            "Fetching Arrow tables requires adbc-driver-postgresql and "
+            "pyarrow, install the `arrow` extra, e.g., "
+            "`uv sync --extra arrow`."
+        )
+    sql, values = _compile(query, params)
+    if connection is not None:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, values or None)
+            return cursor.fetch_arrow_table()
+
+    with (
+        adbc_postgresql.connect(_adbc_uri()) as conn,
+        conn.cursor() as cursor,
+    ):
+        cursor.execute(sql, values or None)
+        return cursor.fetch_arrow_table()
+
+
+def read_dataframe(
+    query: str | Executable,
+    params: dict[str, Any] | None = None,
+    connection: Any = None,
+) -> pd.DataFrame:
+    """
+    Read a query without geometries into a DataFrame, fetched as Arrow table
+    with the `arrow` extra (see `read_arrow()`), otherwise by
+    `pd.read_sql`.
+
+    Args:
+        query (str | Executable): SQL string or SQLAlchemy statement.
+        params (dict[str, Any] | None, optional): Values of named
+            parameters. Defaults to None.
+        connection (optional): Connection of `snapshot()`. By default, a new
+            connection is opened.
+    Returns:
+        pd.DataFrame: The result set.
+    """
+    if not ARROW_AVAILABLE:
+        if isinstance(query, str):
+            query = text(query)
+        return pd.read_sql(query, connection or _engine(), params=params)
+    return read_arrow(query, params, connection).to_pandas()
+
+
+def read_geodataframe(
+    query: str | Executable,
+    params: dict[str, Any] | None = None,
+    geom_col: str = "geometry",
+    crs: int = TARGET_CRS,
+    connection: Any = None,
+) -> gpd.GeoDataFrame:
+    """
+    Read a query into a GeoDataFrame. With the `arrow` extra, the result is
+    fetched as Arrow table (see `read_arrow()`) and geometries are decoded
+    by GEOS in one go; otherwise `gpd.read_postgis` is used.
+
+    Args:
+        query (str | Executable): SQL string or SQLAlchemy statement.
+        params (dict[str, Any] | None, optional): Values of named
+            parameters. Defaults to None.
+        geom_col (str, optional): Geometry column. Defaults to "geometry".
+        crs (int, optional): CRS of the geometries. Defaults to TARGET_CRS.
+        connection (optional): Connection of `snapshot()`. By default, a new
+            connection is opened.
+    Returns:
+        gpd.GeoDataFrame: The result set.
+    """
+    if not ARROW_AVAILABLE:
+        if isinstance(query, str):
+            query = text(query)
+        return gpd.read_postgis(
+            query,
+            connection or _engine(),
+            geom_col=geom_col,
+            crs=crs,
+            params=params,
+        )
+
+    return _to_geodataframe(
+        read_arrow(query, params, connection), geom_col, crs
+    )
+
+
+def _to_geodataframe(
+    table: "pa.Table", geom_col: str, crs: int
+) -> gpd.GeoDataFrame:
+    """Decode the (E)WKB geometry column of an Arrow table."""
+    index = table.schema.get_field_index(geom_col)
+    column = _storage(table.column(index))
+    # mark as GeoArrow WKB, which geopandas decodes vectorized
+    field = pa.field(geom_col, column.type).with_metadata(
+        {
+            "ARROW:extension:name": "geoarrow.wkb",
+            "ARROW:extension:metadata": json.dumps({"crs": f"EPSG:{crs}"}),
+        }
+    )
+    table = table.set_column(index, field, column)
+    return gpd.GeoDataFrame.from_arrow(table, geometry=geom_col)
+
+
+def _storage(column: "pa.ChunkedArray") -> "pa.ChunkedArray":
+    """Unwrap the storage of any extension type, including the opaque type
+    (a BaseExtensionType, not an ExtensionType) ADBC uses for PostGIS
+    types."""
+    if not isinstance(column.type, pa.BaseExtensionType):
+        return column
+    return pa.chunked_array(
+        [chunk.storage for chunk in column.chunks],
+        type=column.type.storage_type,
+    )
@@ -0,0 +1,131 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from db.utils import create_db_engine
+
+# Pairs of landslides within a radius and a window of days, each pair once
+# (a.id < b.id). The nested loop probes the spatial index of `b` for each
+# record of `a`; the time window prunes partitions.
+_DUPLICATE_PAIRS = text("""
+    SELECT
+        a.id AS id_a,
+        b.id AS id_b,
+        a.source_id AS source_id_a,
+        b.source_id AS source_id_b,
+        sa.name AS source_a,
+        sb.name AS source_b,
+        ST_Distance(a.geometry, b.geometry) AS distance,
+        abs(b.datetime::date - a.datetime::date) AS days_apart
+    FROM public.landslides a
+    JOIN public.landslides b
+        ON ST_DWithin(b.geometry, a.geometry, :search_radius_meters)
+        AND b.datetime >= a.datetime::date - CAST(:days AS integer)
+        AND b.datetime < a.datetime::date + CAST(:days AS integer) + 1
+        AND b.id > a.id
+    JOIN public.sources sa ON sa.id = a.source_id
+    JOIN public.sources sb ON sb.id = b.source_id
+    ORDER BY a.id, b.id
+""")
+
+
+def find_duplicate_pairs(
+    search_radius_meters: float = 2000, days: int = 0
+) -> pd.DataFrame:
+    """
+    Find all pairs of potential duplicates in the `landslides` table with
+    a single spatial-temporal self-join.
+
+    Args:
+        search_radius_meters (float, optional): Maximum distance of two
+            events. Defaults to 2000.
+        days (int, optional): Maximum number of days between two events,
+            0 for the same date. Defaults to 0.
+    Returns:
+        pd.DataFrame: One row per pair with the IDs, source IDs and names,
+        distance (in meters) and days between the events.
+    """
+    with create_db_engine().connect() as conn:
+        return pd.read_sql(
+            _DUPLICATE_PAIRS,
+            conn,
+            params={
+                "search_radius_meters": search_radius_meters,
+                "days": days,
+            },
+        )
+
+
+def cluster_pairs(id_a: np.ndarray, id_b: np.ndarray) -> np.ndarray:
+    """
+    Group pairs into clusters (connected components), e.g., three events
+    within the radius of each other form a single cluster.
+
+    Args:
+        id_a (np.ndarray): First ID of each pair.
+        id_b (np.ndarray): Second ID of each pair.
+    Returns:
+        np.ndarray: Cluster of each pair, identified by its smallest ID.
+    """
+    ids, index = np.unique(np.concatenate([id_a, id_b]), return_inverse=True)
+    index_a, index_b = np.split(index, 2)
+    labels = np.arange(len(ids))
+    while True:
+        # propagate the smallest label along the pairs, then shortcut
+        new_labels = labels.copy()
+        np.minimum.at(new_labels, index_a, labels[index_b])
+        np.minimum.at(new_labels, index_b, labels[index_a])
+        new_labels = new_labels[new_labels]
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+    return ids[labels[index_a]]
+
+
+def audit_duplicates(
+    search_radius_meters: float = 2000,
+    days: int = 0,
+    output_file: str | Path | None = None,
+) -> pd.DataFrame:
+    """
+    Audit the whole data base for potential duplicates (within and across
+    sources). Pairs are grouped into clusters and optionally written to a
+    CSV or Parquet file.
+
+    Args:
+        search_radius_meters (float, optional): Maximum distance of two
+            events. Defaults to 2000.
+        days (int, optional): Maximum number of days between two events,
+            0 for the same date. Defaults to 0.
+        output_file (str | Path | None, optional): CSV or Parquet file
+            (by suffix). Defaults to None.
+    Returns:
+        pd.DataFrame: The pairs (see `find_duplicate_pairs()`) with their
+        `cluster_id`, sorted by cluster.
+    """
+    pairs = find_duplicate_pairs(search_radius_meters, days)
+    pairs.insert(
+        0,
+        "cluster_id",
+        cluster_pairs(pairs["id_a"].to_numpy(), pairs["id_b"].to_numpy()),
+    )
+    pairs = pairs.sort_values(
+        ["cluster_id", "id_a", "id_b"], ignore_index=True
+    )
+
+    cross_source = pairs["source_id_a"] != pairs["source_id_b"]
+    print(
+        f"Found {len(pairs)} pairs ({cross_source.sum()} across sources) in "
+        f"{pairs['cluster_id'].nunique()} clusters."
+    )
+
+    if output_file is not None:
+        output_file = Path(output_file)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        if output_file.suffix == ".parquet":
+            pairs.to_parquet(output_file, index=False)
+        else:
+            pairs.to_csv(output_file, index=False)
+    return pairs
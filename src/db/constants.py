@@ -1,8 +1,11 @@
 # Sets CRS as constant which is used for all data base records
+from functools import cache
 from importlib.resources import files
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import geopandas as gpd
+if TYPE_CHECKING:
+    import geopandas as gpd
 
 TARGET_CRS = 32632
 TARGET_CRS_SRS = f"EPSG:{TARGET_CRS}"
@@ -11,10 +14,12 @@ TARGET_CRS_SRS = f"EPSG:{TARGET_CRS}"
 def _read_austrian_border(
     input_file: str | Path = None,
     to_target_crs: bool = True,
-) -> gpd.GeoDataFrame:
+) -> "gpd.GeoDataFrame":
     """From an Eurostat NUTS file:
     https://ec.europa.eu/eurostat/web/gisco/geodata/statistical-units/territorial-units-statistics
     """
+    import geopandas as gpd
+
     if input_file is None:
         # Load from package resources
         input_file = files().joinpath("data/NUTS_RG_03M_2024_4326.gpkg")
@@ -30,4 +35,13 @@ def _read_austrian_border(
     return austria
 
 
-AUSTRIA = _read_austrian_border()
+@cache
+def _austria() -> "gpd.GeoDataFrame":
+    return _read_austrian_border()
+
+
+def __getattr__(name: str):
+    # The border is only read on first access of `AUSTRIA`
+    if name == "AUSTRIA":
+        return _austria()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,190 @@
+from functools import cache
+from importlib.resources import files
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+
+from db.settings import CORRECTIONS_FILE
+
+# Columns of a corrections file, one field override per row. Rows sharing
+# source, date and location form a single correction. Coordinates are given
+# in TARGET_CRS, the tolerance (maximum distance of a record) in meters.
+COLUMNS = ("source", "date", "x", "y", "tolerance", "field", "value")
+DEFAULT_TOLERANCE = 1.0
+
+
+class SourceCorrections:
+    """
+    Manual corrections of a single source. A correction applies to all
+    records on its date within its tolerance; if multiple corrections match
+    a record, the closest one is used.
+
+    The correction points are indexed once (STRtree), such that all records
+    of a data set (or chunk) are matched with a single vectorized join:
+    records are pre-filtered by a hash lookup of their date, the remaining
+    ones are queried against the spatial index and the candidate pairs are
+    checked for the exact date and tolerance.
+    """
+
+    def __init__(self, corrections: pd.DataFrame):
+        """
+        Args:
+            corrections (pd.DataFrame): Rows of a corrections file (see
+                `COLUMNS`) of one source.
+        """
+        locations = ["date", "x", "y", "tolerance"]
+        # one column per overridden field, missing if not overridden
+        self.overrides = corrections.pivot_table(
+            index=locations, columns="field", values="value", aggfunc="last"
+        )
+        keys = self.overrides.index.to_frame(index=False)
+        self.overrides = self.overrides.reset_index(drop=True)
+
+        self.dates = keys["date"].to_numpy(dtype="datetime64[D]")
+        self.tolerance = keys["tolerance"].to_numpy(dtype=float)
+        self.points = shapely.points(keys["x"], keys["y"])
+        self.tree = shapely.STRtree(self.points)
+        self._date_index = pd.Index(np.unique(self.dates))
+
+    def __len__(self) -> int:
+        return len(self.overrides)
+
+    def match(
+        self, dates: np.ndarray, geometries: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Match records against the corrections.
+
+        Args:
+            dates (np.ndarray): Dates of the records (datetime64[D]).
+            geometries (np.ndarray): Point geometries of the records (in
+                TARGET_CRS).
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Positions of the matched records
+            and of their (closest) correction.
+        """
+        (candidates,) = np.nonzero(self._date_index.get_indexer(dates) >= 0)
+        rows, ids = self.tree.query(
+            geometries[candidates],
+            predicate="dwithin",
+            distance=self.tolerance.max(),
+        )
+        rows = candidates[rows]
+        distance = shapely.distance(geometries[rows], self.points[ids])
+        valid = (dates[rows] == self.dates[ids]) & (
+            distance <= self.tolerance[ids]
+        )
+        rows, ids, distance = rows[valid], ids[valid], distance[valid]
+
+        # closest correction per record
+        order = np.lexsort((distance, rows))
+        rows, ids = rows[order], ids[order]
+        _, first = np.unique(rows, return_index=True)
+        return rows[first], ids[first]
+
+    def apply(self, data: gpd.GeoDataFrame, date_column: str) -> int:
+        """
+        Override the fields of all matching records (in place).
+
+        Args:
+            data (gpd.GeoDataFrame): Records in TARGET_CRS.
+            date_column (str): Column holding the date of the records.
+        Returns:
+            int: Number of corrected records.
+        """
+        if data.empty:
+            return 0
+        dates = (
+            pd.to_datetime(data[date_column])
+            .to_numpy()
+            .astype("datetime64[D]")
+        )
+        rows, ids = self.match(dates, data.geometry.to_numpy())
+        if not len(rows):
+            return 0
+
+        for field in self.overrides.columns:
+            if field not in data.columns:
+                raise KeyError(
+                    f"Correction of unknown field {field}, available fields: "
+                    f"{', '.join(map(str, data.columns))}."
+                )
+            values = self.overrides[field].to_numpy()[ids]
+            overridden = pd.notna(values)
+            column = data.columns.get_loc(field)
+            values = pd.Series(values[overridden]).astype(data[field].dtype)
+            data.iloc[rows[overridden], column] = values.to_numpy()
+        return len(rows)
+
+
+class Corrections:
+    """Manual corrections of all sources, see `read_corrections()`."""
+
+    def __init__(self, corrections: pd.DataFrame):
+        self._sources = {
+            source: SourceCorrections(group)
+            for source, group in corrections.groupby("source")
+        }
+
+    def __contains__(self, source: str) -> bool:
+        return source in self._sources
+
+    def apply(
+        self, source: str, data: gpd.GeoDataFrame, date_column: str
+    ) -> int:
+        """
+        Apply the corrections of a source to its records (in place).
+
+        Args:
+            source (str): Name of the source (data set).
+            data (gpd.GeoDataFrame): Records in TARGET_CRS.
+            date_column (str): Column holding the date of the records.
+        Returns:
+            int: Number of corrected records.
+        """
+        if source not in self._sources:
+            return 0
+        return self._sources[source].apply(data, date_column)
+
+
+def read_corrections(file_path: str | Path) -> Corrections:
+    """
+    Read a corrections file (CSV, lines starting with `#` are comments).
+    Each row overrides a single field of the records of a `source` on
+    `date` within `tolerance` meters (default 1 m) of the location `x`,
+    `y` (in TARGET_CRS).
+
+    Args:
+        file_path (str | Path): The corrections file.
+    Returns:
+        Corrections: The corrections.
+    """
+    corrections = pd.read_csv(
+        file_path,
+        comment="#",
+        dtype={"source": str, "field": str, "value": str},
+        skipinitialspace=True,
+    )
+    missing = set(COLUMNS) - set(corrections.columns)
+    if missing:
+        raise ValueError(
+            f"Corrections file {file_path} misses the columns "
+            f"{', '.join(sorted(missing))}."
+        )
+    corrections["date"] = pd.to_datetime(corrections["date"])
+    corrections["tolerance"] = corrections["tolerance"].fillna(
+        DEFAULT_TOLERANCE
+    )
+    return Corrections(corrections[list(COLUMNS)])
+
+
+@cache
+def corrections() -> Corrections:
+    """Corrections of `CORRECTIONS_FILE` (defaults to the corrections shipped
+    with the package), read once per process."""
+    if CORRECTIONS_FILE is None:
+        return read_corrections(files().joinpath("data/corrections.csv"))
+    return read_corrections(CORRECTIONS_FILE)
@@ -1,19 +1,87 @@
+import asyncio
+from collections.abc import Sequence
 from datetime import datetime
 
 import geopandas as gpd
 import pandas as pd
 from geoalchemy2.functions import ST_DWithin
 from geoalchemy2.shape import WKTElement
+from sqlalchemy import Connection, text
+from sqlalchemy.ext.asyncio import AsyncEngine
 from sqlalchemy.orm import Session
 
+from db.constants import TARGET_CRS
 from db.models import Landslides
 
+# Columns (and types) of the matches returned by resolve_duplicates()
+MATCH_COLUMNS = {
+    "landslide_id": "Int64",
+    "matched_source_id": "Int64",
+    "distance": "float64",
+    "days_apart": "Int64",
+}
+
+# Temporary table holding the candidates of resolve_duplicates()
+_CREATE_CANDIDATES = text(f"""
+    CREATE TEMPORARY TABLE duplicate_candidates (
+        candidate integer PRIMARY KEY,
+        datetime timestamp NOT NULL,
+        geometry geometry(POINT, {TARGET_CRS}) NOT NULL
+    ) ON COMMIT DROP
+""")
+_DROP_CANDIDATES = text("DROP TABLE IF EXISTS duplicate_candidates")
+_INSERT_CANDIDATE = text("""
+    INSERT INTO duplicate_candidates (candidate, datetime, geometry)
+    VALUES (:candidate, :datetime, ST_GeomFromEWKT(:geometry))
+""")
+_ANALYZE_CANDIDATES = text("ANALYZE duplicate_candidates")
+
+# Closest existing landslide of each candidate, see _duplicate_criteria()
+_MATCH_CANDIDATES = text("""
+    SELECT DISTINCT ON (c.candidate)
+        c.candidate,
+        l.id,
+        l.source_id,
+        ST_Distance(l.geometry, c.geometry) AS distance,
+        abs(l.datetime::date - c.datetime::date) AS days_apart
+    FROM duplicate_candidates c
+    JOIN public.landslides l
+        ON l.datetime = c.datetime::date
+        AND ST_DWithin(l.geometry, c.geometry, :search_radius_meters)
+        AND (
+            CAST(:max_landslide_id AS integer) IS NULL
+            OR l.id <= :max_landslide_id
+        )
+    ORDER BY c.candidate, distance, l.id
+""")
+
+
+def _duplicate_criteria(
+    landslide_datetime: datetime,
+    landslide_geom: WKTElement,
+    search_radius_meters: int,
+    max_landslide_id: int | None,
+) -> list:
+    """Filter criteria for existing landslides at the same date within a
+    given radius."""
+    criteria = [
+        # strip the time information, to account for temporal uncertainty
+        # duplicate check based on exact time info makes no sense
+        Landslides.datetime == landslide_datetime.date(),
+        ST_DWithin(Landslides.geometry, landslide_geom, search_radius_meters),
+    ]
+    if max_landslide_id is not None:
+        criteria.append(Landslides.id <= max_landslide_id)
+
+    return criteria
+
 
 def find_duplicate(
     session: Session,
     landslide_datetime: datetime,
     landslide_geom: WKTElement,
     search_radius_meters: int = 2000,
+    max_landslide_id: int | None = None,
 ) -> Landslides | None:
     """
     Checks for existing landslides at the same date within a given radius.
@@ -28,6 +96,9 @@ def find_duplicate(
         search_radius_meters (int, optional): Radius in meters within which an
             existing landslide is considered a potential duplicate. Defaults to
             2000.
+        max_landslide_id (int | None, optional): Only consider records up
+            to this ID, i.e., ignore the records of the ongoing import.
+            Defaults to None.
     Returns:
         Landslides | None: The first matching Landslides instance if a
         potential duplicate is found; otherwise None.
@@ -35,12 +106,12 @@ def find_duplicate(
     return (
         session.query(Landslides)
         .filter(
-            # strip the time information, to account for temporal uncertainty
-            # duplicate check based on exact time info makes no sense
-            Landslides.datetime == landslide_datetime.date(),
-            ST_DWithin(
-                Landslides.geometry, landslide_geom, search_radius_meters
-            ),
+            *_duplicate_criteria(
+                landslide_datetime,
+                landslide_geom,
+                search_radius_meters,
+                max_landslide_id,
+            )
         )
         .first()
     )
@@ -51,6 +122,7 @@ def is_duplicated(
     landslide_datetime: datetime,
     landslide_geom: WKTElement,
     search_radius_meters: int = 2000,
+    max_landslide_id: int | None = None,
 ) -> bool:
     """
     Boolean check for an existing event at the same date within a given radius.
@@ -65,6 +137,9 @@ def is_duplicated(
         search_radius_meters (int, optional): Radius in meters within which an
             existing landslide is considered a potential duplicate. Defaults to
             2000.
+        max_landslide_id (int | None, optional): Only consider records up
+            to this ID, i.e., ignore the records of the ongoing import.
+            Defaults to None.
     Returns:
         bool: True if a potential duplicate is found; otherwise False.
     """
@@ -73,11 +148,132 @@ def is_duplicated(
         landslide_datetime,
         landslide_geom,
         search_radius_meters,
+        max_landslide_id,
     )
 
     return result is not None
 
 
+def resolve_duplicates(
+    conn: Connection,
+    landslide_datetimes: Sequence[datetime],
+    landslide_geoms: Sequence[str],
+    search_radius_meters: int = 2000,
+    max_landslide_id: int | None = None,
+) -> pd.DataFrame:
+    """
+    Set-based variant of find_duplicate() for many landslides at once: the
+    candidates are loaded into a temporary table and matched with a single
+    join, using the same criteria (same date, within a radius). Of multiple
+    matches, the closest landslide is returned.
+
+    Args:
+        conn (Connection): Connection of the ongoing import transaction.
+        landslide_datetimes (Sequence[datetime]): Datetimes of the new
+            landslides.
+        landslide_geoms (Sequence[str]): EWKT geometries of the new
+            landslides, same order as `landslide_datetimes`.
+        search_radius_meters (int, optional): Radius in meters within which an
+            existing landslide is considered a potential duplicate. Defaults to
+            2000.
+        max_landslide_id (int | None, optional): Only consider records up
+            to this ID, i.e., ignore the records of the ongoing import.
+            Defaults to None.
+    Returns:
+        pd.DataFrame: In the input order, the matched `landslide_id` (NA if
+        there is no duplicate), its `matched_source_id`, the `distance` and
+        `days_apart`.
+    """
+    candidates = [
+        {"candidate": i, "datetime": landslide_datetime, "geometry": geom}
+        for i, (landslide_datetime, geom) in enumerate(
+            zip(landslide_datetimes, landslide_geoms, strict=True)
+        )
+    ]
+    matches = []
+    if candidates:
+        conn.execute(_DROP_CANDIDATES)
+        conn.execute(_CREATE_CANDIDATES)
+        conn.execute(_INSERT_CANDIDATE, candidates)
+        # statistics for the planner, the table is new
+        conn.execute(_ANALYZE_CANDIDATES)
+        matches = conn.execute(
+            _MATCH_CANDIDATES,
+            {
+                "search_radius_meters": search_radius_meters,
+                "max_landslide_id": max_landslide_id,
+            },
+        ).all()
+        conn.execute(_DROP_CANDIDATES)
+    return _matches_frame(matches, len(candidates))
+
+
+def _matches_frame(matches: list, n_candidates: int) -> pd.DataFrame:
+    """Matches (rows of _MATCH_CANDIDATES) in the order of the candidates."""
+    return (
+        pd.DataFrame(matches, columns=["candidate", *MATCH_COLUMNS])
+        .astype(MATCH_COLUMNS)
+        .set_index("candidate")
+        .reindex(range(n_candidates))
+        .reset_index(drop=True)
+    )
+
+
+async def resolve_duplicates_async(
+    engine: AsyncEngine,
+    landslide_datetimes: Sequence[datetime],
+    landslide_geoms: Sequence[str],
+    search_radius_meters: int = 2000,
+    max_landslide_id: int | None = None,
+    concurrency: int = 4,
+) -> pd.DataFrame:
+    """
+    Asynchronous variant of resolve_duplicates(). The candidates are split
+    into `concurrency` batches, each matched on its own pooled connection.
+
+    Args:
+        engine (AsyncEngine): Async engine used to check out connections.
+        landslide_datetimes (Sequence[datetime]): Datetimes of the new
+            landslides.
+        landslide_geoms (Sequence[str]): EWKT geometries of the new
+            landslides, same order as `landslide_datetimes`.
+        search_radius_meters (int, optional): Radius in meters within which an
+            existing landslide is considered a potential duplicate. Defaults to
+            2000.
+        max_landslide_id (int | None, optional): Only consider records up
+            to this ID, i.e., ignore the records of the ongoing import.
+            Defaults to None.
+        concurrency (int, optional): Number of concurrent connections.
+            Defaults to 4.
+    Returns:
+        pd.DataFrame: See resolve_duplicates().
+    """
+    landslide_datetimes = list(landslide_datetimes)
+    landslide_geoms = list(landslide_geoms)
+
+    async def resolve_batch(start: int, stop: int) -> pd.DataFrame:
+        async with engine.connect() as conn:
+            return await conn.run_sync(
+                resolve_duplicates,
+                landslide_datetimes[start:stop],
+                landslide_geoms[start:stop],
+                search_radius_meters,
+                max_landslide_id,
+            )
+
+    # contiguous batches, such that the results keep the input order
+    batch_size = max(1, -(-len(landslide_datetimes) // concurrency))
+    results = await asyncio.gather(
+        *(
+            resolve_batch(i, i + batch_size)
+            for i in range(0, len(landslide_datetimes), batch_size)
+        )
+    )
+    if not results:
+        return _matches_frame([], 0)
+    return pd.concat(results, ignore_index=True)
+
+
 def flag_temporal_duplicates(
     *,
     data: gpd.GeoDataFrame,
@@ -0,0 +1,314 @@
+from functools import cache
+from pathlib import Path
+from typing import Any, Dict, Iterable
+
+import geopandas as gpd
+import pandas as pd
+import pyogrio
+import shapely
+from shapely import STRtree
+
+from db.constants import TARGET_CRS
+from db.duplicates import MATCH_COLUMNS
+from db.settings import EMBEDDED_DB_PATH
+from db.utils import source_values_from_metadata
+
+# Columns of the landslides layer, see db.models.Landslides
+LANDSLIDES_COLUMNS = (
+    "id",
+    "datetime",
+    "report",
+    "report_source",
+    "report_url",
+    "original_classification",
+    "classification_id",
+    "source_id",
+    "run_id",
+)
+# Columns of the duplicate_links layer, see db.models.DuplicateLinks
+DUPLICATE_LINKS_COLUMNS = (
+    "id",
+    "landslide_id",
+    "matched_source_id",
+    "distance",
+    "days_apart",
+    "source_id",
+    "run_id",
+    "datetime",
+    "report",
+    "report_source",
+    "report_url",
+    "original_classification",
+)
+SOURCES_COLUMNS = (
+    "id",
+    "name",
+    "downloaded",
+    "modified",
+    "license",
+    "url",
+    "description",
+    "doi",
+)
+
+
+class EmbeddedStore:
+    """
+    In-process stand-in for the PostGIS data base, persisted as a single
+    GeoPackage with the layers `landslides`, `duplicate_links`,
+    `classification`, `sources` and `version`. All records are held in
+    memory; duplicate lookups query an STRtree (R-tree) over the stored
+    geometries.
+
+    Offers the operations of the import pipeline: reference data
+    (get-or-create), duplicate lookups (same date, within a radius) and
+    inserts. New landslides and duplicate links are appended to the file
+    right away.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        layers = (
+            set(pyogrio.list_layers(self.path)[:, 0])
+            if self.path.exists()
+            else set()
+        )
+
+        if "landslides" in layers:
+            self.landslides = gpd.read_file(self.path, layer="landslides")
+        else:
+            self.landslides = gpd.GeoDataFrame(
+                {
+                    name: pd.Series(dtype="int64" if "id" in name else object)
+                    for name in LANDSLIDES_COLUMNS
+                },
+                geometry=gpd.GeoSeries(crs=TARGET_CRS),
+            ).astype({"datetime": "datetime64[ms]"})
+        self.classification = self._read_table(
+            "classification", ("id", "name"), layers
+        )
+        self.sources = self._read_table("sources", SOURCES_COLUMNS, layers)
+        self.version = self._read_table(
+            "version", ("id", "imported_with_version"), layers
+        )
+        self.duplicate_links = self._read_table(
+            "duplicate_links", DUPLICATE_LINKS_COLUMNS, layers
+        )
+        # (number of landslides, max_landslide_id) -> tree, subset
+        self._tree_key = None
+        self._tree = None
+        self._tree_data = None
+
+    def _read_table(
+        self, layer: str, columns: tuple[str, ...], layers: set[str]
+    ) -> pd.DataFrame:
+        if layer in layers:
+            return pyogrio.read_dataframe(self.path, layer=layer)
+        return pd.DataFrame(columns=list(columns)).astype({"id": "int64"})
+
+    def _write_table(self, layer: str, data: pd.DataFrame):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        pyogrio.write_dataframe(data, self.path, layer=layer)
+
+    @staticmethod
+    def _next_id(data: pd.DataFrame) -> int:
+        return int(data["id"].max()) + 1 if not data.empty else 1
+
+    def classification_ids(self) -> dict[str, int]:
+        """Map classification names to their IDs."""
+        return dict(
+            zip(
+                self.classification["name"],
+                self.classification["id"].astype(int),
+                strict=True,
+            )
+        )
+
+    def ensure_classifications(self, names: Iterable[str]) -> int:
+        """Add all missing classifications, returns the number added."""
+        missing = sorted(set(names) - set(self.classification_ids()))
+        if not missing:
+            return 0
+
+        start = self._next_id(self.classification)
+        added = pd.DataFrame(
+            {"id": range(start, start + len(missing)), "name": missing}
+        )
+        self.classification = pd.concat(
+            [self.classification, added], ignore_index=True
+        )
+        self._write_table("classification", self.classification)
+        return len(missing)
+
+    def source_id(self, metadata: Dict[str, Any]) -> int:
+        """ID of a source (identified by name and download date), the source
+        is added if it does not exist yet."""
+        values = source_values_from_metadata(metadata)
+        downloaded = pd.to_datetime(self.sources["downloaded"]).dt.date
+        match = self.sources[
+            (self.sources["name"] == values["name"])
+            & (downloaded == values["downloaded"])
+        ]
+        if not match.empty:
+            return int(match["id"].iloc[0])
+
+        source_id = self._next_id(self.sources)
+        self.sources = pd.concat(
+            [self.sources, pd.DataFrame([{"id": source_id, **values}])],
+            ignore_index=True,
+        )
+        self._write_table("sources", self.sources)
+        return source_id
+
+    def add_version(self, version: str):
+        """Record the package version of an import."""
+        self.version = pd.concat(
+            [
+                self.version,
+                pd.DataFrame(
+                    [
+                        {
+                            "id": self._next_id(self.version),
+                            "imported_with_version": version,
+                        }
+                    ]
+                ),
+            ],
+            ignore_index=True,
+        )
+        self._write_table("version", self.version)
+
+    def max_landslide_id(self) -> int:
+        """Highest landslide ID, 0 if there are none."""
+        return self._next_id(self.landslides) - 1
+
+    def _spatial_index(
+        self, max_landslide_id: int | None
+    ) -> tuple[STRtree, gpd.GeoDataFrame]:
+        """STRtree over all landslides (up to `max_landslide_id`), re-built
+        only if records were added since."""
+        key = (len(self.landslides), max_landslide_id)
+        if key != self._tree_key:
+            data = self.landslides
+            if max_landslide_id is not None:
+                data = data[data["id"] <= max_landslide_id]
+            self._tree = STRtree(data.geometry.to_numpy())
+            self._tree_data = data
+            self._tree_key = key
+        return self._tree, self._tree_data
+
+    def resolve_duplicates(
+        self,
+        landslide_datetimes: Iterable,
+        landslide_geoms: gpd.GeoSeries,
+        search_radius_meters: int = 2000,
+        max_landslide_id: int | None = None,
+    ) -> pd.DataFrame:
+        """
+        Equivalent of db.duplicates.resolve_duplicates(): the closest stored
+        landslide at the date of each event (time info discarded) within
+        `search_radius_meters`.
+
+        Args:
+            landslide_datetimes (Iterable): Datetimes of the new events.
+            landslide_geoms (gpd.GeoSeries): Geometries of the new events
+                (in the CRS of the store).
+            search_radius_meters (int, optional): Search radius. Defaults to
+                2000.
+            max_landslide_id (int | None, optional): Only consider records
+                up to this ID. Defaults to None.
+        Returns:
+            pd.DataFrame: See db.duplicates.resolve_duplicates().
+        """
+        n_candidates = len(landslide_geoms)
+        tree, existing = self._spatial_index(max_landslide_id)
+        new_idx, existing_idx = tree.query(
+            landslide_geoms.to_numpy(),
+            predicate="dwithin",
+            distance=search_radius_meters,
+        )
+        # like the data base query, the stored datetime is compared with
+        # the date (i.e., midnight) of the new event
+        dates = pd.DatetimeIndex(landslide_datetimes).normalize().to_numpy()
+        same_date = (
+            existing["datetime"].to_numpy()[existing_idx] == dates[new_idx]
+        )
+        new_idx, existing_idx = new_idx[same_date], existing_idx[same_date]
+
+        matches = pd.DataFrame(
+            {
+                "candidate": new_idx,
+                "landslide_id": existing["id"].to_numpy()[existing_idx],
+                "matched_source_id": existing["source_id"].to_numpy()[
+                    existing_idx
+                ],
+                "distance": shapely.distance(
+                    landslide_geoms.to_numpy()[new_idx],
+                    existing.geometry.to_numpy()[existing_idx],
+                ),
+                "days_apart": 0,
+            }
+        )
+        return (
+            matches.sort_values(["candidate", "distance", "landslide_id"])
+            .drop_duplicates("candidate")
+            .set_index("candidate")
+            .reindex(range(n_candidates))
+            .reset_index(drop=True)
+            .astype(MATCH_COLUMNS)
+        )
+
+    @staticmethod
+    def _from_records(
+        records: list[dict], start_id: int, columns: tuple[str, ...]
+    ) -> gpd.GeoDataFrame:
+        """Records as built for the insert statements (EWKT geometries) as
+        layer with consecutive IDs."""
+        data = pd.DataFrame(records)
+        wkt = data.pop("geometry").str.split(";", n=1).str[-1]
+        return gpd.GeoDataFrame(
+            data.assign(id=range(start_id, start_id + len(data)))[
+                list(columns)
+            ],
+            geometry=shapely.from_wkt(wkt.to_numpy()),
+            crs=TARGET_CRS,
+        )
+
+    def _append(
+        self, layer: str, stored: gpd.GeoDataFrame, data: gpd.GeoDataFrame
+    ) -> gpd.GeoDataFrame:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data.to_file(
+            self.path,
+            layer=layer,
+            driver="GPKG",
+            mode="a" if not stored.empty else "w",
+        )
+        if stored.empty:
+            return data
+        return pd.concat([stored, data], ignore_index=True)
+
+    def insert(self, records: list[dict]) -> int:
+        """Append landslide records (see db.models.Landslides, as built for
+        the insert statement), returns the number of inserted records."""
+        data = self._from_records(
+            records, self.max_landslide_id() + 1, LANDSLIDES_COLUMNS
+        )
+        self.landslides = self._append("landslides", self.landslides, data)
+        return len(data)
+
+    def insert_links(self, links: list[dict]) -> None:
+        """Append duplicate links (see db.models.DuplicateLinks, as built
+        for the insert statement)."""
+        data = self._from_records(
+            links, self._next_id(self.duplicate_links), DUPLICATE_LINKS_COLUMNS
+        )
+        self.duplicate_links = self._append(
+            "duplicate_links", self.duplicate_links, data
+        )
+
+
+@cache
+def embedded_store() -> EmbeddedStore:
+    """The store at `EMBEDDED_DB_PATH`, shared by the whole process."""
+    return EmbeddedStore(EMBEDDED_DB_PATH)
@@ -0,0 +1,229 @@
+import sqlite3
+import xml.etree.ElementTree as ET
+from contextlib import closing
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pyogrio
+import shapely
+from sqlalchemy import text
+
+from db.arrow import read_dataframe, read_geodataframe, snapshot
+from db.gpkg import connect
+
+EXPORT_FILE = Path("./db-dump/ocomma-db.gpkg")
+# Layer metadata item holding the highest exported landslide ID
+WATERMARK_KEY = "OCOMMA_MAX_ID"
+
+NEW_ROWS_QUERY = text(
+    "SELECT * FROM landslides_view WHERE id > :watermark ORDER BY id"
+)
+EXPORTED_IDS_QUERY = text("SELECT id FROM landslides WHERE id <= :watermark")
+
+
+def read_watermark(out_file: str | Path) -> int | None:
+    """
+    Read the highest exported landslide ID from the layer metadata.
+
+    Args:
+        out_file (str | Path): The GeoPackage export.
+    Returns:
+        int | None: The watermark, None if there is no (valid) export.
+    """
+    out_file = Path(out_file)
+    if not out_file.exists():
+        return None
+    try:
+        metadata = pyogrio.read_info(out_file, layer=out_file.stem)[
+            "layer_metadata"
+        ]
+    except pyogrio.errors.DataLayerError:
+        return None
+    if not metadata or WATERMARK_KEY not in metadata:
+        return None
+    return int(metadata[WATERMARK_KEY])
+
+
+def export_full(out_file: str | Path = EXPORT_FILE) -> int:
+    """
+    Export the `landslides_view` into a new GeoPackage and record the
+    watermark for subsequent incremental exports.
+
+    Args:
+        out_file (str | Path, optional): The GeoPackage export. Defaults to
+            ./db-dump/ocomma-db.gpkg.
+    Returns:
+        int: Number of exported records.
+    """
+    out_file = Path(out_file)
+    out_file.parent.mkdir(parents=True, exist_ok=True)
+    # always remove file (overwriting a GeoPackage leads to issues!)
+    out_file.unlink(missing_ok=True)
+
+    landslide_view = read_geodataframe("SELECT * FROM landslides_view")
+    watermark = int(landslide_view["id"].max()) if len(landslide_view) else 0
+    landslide_view.to_file(
+        out_file,
+        driver="GPKG",
+        layer=out_file.stem,
+        layer_metadata={WATERMARK_KEY: str(watermark)},
+    )
+    return len(landslide_view)
+
+
+def export_incremental(out_file: str | Path = EXPORT_FILE) -> tuple[int, int]:
+    """
+    Update an existing export: records added since the last export are
+    appended, records removed from the data base (e.g., rolled back import
+    runs) are deleted, both read from the same snapshot of the data base.
+    All changes, including the spatial index (maintained by the GeoPackage
+    triggers) and the watermark, are written in a single transaction.
+    Without a previous export a full export is written.
+
+    Args:
+        out_file (str | Path, optional): The GeoPackage export. Defaults to
+            ./db-dump/ocomma-db.gpkg.
+    Returns:
+        tuple[int, int]: Number of appended and deleted records.
+    """
+    out_file = Path(out_file)
+    watermark = read_watermark(out_file)
+    if watermark is None:
+        return export_full(out_file), 0
+
+    # both queries see the same snapshot
+    with snapshot() as conn:
+        new_rows = read_geodataframe(
+            NEW_ROWS_QUERY, {"watermark": watermark}, connection=conn
+        )
+        db_ids = read_dataframe(
+            EXPORTED_IDS_QUERY, {"watermark": watermark}, connection=conn
+        )["id"].to_numpy(dtype="int64")
+
+    with closing(connect(out_file)) as gpkg:
+        try:
+            gpkg.execute("BEGIN IMMEDIATE")
+            n_deleted = _delete_removed(gpkg, out_file.stem, db_ids)
+            _append(gpkg, out_file.stem, new_rows)
+            if len(new_rows):
+                watermark = int(new_rows["id"].max())
+            _write_watermark(gpkg, out_file.stem, watermark)
+            gpkg.execute("COMMIT")
+        except Exception:
+            gpkg.execute("ROLLBACK")
+            raise
+    return len(new_rows), n_deleted
+
+
+def _to_gpkg_geometry(geometries: gpd.GeoSeries, srs_id: int) -> list[bytes]:
+    """Encode geometries as GeoPackage binary (little endian, without
+    envelope)."""
+    header = b"GP\x00\x01" + srs_id.to_bytes(4, "little", signed=True)
+    wkbs = shapely.to_wkb(geometries.values, byte_order=1)
+    return [None if wkb is None else header + wkb for wkb in wkbs]
+
+
+def _geometry_column(gpkg: sqlite3.Connection, layer: str) -> tuple[str, int]:
+    return gpkg.execute(
+        "SELECT column_name, srs_id FROM gpkg_geometry_columns "
+        "WHERE table_name = ?",
+        (layer,),
+    ).fetchone()
+
+
+def _append(
+    gpkg: sqlite3.Connection, layer: str, new_rows: gpd.GeoDataFrame
+) -> None:
+    if new_rows.empty:
+        return
+    geom_col, srs_id = _geometry_column(gpkg, layer)
+    columns = [
+        row[1]
+        for row in gpkg.execute(f'PRAGMA table_info("{layer}")')
+        if row[1] in new_rows.columns
+    ]
+    values = new_rows[columns].astype(object)
+    for column in values.columns:
+        if pd.api.types.is_datetime64_any_dtype(new_rows[column]):
+            values[column] = new_rows[column].map(_to_gpkg_datetime)
+    values = values.where(new_rows[columns].notna(), None)
+    values[geom_col] = _to_gpkg_geometry(new_rows.geometry, srs_id)
+
+    names = ", ".join(f'"{c}"' for c in values.columns)
+    placeholders = ", ".join("?" * len(values.columns))
+    gpkg.executemany(
+        f'INSERT INTO "{layer}" ({names}) VALUES ({placeholders})',
+        (
+            tuple(v.item() if isinstance(v, np.generic) else v for v in row)
+            for row in values.itertuples(index=False)
+        ),
+    )
+
+    min_x, min_y, max_x, max_y = new_rows.total_bounds
+    gpkg.execute(
+        "UPDATE gpkg_contents SET "
+        "min_x = min(coalesce(min_x, :min_x), :min_x), "
+        "min_y = min(coalesce(min_y, :min_y), :min_y), "
+        "max_x = max(coalesce(max_x, :max_x), :max_x), "
+        "max_y = max(coalesce(max_y, :max_y), :max_y), "
+        "last_change = strftime('%Y-%m-%dT%H:%M:%fZ', 'now') "
+        "WHERE table_name = :layer",
+        {
+            "min_x": min_x,
+            "min_y": min_y,
+            "max_x": max_x,
+            "max_y": max_y,
+            "layer": layer,
+        },
+    )
+
+
+def _to_gpkg_datetime(value: pd.Timestamp) -> str | None:
+    if pd.isna(value):
+        return None
+    timespec = "milliseconds" if value.microsecond else "seconds"
+    return value.isoformat(timespec=timespec)
+
+
+def _delete_removed(
+    gpkg: sqlite3.Connection, layer: str, db_ids: np.ndarray
+) -> int:
+    exported_ids = np.fromiter(
+        (row[0] for row in gpkg.execute(f'SELECT id FROM "{layer}"')),
+        dtype="int64",
+    )
+    removed = np.setdiff1d(exported_ids, db_ids, assume_unique=True)
+    if not len(removed):
+        return 0
+    gpkg.execute("CREATE TEMP TABLE removed_ids (id INTEGER PRIMARY KEY)")
+    gpkg.executemany(
+        "INSERT INTO removed_ids VALUES (?)", ((int(i),) for i in removed)
+    )
+    gpkg.execute(
+        f'DELETE FROM "{layer}" WHERE id IN (SELECT id FROM removed_ids)'
+    )
+    gpkg.execute("DROP TABLE removed_ids")
+    return len(removed)
+
+
+def _write_watermark(
+    gpkg: sqlite3.Connection, layer: str, watermark: int
+) -> None:
+    """Update the watermark in the GDAL layer metadata (XML)."""
+    md_id, metadata = gpkg.execute(
+        "SELECT m.id, m.metadata FROM gpkg_metadata m "
+        "JOIN gpkg_metadata_reference r ON r.md_file_id = m.id "
+        "WHERE r.reference_scope = 'table' AND r.table_name = ? "
+        "AND m.md_standard_uri = 'http://gdal.org'",
+        (layer,),
+    ).fetchone()
+    root = ET.fromstring(metadata)
+    for item in root.iter("MDI"):
+        if item.get("key") == WATERMARK_KEY:
+            item.text = str(watermark)
+    gpkg.execute(
+        "UPDATE gpkg_metadata SET metadata = ? WHERE id = ?",
+        (ET.tostring(root, encoding="unicode"), md_id),
+    )
@@ -0,0 +1,167 @@
+import sqlite3
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from importlib.util import find_spec
+from pathlib import Path
+
+import geopandas as gpd
+import pyogrio
+import shapely
+
+# Size of the GeoPackage geometry header depending on the envelope type
+ENVELOPE_SIZES = {0: 0, 1: 32, 2: 48, 3: 48, 4: 64}
+
+
+def connect(gpkg_file: str | Path) -> sqlite3.Connection:
+    """
+    Open a GeoPackage with SQLite (in autocommit mode, use explicit
+    transactions). Registers the SQL functions used by the R-tree triggers,
+    which are otherwise provided by GDAL.
+
+    Args:
+        gpkg_file (str | Path): The GeoPackage.
+    Returns:
+        sqlite3.Connection: The connection.
+    """
+    gpkg = sqlite3.connect(gpkg_file, isolation_level=None)
+    gpkg.create_function("ST_IsEmpty", 1, _is_empty, deterministic=True)
+    for i, name in enumerate(("ST_MinX", "ST_MinY", "ST_MaxX", "ST_MaxY")):
+        gpkg.create_function(
+            name,
+            1,
+            lambda blob, i=i: _bounds(blob)[i],
+            deterministic=True,
+        )
+    return gpkg
+
+
+def _is_empty(blob: bytes | None) -> int | None:
+    if blob is None:
+        return None
+    return int(bool(blob[3] & 0b10000))
+
+
+def _wkb(blob: bytes) -> bytes:
+    """Strip the GeoPackage header of a geometry."""
+    return blob[8 + ENVELOPE_SIZES[(blob[3] >> 1) & 0b111] :]
+
+
+def _bounds(blob: bytes) -> tuple[float, float, float, float]:
+    return shapely.from_wkb(_wkb(blob)).bounds
+
+
+def create_spatial_index(gpkg_file: str | Path) -> None:
+    """
+    Create the R-tree spatial index of a GeoPackage (single layer named
+    after the file) written without one. GDAL only creates the index along
+    with a new layer, bulk loaded once the layer is written. Hence, the
+    layer is streamed (as Arrow) into a new file, which replaces the
+    original.
+
+    Args:
+        gpkg_file (str | Path): The GeoPackage.
+    """
+    gpkg_file = Path(gpkg_file)
+    indexed_file = gpkg_file.with_suffix(".indexed.gpkg")
+    indexed_file.unlink(missing_ok=True)
+    with pyogrio.open_arrow(
+        gpkg_file, layer=gpkg_file.stem, use_pyarrow=False
+    ) as (meta, stream):
+        pyogrio.write_arrow(
+            stream,
+            indexed_file,
+            layer=gpkg_file.stem,
+            driver="GPKG",
+            geometry_name=meta["geometry_name"],
+            geometry_type=meta["geometry_type"],
+            crs=meta["crs"],
+            encoding=meta["encoding"],
+            SPATIAL_INDEX="YES",
+        )
+    indexed_file.replace(gpkg_file)
+
+
+class DumpWriter:
+    """
+    Writes GeoPackage dumps on a background thread, hence the import does
+    not wait on file I/O. Writes are queued (one after the other, in order
+    of submission) and use the Arrow I/O of pyogrio if pyarrow is
+    installed. The spatial index of files written chunk-wise is created
+    once all chunks are written (see `wait()`), not per appended chunk.
+    """
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="gpkg-dump"
+        )
+        self._futures: list[Future] = []
+        self._files: set[Path] = set()
+        self._use_arrow = find_spec("pyarrow") is not None
+
+    def submit(
+        self,
+        data: gpd.GeoDataFrame,
+        output_file: str | Path,
+        append: bool = False,
+    ) -> None:
+        """
+        Queue a dump of a snapshot of `data`.
+
+        Args:
+            data (gpd.GeoDataFrame): Data to dump.
+            output_file (str | Path): The GeoPackage, an existing file is
+                replaced unless `append` is set.
+            append (bool, optional): Append to the file (e.g., when
+                processing chunk-wise). Defaults to False.
+        """
+        output_file = Path(output_file)
+        if append:
+            self._files.add(output_file)
+        self._futures.append(
+            self._executor.submit(
+                self._write, data.copy(), output_file, append
+            )
+        )
+
+    def _write(
+        self, data: gpd.GeoDataFrame, output_file: Path, append: bool
+    ) -> str:
+        start = time.perf_counter()
+        if not append:
+            # delete an existing GeoPackage, overwriting leads to issues
+            output_file.unlink(missing_ok=True)
+        size = output_file.stat().st_size if output_file.exists() else 0
+        pyogrio.write_dataframe(
+            data,
+            output_file,
+            driver="GPKG",
+            append=append and output_file.exists(),
+            use_arrow=self._use_arrow,
+            # appended files are indexed at once, see wait()
+            SPATIAL_INDEX="NO" if append else "YES",
+        )
+        elapsed = time.perf_counter() - start
+        written = (output_file.stat().st_size - size) / 1e6
+        return (
+            f"Dumped {len(data)} records to {output_file.name} in "
+            f"{elapsed:.2f} s ({len(data) / elapsed:,.0f} records/s, "
+            f"{written / elapsed:.1f} MB/s)."
+        )
+
+    def wait(self) -> list[str]:
+        """
+        Wait for all queued dumps, then create the spatial indexes of the
+        files written chunk-wise. Write errors are raised here.
+
+        Returns:
+            list[str]: Throughput of each dump, in order of submission. The
+                caller prints them, output of the background thread would
+                interleave with the output of the import.
+        """
+        futures, self._futures = self._futures, []
+        reports = [future.result() for future in futures]
+        files, self._files = self._files, set()
+        for output_file in files:
+            if output_file.exists():
+                create_spatial_index(output_file)
+        return reports
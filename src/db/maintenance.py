@@ -0,0 +1,93 @@
+from sqlalchemy import text
+
+from db.utils import create_db_engine
+
+# Tables vacuumed and analyzed after each import and rollback
+TABLES = ("landslides", "landslides_grid")
+
+# Indexes of the partitioned landslides table (and all of its partitions)
+# which are not usable by the planner
+_INVALID_INDEXES = text("""
+    SELECT i.indexrelid::regclass::text
+    FROM pg_index i
+    JOIN pg_partition_tree('public.landslides') p ON i.indrelid = p.relid
+    WHERE NOT (i.indisvalid AND i.indisready AND i.indislive)
+""")
+
+# Partitions lacking one of the spatial indexes of the partitioned table
+_MISSING_INDEXES = text("""
+    SELECT p.relid::regclass::text
+    FROM pg_partition_tree('public.landslides') p
+    LEFT JOIN pg_index i ON i.indrelid = p.relid
+    LEFT JOIN pg_class c ON i.indexrelid = c.oid
+    LEFT JOIN pg_am am ON c.relam = am.oid AND am.amname = 'gist'
+    WHERE p.isleaf
+    GROUP BY p.relid
+    HAVING count(am.oid) < (
+        SELECT count(*)
+        FROM pg_index pi
+        JOIN pg_class pc ON pi.indexrelid = pc.oid
+        JOIN pg_am pam ON pc.relam = pam.oid
+        WHERE pi.indrelid = 'public.landslides'::regclass
+            AND pam.amname = 'gist'
+    )
+""")
+
+
+def cluster_landslides():
+    """Physically order all partitions of the landslides table along the
+    spatial (GiST) index, thus nearby events are stored on the same pages.
+    Rewrites the table, which is locked meanwhile."""
+    engine = create_db_engine(isolation_level="AUTOCOMMIT")
+    with engine.connect() as conn:
+        conn.execute(
+            text("CLUSTER public.landslides USING idx_landslides_geometry")
+        )
+    engine.dispose()
+
+
+def vacuum_analyze():
+    """Reclaim the space of deleted rows (e.g., by `refresh_grid()` or a
+    rolled back import) and refresh the planner statistics of all TABLES."""
+    engine = create_db_engine(isolation_level="AUTOCOMMIT")
+    with engine.connect() as conn:
+        for table in TABLES:
+            conn.execute(text(f"VACUUM (ANALYZE) public.{table}"))
+    engine.dispose()
+
+
+def check_indexes() -> list[str]:
+    """Verify the indexes of the landslides table: invalid indexes (e.g.,
+    from an aborted build) are rebuilt, partitions without spatial indexes
+    are reported.
+
+    Returns:
+        list[str]: Partitions lacking a spatial index.
+    """
+    engine = create_db_engine(isolation_level="AUTOCOMMIT")
+    with engine.connect() as conn:
+        for index in conn.scalars(_INVALID_INDEXES).all():
+            print(f"Rebuilding invalid index {index}.")
+            conn.execute(text(f"REINDEX INDEX {index}"))
+        missing = conn.scalars(_MISSING_INDEXES).all()
+    engine.dispose()
+
+    for partition in missing:
+        print(f"Partition {partition} lacks a spatial index.")
+    return list(missing)
+
+
+def optimize(cluster: bool = False):
+    """Post-import stage, run after each import and rollback: vacuum, refresh
+    the statistics and verify the indexes.
+
+    Args:
+        cluster (bool, optional): Cluster the landslides spatially first.
+            Rewrites (and locks) the whole table, hence it is meant for
+            large imports, e.g., the initial one. Defaults to False.
+    """
+    if cluster:
+        cluster_landslides()
+    vacuum_analyze()
+    if not check_indexes():
+        print("Optimized the data base, all indexes are healthy.")
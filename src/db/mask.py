@@ -0,0 +1,108 @@
+from functools import cache
+
+import geopandas as gpd
+import numpy as np
+import shapely
+from shapely.geometry.base import BaseGeometry
+
+from db.constants import AUSTRIA
+
+# Edge length of the tiles in meters (CRS units)
+TILE_SIZE = 10_000
+
+
+class RegionMask:
+    """
+    Fast point-in-polygon test against a region, e.g., the Austrian border.
+
+    The region is split into a regular grid of square tiles. The tile of a
+    point follows from its coordinates, hence tiles fully inside the region
+    (interior) accept points by a lookup alone. Only points in tiles along
+    the border are tested against the (prepared) intersection of tile and
+    region. All tests are vectorized over whole coordinate arrays.
+    """
+
+    def __init__(self, region: BaseGeometry, tile_size: float = TILE_SIZE):
+        """
+        Args:
+            region (BaseGeometry): (Multi)polygon of the region.
+            tile_size (float, optional): Edge length of the tiles in CRS
+                units. Defaults to TILE_SIZE.
+        """
+        shapely.prepare(region)
+        self.xmin, self.ymin, xmax, ymax = region.bounds
+        self.tile_size = tile_size
+        self.shape = (
+            int(np.ceil((ymax - self.ymin) / tile_size)) or 1,
+            int(np.ceil((xmax - self.xmin) / tile_size)) or 1,
+        )
+        rows, columns = np.indices(self.shape)
+        x0 = self.xmin + columns.ravel() * tile_size
+        y0 = self.ymin + rows.ravel() * tile_size
+        tiles = shapely.box(x0, y0, x0 + tile_size, y0 + tile_size)
+
+        # 1: interior, 0: outside, -1: border (exact test needed)
+        self.tile_state = np.zeros(len(tiles), dtype=np.int8)
+        self.tile_state[shapely.intersects(region, tiles)] = -1
+        self.tile_state[shapely.contains_properly(region, tiles)] = 1
+
+        # intersection of the region with each border tile
+        self.border_parts = np.empty(len(tiles), dtype=object)
+        border = self.tile_state == -1
+        self.border_parts[border] = shapely.intersection(tiles[border], region)
+        shapely.prepare(self.border_parts[border])
+
+    def contains_xy(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        Test whether points lie within the region (points on the border
+        count as within).
+
+        Args:
+            x (np.ndarray): X coordinates.
+            y (np.ndarray): Y coordinates.
+        Returns:
+            np.ndarray: Boolean array, True for points within the region.
+        """
+        x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+        n_rows, n_columns = self.shape
+        column = np.floor((x - self.xmin) / self.tile_size)
+        row = np.floor((y - self.ymin) / self.tile_size)
+        # points on the upper/right edge of the bounds belong to the last tile
+        column = np.where(np.isclose(column, n_columns), n_columns - 1, column)
+        row = np.where(np.isclose(row, n_rows), n_rows - 1, row)
+        in_grid = (
+            (column >= 0) & (column < n_columns) & (row >= 0) & (row < n_rows)
+        )
+
+        tile = np.full(len(x), -1)
+        tile[in_grid] = (row[in_grid] * n_columns + column[in_grid]).astype(
+            int
+        )
+        state = np.where(in_grid, self.tile_state[tile], 0)
+
+        inside = state == 1
+        (border,) = np.nonzero(state == -1)
+        inside[border] = shapely.intersects_xy(
+            self.border_parts[tile[border]], x[border], y[border]
+        )
+        return inside
+
+    def contains(self, geometries: gpd.GeoSeries) -> np.ndarray:
+        """Vectorized test for point geometries (in the CRS of the region),
+        missing or empty geometries are outside."""
+        valid = ~(geometries.isna() | geometries.is_empty).to_numpy()
+        inside = np.zeros(len(geometries), dtype=bool)
+        points = geometries[valid]
+        inside[valid] = self.contains_xy(points.x, points.y)
+        return inside
+
+    def clip(self, data: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+        """Keep the rows of `data` within the region."""
+        return data[self.contains(data.geometry)].reset_index(drop=True)
+
+
+@cache
+def austria_mask() -> RegionMask:
+    """Mask of the Austrian border (in TARGET_CRS), built once per
+    process."""
+    return RegionMask(AUSTRIA.union_all())
@@ -3,8 +3,13 @@ from typing import List, Optional
 
 from geoalchemy2 import Geometry
 from sqlalchemy import (
+    JSON,
+    Computed,
     ForeignKey,
     String,
+    UniqueConstraint,
+    func,
+    text,
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
@@ -17,10 +22,14 @@ class Base(DeclarativeBase):
 
 class Landslides(Base):
     __tablename__ = "landslides"
+    # Range partitions by decade, see db.partitions; the partition key has to
+    # be part of the primary key
+    __table_args__ = {"postgresql_partition_by": "RANGE (datetime)"}
 
-    id: Mapped[int] = mapped_column(primary_key=True)
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
 
-    datetime: Mapped[datetime]
+    # quoted, as the column name shadows the type within the class body
+    datetime: Mapped["datetime"] = mapped_column(primary_key=True)
     report: Mapped[Optional[str]]
     report_source: Mapped[Optional[str]]
     report_url: Mapped[Optional[str]]
@@ -30,6 +39,12 @@ class Landslides(Base):
     geometry: Mapped[Geometry] = mapped_column(
         Geometry(geometry_type="POINT", srid=TARGET_CRS)
     )
+    # Web Mercator copy maintained by the data base, used to serve tiles
+    # without re-projecting on each request
+    geometry_3857: Mapped[Geometry] = mapped_column(
+        Geometry(geometry_type="POINT", srid=3857),
+        Computed("ST_Transform(geometry, 3857)", persisted=True),
+    )
 
     classification_id: Mapped[int] = mapped_column(
         ForeignKey("classification.id")
@@ -41,6 +56,11 @@ class Landslides(Base):
     source_id: Mapped[int] = mapped_column(ForeignKey("sources.id"))
     source: Mapped["Sources"] = relationship(back_populates="landslides")
 
+    # Import run which added the record, NULL for records of earlier imports
+    run_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("import_runs.id"), index=True
+    )
+
     # No UniqueConstraint - that's handled by the import logic
     # The combination of date & geom within a certain radius defines a unique
     # record
@@ -59,6 +79,9 @@ class Classification(Base):
 
 class Sources(Base):
     __tablename__ = "sources"
+    # A source is identified by its name and download date, re-imports of
+    # the same download re-use the record
+    __table_args__ = (UniqueConstraint("name", "downloaded"),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str]
@@ -79,3 +102,106 @@ class Version(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True)
     imported_with_version: Mapped[str]
+    # Added once an import run completed or was rolled back (db.runs), in UTC
+    # (served as Last-Modified by db.api)
+    imported_at: Mapped[datetime] = mapped_column(
+        server_default=text("timezone('utc', now())")
+    )
+
+
+class LandslidesGrid(Base):
+    """Number of landslides per grid cell, year, classification and source.
+
+    Maintained by `db.aggregates.refresh_grid()` after each import.
+    """
+
+    __tablename__ = "landslides_grid"
+
+    # Edge length of the cell in meters, multiple resolutions are stored
+    cell_size: Mapped[int] = mapped_column(primary_key=True)
+    # Cell indices, i.e., floor(coordinate / cell_size) in TARGET_CRS
+    cell_x: Mapped[int] = mapped_column(primary_key=True)
+    cell_y: Mapped[int] = mapped_column(primary_key=True)
+    year: Mapped[int] = mapped_column(primary_key=True)
+    classification_id: Mapped[int] = mapped_column(
+        ForeignKey("classification.id"), primary_key=True
+    )
+    source_id: Mapped[int] = mapped_column(
+        ForeignKey("sources.id"), primary_key=True
+    )
+
+    count: Mapped[int]
+    # Cell polygon
+    geometry: Mapped[Geometry] = mapped_column(
+        Geometry(geometry_type="POLYGON", srid=TARGET_CRS)
+    )
+
+
+class ImportRuns(Base):
+    """Ledger of the import runs, see db.runs."""
+
+    __tablename__ = "import_runs"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    imported_with_version: Mapped[str]
+    started_at: Mapped[datetime] = mapped_column(server_default=func.now())
+    finished_at: Mapped[Optional[datetime]]
+    # running, succeeded, failed or rolled back
+    status: Mapped[str] = mapped_column(server_default="running")
+    # Per source (processor name): number of records read, cleaned,
+    # duplicates, inserted and failed inserts (errors)
+    counts: Mapped[Optional[dict]] = mapped_column(JSON)
+
+
+class DuplicateLinks(Base):
+    """Import candidates rejected as duplicates, linked to the landslide
+    they duplicate. Recorded by the import, see
+    `db.duplicates.resolve_duplicates()`.
+    """
+
+    __tablename__ = "duplicate_links"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    # The matched landslide; no foreign key, as the primary key of the
+    # partitioned landslides table is (id, datetime)
+    landslide_id: Mapped[int] = mapped_column(index=True)
+    matched_source_id: Mapped[int] = mapped_column(ForeignKey("sources.id"))
+    # Distance (meters) and days between the candidate and the match
+    distance: Mapped[float]
+    days_apart: Mapped[int]
+
+    # Attributes of the rejected candidate
+    source_id: Mapped[int] = mapped_column(
+        ForeignKey("sources.id"), index=True
+    )
+    run_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("import_runs.id"), index=True
+    )
+    datetime: Mapped["datetime"]
+    report: Mapped[Optional[str]]
+    report_source: Mapped[Optional[str]]
+    report_url: Mapped[Optional[str]]
+    original_classification: Mapped[str]
+    geometry: Mapped[Geometry] = mapped_column(
+        Geometry(geometry_type="POINT", srid=TARGET_CRS)
+    )
+
+
+class QuarantinedRecords(Base):
+    """Records which failed to insert in resilient mode (e.g., violating a
+    constraint), see db.quarantine."""
+
+    __tablename__ = "quarantined_records"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    source_id: Mapped[int] = mapped_column(
+        ForeignKey("sources.id"), index=True
+    )
+    run_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("import_runs.id"), index=True
+    )
+    quarantined_at: Mapped[datetime] = mapped_column(server_default=func.now())
+    # Error message of the data base
+    error: Mapped[str]
+    # The record as passed to the insert, geometry as EWKT
+    record: Mapped[dict] = mapped_column(JSON)
@@ -0,0 +1,83 @@
+from typing import Iterable
+
+import pandas as pd
+from sqlalchemy import Connection, text
+
+# The landslides table is range partitioned by decade from this year on,
+# all older events are stored in a single partition
+FIRST_DECADE = 1900
+DECADE_YEARS = 10
+
+# Advisory lock serializing the creation of partitions by concurrent imports
+PARTITIONS_LOCK = "landslides_partitions"
+
+
+def partition_name(year: int) -> str:
+    """Name of the partition holding events of the given year."""
+    if year < FIRST_DECADE:
+        return f"landslides_before_{FIRST_DECADE}"
+    return f"landslides_{year - year % DECADE_YEARS}s"
+
+
+def _existing_partitions(conn: Connection) -> set[str]:
+    return set(
+        conn.scalars(
+            text("""
+                SELECT child.relname
+                FROM pg_inherits
+                JOIN pg_class parent ON pg_inherits.inhparent = parent.oid
+                JOIN pg_class child ON pg_inherits.inhrelid = child.oid
+                WHERE parent.relname = 'landslides'
+            """)
+        )
+    )
+
+
+def ensure_partitions(conn: Connection, datetimes: Iterable) -> list[str]:
+    """Create the missing decade partitions of the `landslides` table for
+    the given event datetimes. Needs to run before inserting, as there is no
+    default partition. Concurrent imports wait for each other until the
+    transaction creating a partition ends.
+
+    Args:
+        conn (Connection): Connection, partitions are created within its
+            transaction.
+        datetimes (Iterable): Datetimes of the events to insert.
+
+    Returns:
+        list[str]: Names of the created partitions.
+    """
+    years = pd.DatetimeIndex(datetimes).dropna().year.unique()
+    decades = {
+        int(year - year % DECADE_YEARS)
+        for year in years
+        if year >= FIRST_DECADE
+    }
+
+    def missing() -> list[int]:
+        existing = _existing_partitions(conn)
+        return sorted(
+            decade
+            for decade in decades
+            if partition_name(decade) not in existing
+        )
+
+    if not missing():
+        return []
+    # Another import may have created the partitions in the meantime
+    conn.execute(
+        text("SELECT pg_advisory_xact_lock(hashtext(:lock))"),
+        {"lock": PARTITIONS_LOCK},
+    )
+    created = missing()
+    for decade in created:
+        # per partition indexes are created from the partitioned ones
+        conn.execute(
+            text(f"""
+                CREATE TABLE IF NOT EXISTS public.{partition_name(decade)}
+                PARTITION OF public.landslides
+                FOR VALUES FROM ('{decade}-01-01')
+                TO ('{decade + DECADE_YEARS}-01-01')
+            """)
+        )
+    return [partition_name(decade) for decade in created]
@@ -1,50 +1,487 @@
+import asyncio
+import tempfile
 import warnings
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 
 import geopandas as gpd
+import pandas as pd
+from sqlalchemy import func, select
 from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
 from db.constants import AUSTRIA, TARGET_CRS
-from db.duplicates import is_duplicated
-from db.models import Classification, Landslides
+from db.corrections import corrections
+from db.duplicates import resolve_duplicates, resolve_duplicates_async
+from db.embedded import embedded_store
+from db.gpkg import DumpWriter
+from db.mask import austria_mask
+from db.models import DuplicateLinks, Landslides
+from db.partitions import ensure_partitions
+from db.quarantine import insert_isolating, quarantine
+from db.reference import REFERENCE_DATA
+from db.settings import BACKEND
 from db.utils import (
+    create_async_db_engine,
     create_db_session,
-    create_source_from_metadata,
-    dump_gpkg,
     read_metadata,
 )
+from db.validation import ValidationError, validate_landslides
 
 
 class BaseProcessor(ABC):
-    """Abstract base class for data processors."""
+    """Abstract base class for data processors.
 
-    def __init__(self, *, file_path: str | Path, dataset_name: str, **kwargs):
+    Processing is split into two stages. `process()` holds all steps that
+    only depend on the rows at hand (cleaning, classification) and can
+    therefore be applied chunk by chunk. `finalize()` holds steps that need
+    the whole data set (e.g., temporal duplicate removal); the columns these
+    steps rely on are listed in `global_columns`. Manual corrections (see
+    db.corrections) are applied by `correct()` after `process()`.
+    """
+
+    # Columns needed by finalize(), kept for all rows in streaming mode
+    global_columns: tuple[str, ...] = ()
+
+    # Maps DataFrame columns to database columns. Expected keys:
+    # datetime, classification, original_classification and optionally
+    # report, report_source, report_url
+    column_map: dict[str, str]
+    # Check for duplicates against the database upon import
+    check_duplicates: bool = True
+
+    def __init__(
+        self,
+        *,
+        file_path: str | Path,
+        dataset_name: str,
+        chunk_size: int | None = None,
+        **kwargs,
+    ):
         self.target_crs = TARGET_CRS
         self.austria = AUSTRIA
+        self.mask = austria_mask()
         self.file_path = file_path
         self.dataset_name = dataset_name
+        self.chunk_size = chunk_size
         self.kwargs = kwargs
-        self.data = self.read_file()
+        # Import run (see db.runs) the records are attributed to
+        self.run_id = None
+        # Resilient mode: records failing to insert are quarantined (see
+        # db.quarantine) instead of rolling back the whole batch
+        self.resilient = False
+        # Number of records read (within Austria), cleaned (passed on to
+        # the import), flagged as duplicates, inserted, failed to insert and
+        # quarantined (resilient mode)
+        self.counts = dict.fromkeys(
+            (
+                "read",
+                "cleaned",
+                "duplicates",
+                "inserted",
+                "errors",
+                "quarantined",
+            ),
+            0,
+        )
+        # In streaming mode the data is read chunk-wise by stream()
+        self.data = self.read_file() if chunk_size is None else None
         self.metadata = read_metadata(file_path=self.file_path)
+        # Highest landslide ID before the first (chunk) import; newer
+        # records stem from this import and are not checked for duplicates
+        self.max_landslide_id = None
+        # Dumps (--dump-layers) are written on a background thread
+        self.dumps = DumpWriter()
+
+    def read_file(self, **kwargs) -> gpd.GeoDataFrame:
+        """Read the file, only points within Austria are kept."""
+        data = self.mask.clip(self._read_bbox(**kwargs))
+        self.counts["read"] += len(data)
+        return data
 
-    def read_file(self) -> gpd.GeoDataFrame:
-        # Ensure that points are within Austria
-        # CRS mis-match between the two files is handled internally by
-        # geopandas
+    def _read_bbox(self, **kwargs) -> gpd.GeoDataFrame:
+        # Cheap pre-filter by the bounding box of Austria (CRS mis-match is
+        # handled internally by geopandas), the exact test is done by the
+        # mask in the target CRS
         return gpd.read_file(
-            self.file_path, mask=self.austria, **self.kwargs
+            self.file_path, bbox=self.austria, **self.kwargs, **kwargs
         ).to_crs(crs=self.target_crs)
 
+    def read_chunks(self) -> Iterator[gpd.GeoDataFrame]:
+        """Read the file in row ranges of `chunk_size` features.
+
+        The row range is applied after the bounding box filter, thus a chunk
+        with less than `chunk_size` rows marks the end of the layer.
+        """
+        start = 0
+        while True:
+            chunk = self._read_bbox(rows=slice(start, start + self.chunk_size))
+            data = self.mask.clip(chunk)
+            self.counts["read"] += len(data)
+            if not data.empty:
+                yield data
+            if len(chunk) < self.chunk_size:
+                return
+            start += self.chunk_size
+
     @abstractmethod
-    def run(self):
-        """Run all processing steps."""
+    def process(self):
+        """Clean and classify `self.data`, must be applicable per chunk."""
         raise NotImplementedError
 
-    @abstractmethod
-    def __call__(self):
+    def correct(self):
+        """Apply the manual corrections of this data set (see
+        db.corrections) to the processed records."""
+        n_corrected = corrections().apply(
+            self.dataset_name, self.data, self.column_map["datetime"]
+        )
+        if n_corrected:
+            print(f"Corrected {n_corrected} records of {self.dataset_name}.")
+
+    def finalize(self):  # noqa: B027
+        """Steps which need the whole data set. By default, there are none."""
+
+    def import_to_db(self, file_dump: str | None = None):
+        """Import `self.data` into the PostGIS database."""
+        self.counts["cleaned"] += len(self.data)
+        self._import_to_db(
+            data_to_import=self.data,
+            column_map=self.column_map,
+            file_dump=file_dump,
+            check_duplicates=self.check_duplicates,
+        )
+        if self.chunk_size is None:
+            # chunks are appended, stream() waits after the last one
+            self.wait_for_dumps()
+
+    def wait_for_dumps(self):
+        """Wait for the dumps of this source and report their throughput."""
+        for report in self.dumps.wait():
+            print(report)
+
+    async def import_to_db_async(self, file_dump: str | None = None):
+        """Import `self.data` into the PostGIS database (async variant)."""
+        self.counts["cleaned"] += len(self.data)
+        await self._import_to_db_async(
+            data_to_import=self.data,
+            column_map=self.column_map,
+            file_dump=file_dump,
+            check_duplicates=self.check_duplicates,
+        )
+        for report in await asyncio.to_thread(self.dumps.wait):
+            print(report)
+
+    def stream(self, file_dump: str | None = None):
+        """Process and import the data chunk by chunk.
+
+        Peak memory is bound by `chunk_size`. If the processor has global
+        steps, the processed chunks are spilled to a temporary GeoPackage
+        and only the `global_columns` are kept in memory for `finalize()`.
+        Afterwards, the spilled chunks are imported, minus all rows removed
+        by `finalize()`.
+        """
+        if file_dump:
+            # chunks are appended to the dump
+            Path(file_dump).unlink(missing_ok=True)
+
+        if not self.global_columns:
+            for chunk in self.read_chunks():
+                self.data = chunk
+                self.process()
+                self.correct()
+                if not self.data.empty:
+                    self.import_to_db(file_dump=file_dump)
+            self.wait_for_dumps()
+            return
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            spill_file = Path(tmp_dir) / "processed.gpkg"
+            n_rows, keys = 0, []
+            for chunk in self.read_chunks():
+                self.data = chunk
+                self.process()
+                self.correct()
+                if self.data.empty:
+                    continue
+                # running row number to match rows after finalize()
+                data = self.data.assign(
+                    _row=range(n_rows, n_rows + len(self.data))
+                )
+                data.to_file(spill_file, driver="GPKG", mode="a")
+                keys.append(data[[*self.global_columns, "_row"]])
+                n_rows += len(data)
+
+            if not keys:
+                print(f"No records to import for {self.dataset_name}.")
+                return
+
+            # global pass over the narrow key columns
+            self.data = gpd.GeoDataFrame(pd.concat(keys, ignore_index=True))
+            self.finalize()
+            keep_rows = self.data["_row"].to_numpy()
+
+            for start in range(0, n_rows, self.chunk_size):
+                data = gpd.read_file(
+                    spill_file, rows=slice(start, start + self.chunk_size)
+                )
+                data = data[data["_row"].isin(keep_rows)]
+                if not data.empty:
+                    self.data = data.drop(columns="_row")
+                    self.import_to_db(file_dump=file_dump)
+            self.wait_for_dumps()
+
+    def run(self, file_dump: str | None = None):
+        """Run all processing steps and import the data."""
+        if self.chunk_size is not None:
+            self.stream(file_dump=file_dump)
+            return
+
+        self.process()
+        self.correct()
+        self.finalize()
+        self.import_to_db(file_dump=file_dump)
+
+    def __call__(self, file_dump: str | None = None):
         """Allow instances to be called like functions."""
-        raise NotImplementedError
+        self.run(file_dump=file_dump)
+
+    async def prepare_async(self):
+        """Run process(), correct() and finalize() in a worker thread, such
+        that other sources can be imported in the meantime."""
+        if self.chunk_size is not None:
+            # streaming processes the data upon import
+            return
+        await asyncio.to_thread(self.process)
+        await asyncio.to_thread(self.correct)
+        await asyncio.to_thread(self.finalize)
+
+    async def run_async(self, file_dump: str | None = None):
+        """Asynchronous variant of run()."""
+        if self.chunk_size is not None:
+            # the chunks are imported with the synchronous path
+            await asyncio.to_thread(self.stream, file_dump=file_dump)
+            return
+
+        await self.prepare_async()
+        await self.import_to_db_async(file_dump=file_dump)
+
+    def validate(
+        self,
+        data_to_import: gpd.GeoDataFrame,
+        column_map: dict,
+        classification_names: Iterable[str],
+    ):
+        """
+        Check the data against the schema of `landslides` (see
+        db.validation) before any import work, i.e., fail fast instead of
+        after the duplicate matching.
+
+        Args:
+            data_to_import (gpd.GeoDataFrame): Data to import.
+            column_map (dict): Maps database columns to DataFrame columns.
+            classification_names (Iterable[str]): Known classifications.
+        Raises:
+            ValidationError: Listing all violations.
+        """
+        violations = validate_landslides(
+            data_to_import, column_map, classification_names, self.target_crs
+        )
+        if violations:
+            raise ValidationError(self.dataset_name, violations)
+
+    # The import paths (PostGIS, asyncio, embedded) only differ in their
+    # backend I/O. They share the validation, the duplicate handling (flags,
+    # dump, links), the records and the reporting. Links and records are
+    # inserted in one transaction.
+
+    def _prepare_import(
+        self,
+        data_to_import: gpd.GeoDataFrame,
+        column_map: dict,
+        classification_names: Iterable[str],
+    ) -> gpd.GeoDataFrame:
+        """Validate the data (see validate()), then add the EWKT geometries
+        for the import."""
+        self.validate(data_to_import, column_map, classification_names)
+        import_data = data_to_import.copy()
+        # see https://geoalchemy-2.readthedocs.io/en/latest/orm_tutorial.html#create-an-instance-of-the-mapped-class
+        import_data["geom_wkt"] = (
+            f"SRID={self.target_crs};" + import_data["geometry"].to_wkt()
+        )
+        return import_data
+
+    def _dump(self, import_data: gpd.GeoDataFrame, file_dump: str | None):
+        if file_dump:
+            # chunks are appended to the same dump
+            self.dumps.submit(
+                import_data, file_dump, append=self.chunk_size is not None
+            )
+
+    def _split_duplicates(
+        self,
+        import_data: gpd.GeoDataFrame,
+        matches: pd.DataFrame | None,
+        column_map: dict,
+        source_id: int,
+        file_dump: str | None = None,
+    ) -> tuple[gpd.GeoDataFrame, list[dict]]:
+        """
+        Flag the duplicates, dump the data (with the flags) and remove the
+        duplicates.
+
+        Args:
+            import_data (gpd.GeoDataFrame): Data to import, see
+                _prepare_import().
+            matches (pd.DataFrame | None): Matched landslides, see
+                db.duplicates.resolve_duplicates(). None if duplicates are
+                not checked.
+            column_map (dict): Maps database columns to DataFrame columns.
+            source_id (int): Source of the data.
+            file_dump (str | None, optional): Optional path to dump the data
+                for inspection. Defaults to None.
+        Returns:
+            tuple[gpd.GeoDataFrame, list[dict]]: Data without the duplicates
+            and the linkage records of the duplicates.
+        """
+        if matches is None:
+            self._dump(import_data, file_dump)
+            return import_data, []
+
+        self._flag_duplicates(import_data, matches)
+        self._dump(import_data, file_dump)
+        # Keep the link to the matched records
+        links = self._build_links(
+            import_data, matches, column_map, source_id, self.run_id
+        )
+        return self._remove_duplicates(import_data), links
+
+    def _remove_duplicates(
+        self, import_data: gpd.GeoDataFrame
+    ) -> gpd.GeoDataFrame:
+        """Warn about and remove the flagged duplicates."""
+        n_duplicates = import_data["duplicated"].sum()
+        self.counts["duplicates"] += int(n_duplicates)
+        if n_duplicates > 0:
+            warnings.warn(
+                f"Found {n_duplicates} duplicate/s in the "
+                f"{self.dataset_name} data.",
+                stacklevel=4,
+            )
+        return import_data[~import_data["duplicated"]]
+
+    @staticmethod
+    def _flag_duplicates(
+        import_data: gpd.GeoDataFrame, matches: pd.DataFrame
+    ) -> None:
+        """Add the `duplicated` flag and the matched ID (`duplicate_of`),
+        see db.duplicates.resolve_duplicates()."""
+        import_data["duplicated"] = matches["landslide_id"].notna().to_numpy()
+        import_data["duplicate_of"] = matches["landslide_id"].array
+
+    @classmethod
+    def _build_links(
+        cls,
+        import_data: gpd.GeoDataFrame,
+        matches: pd.DataFrame,
+        column_map: dict,
+        source_id: int,
+        run_id: int | None = None,
+    ) -> list[dict]:
+        """Linkage records (see db.models.DuplicateLinks) of the rows
+        flagged as duplicates, for the insert statement."""
+        duplicated = import_data["duplicated"].to_numpy()
+        if not duplicated.any():
+            return []
+        records = cls._build_records(
+            import_data[duplicated], column_map, {}, source_id, run_id
+        )
+        return [
+            {
+                **{
+                    key: value
+                    for key, value in record.items()
+                    if key != "classification_id"
+                },
+                "landslide_id": int(match.landslide_id),
+                "matched_source_id": int(match.matched_source_id),
+                "distance": float(match.distance),
+                "days_apart": int(match.days_apart),
+            }
+            for record, match in zip(
+                records, matches[duplicated].itertuples(), strict=True
+            )
+        ]
+
+    @staticmethod
+    def _build_records(
+        import_data: gpd.GeoDataFrame,
+        column_map: dict,
+        classification_map: dict[str, int],
+        source_id: int,
+        run_id: int | None = None,
+    ) -> list[dict]:
+        """Convert the data to a list of dicts for the insert statement."""
+        if import_data.empty:
+            return []
+        return import_data.apply(
+            lambda row: {
+                "datetime": row[column_map["datetime"]],
+                # nullable
+                "report": row.get(column_map.get("report")),
+                "report_source": row.get(column_map.get("report_source")),
+                "report_url": row.get(column_map.get("report_url")),
+                # not nullable
+                "original_classification": row[
+                    column_map["original_classification"]
+                ],
+                "geometry": row["geom_wkt"],
+                # known, see validate()
+                "classification_id": classification_map.get(
+                    row.get(column_map.get("classification"))
+                ),
+                "source_id": source_id,
+                "run_id": run_id,
+            },
+            axis=1,
+        ).tolist()
+
+    def _insert_records(
+        self, session: Session, records: list[dict], source_id: int
+    ) -> int:
+        """Insert the landslide records, returns the number of inserted
+        records. In resilient mode, failing records are isolated and
+        quarantined, the remaining ones are inserted."""
+        if not self.resilient:
+            session.execute(insert(Landslides), records)
+            return len(records)
+
+        n_inserted, failed = insert_isolating(session, Landslides, records)
+        if failed:
+            quarantine(session, failed, source_id, self.run_id)
+            self.counts["quarantined"] += len(failed)
+            warnings.warn(
+                f"Quarantined {len(failed)} {self.dataset_name} records, "
+                "see the `quarantined_records` table.",
+                stacklevel=3,
+            )
+        return n_inserted
+
+    def _report_import(self, n_inserted: int):
+        self.counts["inserted"] += n_inserted
+        if n_inserted:
+            print(
+                f"Successfully imported {n_inserted} "
+                f"{self.dataset_name} records."
+            )
+        else:
+            print(f"No new records to import for {self.dataset_name}.")
+
+    def _report_failure(self, records: list[dict], error: Exception):
+        """Count the records of a failed (rolled back) batch as errors."""
+        self.counts["errors"] += len(records)
+        print(f"An error occurred during import: {error}")
 
     def _import_to_db(
         self,
@@ -71,86 +508,219 @@ class BaseProcessor(ABC):
             check_duplicates (bool): If True, check for duplicates against
                 the database.
         """
-        if not data_to_import.crs == self.target_crs:
-            raise ValueError(
-                f"CRS mismatch. Data is in {data_to_import.crs}."
-                f"Expected {self.target_crs}"
+        if BACKEND == "embedded":
+            self._import_to_embedded(
+                data_to_import, column_map, file_dump, check_duplicates
             )
+            return
+
         Session = create_db_session()  # noqa: N806
         with Session() as session:
-            # The source object needs to be added to the session to get an ID
-            # before we can reference it.
-            source = create_source_from_metadata(self.metadata)
-            session.add(source)
-            session.flush()
-
-            # Fetch all classifications to map names to IDs
-            classifications = session.query(Classification).all()
-            classification_map = {c.name: c.id for c in classifications}
-
-            import_data = data_to_import.copy()
-            # see https://geoalchemy-2.readthedocs.io/en/latest/orm_tutorial.html#create-an-instance-of-the-mapped-class
-            import_data["geom_wkt"] = (
-                f"SRID={self.target_crs};" + import_data["geometry"].to_wkt()
+            # Map classification names to IDs
+            classification_map = REFERENCE_DATA.classification_ids(session)
+            import_data = self._prepare_import(
+                data_to_import, column_map, classification_map
             )
+            source_id = REFERENCE_DATA.source_id(session, self.metadata)
+            if self.max_landslide_id is None:
+                self.max_landslide_id = session.scalar(
+                    select(func.coalesce(func.max(Landslides.id), 0))
+                )
 
+            matches = None
             if check_duplicates:
-                # Check all events, and flag potential duplicates
-                import_data["duplicated"] = import_data.apply(
-                    lambda row: is_duplicated(
-                        session=session,
-                        landslide_datetime=row[column_map["datetime"]],
-                        landslide_geom=row["geom_wkt"],
-                    ),
-                    axis=1,
+                # Match all events against the data base at once
+                matches = resolve_duplicates(
+                    session.connection(),
+                    import_data[column_map["datetime"]].tolist(),
+                    import_data["geom_wkt"].tolist(),
+                    # records of this import are no duplicates of each
+                    # other (relevant if imported chunk-wise)
+                    max_landslide_id=self.max_landslide_id,
                 )
-                n_duplicates = import_data["duplicated"].sum()
-                if n_duplicates > 0:
-                    warnings.warn(
-                        f"Found {n_duplicates} duplicate/s in the "
-                        f"{self.dataset_name} data.",
-                        stacklevel=2,
+            import_data, links = self._split_duplicates(
+                import_data, matches, column_map, source_id, file_dump
+            )
+            landslide_records = self._build_records(
+                import_data,
+                column_map,
+                classification_map,
+                source_id,
+                self.run_id,
+            )
+
+            try:
+                if links:
+                    session.execute(insert(DuplicateLinks), links)
+                n_inserted = 0
+                if landslide_records:
+                    ensure_partitions(
+                        session.connection(),
+                        import_data[column_map["datetime"]],
                     )
-                if file_dump:
-                    dump_gpkg(import_data, output_file=file_dump)
-                # Remove the duplicates
-                import_data = import_data[~import_data["duplicated"]]
+                    n_inserted = self._insert_records(
+                        session, landslide_records, source_id
+                    )
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                self._report_failure(landslide_records, e)
+                return
+            self._report_import(n_inserted)
 
-            elif file_dump:
-                dump_gpkg(import_data, output_file=file_dump)
+    async def _import_to_db_async(
+        self,
+        data_to_import: gpd.GeoDataFrame,
+        column_map: dict,
+        file_dump: str | None = None,
+        check_duplicates: bool = True,
+        concurrency: int = 4,
+    ):
+        """
+        Asynchronous variant of _import_to_db(). The duplicate matching is
+        spread over `concurrency` pooled connections, CPU-bound steps run in
+        worker threads.
 
-            if import_data.empty:
-                print(f"No new records to import for {self.dataset_name}.")
-                return
+        Args:
+            data_to_import (gpd.GeoDataFrame): Data to import.
+            column_map (dict): Dictionary mapping DataFrame columns
+                to database columns, see _import_to_db().
+            file_dump (str | None): Optional path to dump the data for
+                inspection.
+            check_duplicates (bool): If True, check for duplicates against
+                the database.
+            concurrency (int): Number of connections used for the duplicate
+                matching.
+        """
+        if BACKEND == "embedded":
+            # in-process store, nothing to await
+            await asyncio.to_thread(
+                self._import_to_embedded,
+                data_to_import,
+                column_map,
+                file_dump,
+                check_duplicates,
+            )
+            return
 
-            # must be a list of dicts for the insert statement
-            landslide_records = import_data.apply(
-                lambda row: {
-                    "datetime": row[column_map["datetime"]],
-                    # nullable
-                    "report": row.get(column_map.get("report")),
-                    "report_source": row.get(column_map.get("report_source")),
-                    "report_url": row.get(column_map.get("report_url")),
-                    # not nullable
-                    "original_classification": row[
-                        column_map["original_classification"]
-                    ],
-                    "geometry": row["geom_wkt"],
-                    "classification_id": classification_map.get(
-                        row.get(column_map.get("classification"))
-                    ),
-                    "source_id": source.id,
-                },
-                axis=1,
-            ).tolist()
+        engine = create_async_db_engine(pool_size=concurrency)
+        try:
+            async with AsyncSession(engine) as session:
+                # the reference data is small and cached, resolved with the
+                # synchronous ORM session of the async session
+                classification_map = await session.run_sync(
+                    REFERENCE_DATA.classification_ids
+                )
+                import_data = await asyncio.to_thread(
+                    self._prepare_import,
+                    data_to_import,
+                    column_map,
+                    classification_map,
+                )
+                source_id = await session.run_sync(
+                    REFERENCE_DATA.source_id, self.metadata
+                )
+                if self.max_landslide_id is None:
+                    self.max_landslide_id = await session.scalar(
+                        select(func.coalesce(func.max(Landslides.id), 0))
+                    )
 
-            try:
-                session.execute(insert(Landslides), landslide_records)
-                session.commit()
-                print(
-                    f"Successfully imported {len(landslide_records)} "
-                    f"{self.dataset_name} records."
+                matches = None
+                if check_duplicates:
+                    matches = await resolve_duplicates_async(
+                        engine,
+                        landslide_datetimes=import_data[
+                            column_map["datetime"]
+                        ].tolist(),
+                        landslide_geoms=import_data["geom_wkt"].tolist(),
+                        max_landslide_id=self.max_landslide_id,
+                        concurrency=concurrency,
+                    )
+                import_data, links = await asyncio.to_thread(
+                    self._split_duplicates,
+                    import_data,
+                    matches,
+                    column_map,
+                    source_id,
+                    file_dump,
                 )
-            except Exception as e:
-                session.rollback()
-                print(f"An error occurred during import: {e}")
+                landslide_records = await asyncio.to_thread(
+                    self._build_records,
+                    import_data,
+                    column_map,
+                    classification_map,
+                    source_id,
+                    self.run_id,
+                )
+
+                try:
+                    if links:
+                        await session.execute(insert(DuplicateLinks), links)
+                    n_inserted = 0
+                    if landslide_records:
+                        await session.run_sync(
+                            lambda sync_session: ensure_partitions(
+                                sync_session.connection(),
+                                import_data[column_map["datetime"]],
+                            )
+                        )
+                        n_inserted = await session.run_sync(
+                            self._insert_records, landslide_records, source_id
+                        )
+                    await session.commit()
+                except Exception as e:
+                    await session.rollback()
+                    self._report_failure(landslide_records, e)
+                    return
+                self._report_import(n_inserted)
+        finally:
+            await engine.dispose()
+
+    def _import_to_embedded(
+        self,
+        data_to_import: gpd.GeoDataFrame,
+        column_map: dict,
+        file_dump: str | None = None,
+        check_duplicates: bool = True,
+    ):
+        """Variant of _import_to_db() for the embedded backend (see
+        db.embedded), used if `DB_BACKEND=embedded`. The store has no
+        constraints beyond db.validation, hence, in resilient mode there
+        are no records to quarantine."""
+        store = embedded_store()
+        classification_map = store.classification_ids()
+        import_data = self._prepare_import(
+            data_to_import, column_map, classification_map
+        )
+        source_id = store.source_id(self.metadata)
+        if self.max_landslide_id is None:
+            self.max_landslide_id = store.max_landslide_id()
+
+        matches = None
+        if check_duplicates:
+            matches = store.resolve_duplicates(
+                import_data[column_map["datetime"]],
+                import_data.geometry,
+                max_landslide_id=self.max_landslide_id,
+            )
+        import_data, links = self._split_duplicates(
+            import_data, matches, column_map, source_id, file_dump
+        )
+        landslide_records = self._build_records(
+            import_data,
+            column_map,
+            classification_map,
+            source_id,
+            self.run_id,
+        )
+
+        try:
+            n_inserted = 0
+            if landslide_records:
+                n_inserted = store.insert(landslide_records)
+            if links:
+                store.insert_links(links)
+        except Exception as e:
+            self._report_failure(landslide_records, e)
+            return
+        self._report_import(n_inserted)
@@ -3,16 +3,37 @@ from pathlib import Path
 import pandas as pd
 
 from db.duplicates import flag_temporal_duplicates
-from db.models import Classification
+from db.embedded import embedded_store
 from db.processors.base import BaseProcessor
+from db.reference import REFERENCE_DATA
+from db.settings import BACKEND
 from db.utils import create_db_session
 
 
 class GeoSphere(BaseProcessor):
     """GeoSphere Austria data."""
 
-    def __init__(self, *, file_path: str | Path):
-        super().__init__(file_path=file_path, dataset_name="GeoSphere Austria")
+    global_columns = ("validFrom", "classification", "geometry")
+
+    column_map = {
+        "classification": "classification",
+        "datetime": "validFrom",
+        # report fields are None (no appropriate field)
+        # generally, from each source the original classifications are
+        # preserved
+        "original_classification": "processGroupWeb_DE",
+    }
+    # considered as base data set, no duplicate check against the DB
+    check_duplicates = False
+
+    def __init__(
+        self, *, file_path: str | Path, chunk_size: int | None = None
+    ):
+        super().__init__(
+            file_path=file_path,
+            dataset_name="GeoSphere Austria",
+            chunk_size=chunk_size,
+        )
 
     def _check_geom(self):
         """Check if geometries are given."""
@@ -70,65 +91,47 @@ class GeoSphere(BaseProcessor):
         Populate the classification table with unique landslide
         classifications.
         """
-        Session = create_db_session()  # noqa: N806
-        with Session() as session:
-            unique_classifications = set(
-                sorted(self.data["classification"].unique())
-            )
-            expected_classifications = set(
-                [
-                    "collapse, sinkhole",
-                    "deep seated rock slope deformation",
-                    "gravity slide or flow",
-                    "mass movement (undefined type)",
-                    "rockfall",
-                ]
+        unique_classifications = set(
+            sorted(self.data["classification"].unique())
+        )
+        expected_classifications = set(
+            [
+                "collapse, sinkhole",
+                "deep seated rock slope deformation",
+                "gravity slide or flow",
+                "mass movement (undefined type)",
+                "rockfall",
+            ]
+        )
+        if not unique_classifications == expected_classifications:
+            raise RuntimeError(
+                "Did not find all expected classifications: "
+                f"{expected_classifications}"
             )
-            if not unique_classifications == expected_classifications:
-                raise RuntimeError(
-                    "Did not find all expected classifications: "
-                    f"{expected_classifications}"
-                )
 
-            if not unique_classifications:
-                raise RuntimeError("No classifications found!")
+        if not unique_classifications:
+            raise RuntimeError("No classifications found!")
 
-            new_classifications = [
-                Classification(name=classification)
-                for classification in unique_classifications
-            ]
-            session.add_all(new_classifications)
-            session.commit()
-            print(f"Added {len(unique_classifications)} classifications.")
-
-    def import_to_db(self, file_dump: str | None = None):
-        """Import the data into a PostGIS database."""
-        data_to_import = self.data.copy()
-
-        column_map = {
-            "classification": "classification",
-            "datetime": "validFrom",
-            # report fields are None (no appropriate field)
-            # generally, from each source the original classifications are
-            # preserved
-            "original_classification": "processGroupWeb_DE",
-        }
-        self._import_to_db(
-            data_to_import=data_to_import,
-            column_map=column_map,
-            file_dump=file_dump,
-            check_duplicates=False,
-        )
+        # get-or-create, classifications might already exist
+        if BACKEND == "embedded":
+            n_added = embedded_store().ensure_classifications(
+                unique_classifications
+            )
+        else:
+            Session = create_db_session()  # noqa: N806
+            with Session() as session:
+                n_added = REFERENCE_DATA.ensure_classifications(
+                    session, unique_classifications
+                )
+        print(f"Added {n_added} classifications.")
 
-    def run(self, file_dump: str | None = None):
-        """Run all processing steps."""
+    def process(self):
+        """Clean the data."""
         self._check_geom()
         self.subset()
         self.clean()
+
+    def finalize(self):
+        """Steps which need the whole data set."""
         self.remove_temporal_duplicates()
         self.populate_classification_table()
-        self.import_to_db(file_dump=file_dump)
-
-    def __call__(self, file_dump: str | None = None):
-        """Allow instances to be called like functions."""
-        self.run(file_dump=file_dump)
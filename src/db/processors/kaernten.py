@@ -10,7 +10,18 @@ from db.processors.base import BaseProcessor
 class LandKaernten(BaseProcessor):
     """Land Kärnten data set."""
 
-    def __init__(self, file_path: str | Path):
+    global_columns = ("validFrom", "classification", "geometry")
+
+    column_map = {
+        "classification": "classification",
+        "datetime": "validFrom",
+        # import original hazard labels
+        "original_classification": "QualitativeValue",
+    }
+
+    def __init__(
+        self, *, file_path: str | Path, chunk_size: int | None = None
+    ):
         # determine and read landslide mapping file based on given GeoPackage
         landslides_mapping_file = (
             Path(file_path).parent / "kaernten-landslide-mapping.json"
@@ -19,7 +30,11 @@ class LandKaernten(BaseProcessor):
         with landslides_mapping_file.open("r") as f:
             self.landslides_mapping = json.load(f)
 
-        super().__init__(file_path=file_path, dataset_name="Land Kärnten")
+        super().__init__(
+            file_path=file_path,
+            dataset_name="Land Kärnten",
+            chunk_size=chunk_size,
+        )
 
     def clean(self):
         """Subset and clean the data."""
@@ -61,12 +76,12 @@ class LandKaernten(BaseProcessor):
             base_data["TypeOfHazard"] != f"{base_url}snowAvalanche"
         ]
 
-        # quick sanity check
-        if set(base_data["TypeOfHazard"].unique()) != set(
+        # quick sanity check (a chunk may only contain one of the types)
+        if not set(base_data["TypeOfHazard"].unique()).issubset(
             (f"{base_url}flood", f"{base_url}landslide")
         ):
             raise ValueError(
-                f"Expected two remaining hazard types in the "
+                f"Expected at most two remaining hazard types in the "
                 f"{self.dataset_name} data"
             )
         # get flood types
@@ -94,7 +109,9 @@ class LandKaernten(BaseProcessor):
         landslides["first_classification_label"] = (
             # split on whitespace
             landslides["QualitativeValue"]
-            .str.partition(" ")[0]
+            # split() instead of partition() copes with empty chunks
+            .str.split(" ", n=1)
+            .str[0]
             .str.replace(";", "")
         )
         landslides["classification"] = landslides[
@@ -130,29 +147,11 @@ class LandKaernten(BaseProcessor):
             dataset_name=self.dataset_name,
         )
 
-    def import_to_db(self, file_dump: str | None = None):
-        """Import the data into a PostGIS database."""
-        column_map = {
-            "classification": "classification",
-            "datetime": "validFrom",
-            # import original hazard labels
-            "original_classification": "QualitativeValue",
-        }
-        self._import_to_db(
-            data_to_import=self.data,
-            column_map=column_map,
-            file_dump=file_dump,
-            check_duplicates=True,
-        )
-
-    def run(self, file_dump: str | None = None):
-        """Run all processing steps."""
+    def process(self):
+        """Clean and classify the data."""
         self.clean()
         self.classify()
+
+    def finalize(self):
         # remove temporal duplicates based on new mapped classification
         self.remove_temporal_duplicates()
-        self.import_to_db(file_dump=file_dump)
-
-    def __call__(self, file_dump: str | None = None):
-        """Allow instances to be called like functions."""
-        self.run(file_dump=file_dump)
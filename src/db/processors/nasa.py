@@ -8,8 +8,23 @@ from db.processors.base import BaseProcessor
 class Nasa(BaseProcessor):
     """NASA COOLR landslide report points."""
 
-    def __init__(self, *, file_path: str | Path):
-        super().__init__(file_path=file_path, dataset_name="NASA COOLR")
+    column_map = {
+        "classification": "classification",
+        "datetime": "event_date",
+        "report": "event_desc",
+        "report_source": "source_nam",
+        "report_url": "source_lin",
+        "original_classification": "original_classification",
+    }
+
+    def __init__(
+        self, *, file_path: str | Path, chunk_size: int | None = None
+    ):
+        super().__init__(
+            file_path=file_path,
+            dataset_name="NASA COOLR",
+            chunk_size=chunk_size,
+        )
 
     def clean(self):
         """Subset and clean the data"""
@@ -81,29 +96,6 @@ class Nasa(BaseProcessor):
         self.data = self.data[~self.data["classification"].isna()]
         self.data["event_date"] = pd.to_datetime(self.data["event_date"])
 
-    def import_to_db(self, file_dump: str | None = None):
-        """Import to PostGIS database."""
-        column_map = {
-            "classification": "classification",
-            "datetime": "event_date",
-            "description": "description",
-            "report": "event_desc",
-            "report_source": "source_nam",
-            "report_url": "source_lin",
-            "original_classification": "original_classification",
-        }
-        self._import_to_db(
-            data_to_import=self.data,
-            column_map=column_map,
-            file_dump=file_dump,
-            check_duplicates=True,
-        )
-
-    def run(self, file_dump: str | None = None):
-        """Run all processing steps."""
+    def process(self):
+        """Clean and classify the data."""
         self.clean()
-        self.import_to_db(file_dump=file_dump)
-
-    def __call__(self, file_dump: str | None = None):
-        """Allow instances to be called like functions."""
-        self.run(file_dump=file_dump)
@@ -9,7 +9,15 @@ from db.processors.base import BaseProcessor
 class WLV(BaseProcessor):
     """Wildbach- und Lawinenverbauung data set."""
 
-    def __init__(self, *, file_path: str | Path):
+    column_map = {
+        "classification": "classification",
+        "datetime": "validFrom",
+        "original_classification": "nameOfEvent",
+    }
+
+    def __init__(
+        self, *, file_path: str | Path, chunk_size: int | None = None
+    ):
         self.EXPECTED_CATEGORIES = {
             "Wasser",
             "Lawine",
@@ -26,6 +34,7 @@ class WLV(BaseProcessor):
         super().__init__(
             file_path=file_path,
             dataset_name="Wildbach- und Lawinenverbauung",
+            chunk_size=chunk_size,
             layer="WLV_Ereignisse_INSPIRE",
         )
 
@@ -57,8 +66,11 @@ class WLV(BaseProcessor):
         # "Wasser: Murgang - Intensität: extrem"  # noqa: ERA001
         sub = (
             sediment_transport["nameOfEvent"]
-            .str.partition("-")[0]
-            .str.partition(":")[2]
+            # split() instead of partition() copes with empty chunks
+            .str.split("-", n=1)
+            .str[0]
+            .str.split(":", n=1)
+            .str[1]
             .str.strip()
         )
         sediment_transport = sediment_transport.assign(subcategory=sub)
@@ -158,25 +170,6 @@ class WLV(BaseProcessor):
             ]
         ]
 
-    def import_to_db(self, file_dump: str | None = None):
-        column_map = {
-            "classification": "classification",
-            "datetime": "validFrom",
-            "original_classification": "nameOfEvent",
-        }
-
-        self._import_to_db(
-            data_to_import=self.data,
-            column_map=column_map,
-            file_dump=file_dump,
-            check_duplicates=True,
-        )
-
-    def run(self, file_dump: str | None = None):
-        """Run all processing steps."""
+    def process(self):
+        """Clean and classify the data."""
         self.clean()
-        self.import_to_db(file_dump=file_dump)
-
-    def __call__(self, file_dump: str | None = None):
-        """Allow instances to be called like functions."""
-        self.run(file_dump=file_dump)
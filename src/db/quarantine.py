@@ -0,0 +1,98 @@
+import datetime as dt
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import insert
+from sqlalchemy.exc import StatementError
+from sqlalchemy.orm import DeclarativeBase, Session
+
+from db.models import QuarantinedRecords
+
+
+def insert_isolating(
+    session: Session, model: type[DeclarativeBase], records: list[dict]
+) -> tuple[int, list[tuple[dict, str]]]:
+    """
+    Insert records, isolating the ones which fail (e.g., violate a
+    constraint) instead of failing all of them. Each batch is inserted
+    within a savepoint; a failing batch is rolled back to its savepoint and
+    bisected until the failing records are found. Hence, k failing records
+    of n cost about k * log2(n) additional statements, all other records are
+    inserted. The transaction itself is left to the caller.
+
+    Args:
+        session (Session): Active SQLAlchemy session.
+        model (type[DeclarativeBase]): Mapped class of the table.
+        records (list[dict]): Records for the insert statement.
+    Returns:
+        tuple[int, list[tuple[dict, str]]]: Number of inserted records and
+        the failed records with their error message.
+    """
+    n_inserted, failed = 0, []
+    batches = [records]
+    while batches:
+        batch = batches.pop()
+        try:
+            with session.begin_nested():
+                session.execute(insert(model), batch)
+        except StatementError as e:
+            if len(batch) == 1:
+                failed.append((batch[0], str(e.orig or e).strip()))
+            else:
+                # first half is tried first, records keep their order
+                middle = len(batch) // 2
+                batches.extend((batch[middle:], batch[:middle]))
+            continue
+        n_inserted += len(batch)
+    return n_inserted, failed
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or isinstance(value, str):
+        return value
+    if pd.isna(value):
+        # NaN and NaT are not valid in JSON
+        return None
+    if isinstance(value, dt.date):
+        return value.isoformat()
+    if isinstance(value, (bool, int, float)):
+        return value
+    return str(value)
+
+
+def quarantine(
+    session: Session,
+    failed: list[tuple[dict, str]],
+    source_id: int,
+    run_id: int | None = None,
+) -> None:
+    """
+    Add failed records to the `quarantined_records` table (within the
+    transaction of the caller), see `insert_isolating()`.
+
+    Args:
+        session (Session): Active SQLAlchemy session.
+        failed (list[tuple[dict, str]]): Records with their error message.
+        source_id (int): Source of the records.
+        run_id (int | None, optional): Import run of the records. Defaults
+            to None.
+    """
+    if not failed:
+        return
+    session.execute(
+        insert(QuarantinedRecords),
+        [
+            {
+                "source_id": source_id,
+                "run_id": run_id,
+                "error": error,
+                "record": {
+                    key: _to_json(value) for key, value in record.items()
+                },
+            }
+            for record, error in failed
+        ],
+    )
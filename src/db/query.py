@@ -0,0 +1,312 @@
+from collections import OrderedDict
+from datetime import datetime
+from functools import cache
+from typing import Iterator, Sequence
+
+import geopandas as gpd
+from geoalchemy2 import Geometry
+from geoalchemy2.functions import (
+    ST_DWithin,
+    ST_GeomFromText,
+    ST_Intersects,
+    ST_MakeEnvelope,
+    ST_MakePoint,
+    ST_SetSRID,
+    ST_Transform,
+)
+from shapely.geometry.base import BaseGeometry
+from sqlalchemy import (
+    DateTime,
+    Integer,
+    Select,
+    String,
+    column,
+    func,
+    select,
+    table,
+)
+
+from db.arrow import read_geodataframe
+from db.constants import TARGET_CRS
+from db.models import Version
+from db.utils import create_db_session
+
+landslides_view = table(
+    "landslides_view",
+    column("id", Integer),
+    column("datetime", DateTime),
+    column("report", String),
+    column("report_source", String),
+    column("report_url", String),
+    column("original_classification", String),
+    column("classification_name", String),
+    column("source_id", Integer),
+    column("source_name", String),
+    column("source_doi", String),
+    column("geometry", Geometry(geometry_type="POINT", srid=TARGET_CRS)),
+)
+
+# Number of query results kept in memory
+CACHE_SIZE = 32
+
+_cache: OrderedDict[tuple, gpd.GeoDataFrame] = OrderedDict()
+
+
+@cache
+def _session_factory():
+    return create_db_session()
+
+
+def import_version_id() -> int:
+    """ID of the latest change of the data, i.e., a finished import or a
+    rollback (from the `version` table), 0 if empty."""
+    with _session_factory()() as session:
+        return session.scalar(select(func.coalesce(func.max(Version.id), 0)))
+
+
+def latest_import() -> tuple[int, datetime | None]:
+    """ID and timestamp of the latest finished import or rollback, (0, None)
+    if there is none."""
+    with _session_factory()() as session:
+        row = session.execute(
+            select(Version.id, Version.imported_at)
+            .order_by(Version.id.desc())
+            .limit(1)
+        ).first()
+    return tuple(row) if row else (0, None)
+
+
+def clear_cache():
+    """Remove all cached query results."""
+    _cache.clear()
+
+
+def query_landslides(
+    *,
+    bbox: tuple[float, float, float, float] | None = None,
+    point: tuple[float, float] | None = None,
+    radius_meters: float | None = None,
+    polygon: BaseGeometry | None = None,
+    crs: int = TARGET_CRS,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    classifications: Sequence[str] | None = None,
+    sources: Sequence[str] | None = None,
+    columns: Sequence[str] | None = None,
+    after_id: int | None = None,
+    limit: int | None = None,
+    use_cache: bool = True,
+) -> gpd.GeoDataFrame:
+    """
+    Query the `landslides_view`. All filters are combined and evaluated by
+    PostGIS, spatial filters use the GiST index of the geometries.
+
+    Results are cached (LRU) by their query parameters and the latest
+    version ID (added once an import finished and by a rollback), hence the
+    cache is invalidated by each new import and rollback.
+
+    Args:
+        bbox (tuple[float, float, float, float] | None): Bounding box
+            (xmin, ymin, xmax, ymax) in `crs`.
+        point (tuple[float, float] | None): Center (x, y) in `crs` of a radius
+            search, requires `radius_meters`.
+        radius_meters (float | None): Search radius in meters around `point`.
+        polygon (BaseGeometry | None): Return events within this geometry
+            (in `crs`).
+        crs (int): EPSG code of `bbox`, `point` and `polygon`. Defaults to
+            the CRS of the data base.
+        start (datetime | None): Earliest event datetime (inclusive).
+        end (datetime | None): Latest event datetime (exclusive).
+        classifications (Sequence[str] | None): Classification names.
+        sources (Sequence[str] | None): Source names.
+        columns (Sequence[str] | None): Columns to return, `id` and
+            `geometry` are always included. By default, all columns.
+        after_id (int | None): Keyset pagination, only return events with a
+            larger ID. Results are ordered by ID.
+        limit (int | None): Maximum number of returned events.
+        use_cache (bool): Whether to use the result cache. Defaults to True.
+    Returns:
+        gpd.GeoDataFrame: The matching events.
+    """
+    if (point is None) != (radius_meters is None):
+        raise ValueError("A radius search requires `point` & `radius_meters`.")
+
+    columns = _select_columns(columns)
+    # hashable cache key, e.g., for lists
+    bbox = tuple(bbox) if bbox is not None else None
+    point = tuple(point) if point is not None else None
+    key = (
+        bbox,
+        point,
+        radius_meters,
+        polygon.wkb_hex if polygon is not None else None,
+        crs,
+        start,
+        end,
+        tuple(sorted(classifications)) if classifications else None,
+        tuple(sorted(sources)) if sources else None,
+        columns,
+        after_id,
+        limit,
+    )
+    if use_cache:
+        key = (*key, import_version_id())
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key].copy()
+
+    stmt = filter_landslides(
+        select(*(landslides_view.c[name] for name in columns)),
+        bbox=bbox,
+        point=point,
+        radius_meters=radius_meters,
+        polygon=polygon,
+        crs=crs,
+        start=start,
+        end=end,
+        classifications=classifications,
+        sources=sources,
+        after_id=after_id,
+        limit=limit,
+    )
+    result = read_geodataframe(stmt, crs=TARGET_CRS)
+
+    if use_cache:
+        _cache[key] = result
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+        return result.copy()
+
+    return result
+
+
+def filter_landslides(
+    stmt: Select,
+    *,
+    bbox: tuple[float, float, float, float] | None = None,
+    point: tuple[float, float] | None = None,
+    radius_meters: float | None = None,
+    polygon: BaseGeometry | None = None,
+    crs: int = TARGET_CRS,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    classifications: Sequence[str] | None = None,
+    sources: Sequence[str] | None = None,
+    after_id: int | None = None,
+    limit: int | None = None,
+) -> Select:
+    """Add the filters of query_landslides() to a select statement over the
+    `landslides_view`. The statement is ordered by ID."""
+    stmt = stmt.order_by(landslides_view.c.id)
+    geometry = landslides_view.c.geometry
+    if bbox is not None:
+        envelope = ST_Transform(ST_MakeEnvelope(*bbox, crs), TARGET_CRS)
+        # && compares bounding boxes only, which is exact for points
+        stmt = stmt.where(geometry.op("&&")(envelope))
+    if point is not None:
+        center = ST_Transform(
+            ST_SetSRID(ST_MakePoint(*point), crs), TARGET_CRS
+        )
+        stmt = stmt.where(ST_DWithin(geometry, center, radius_meters))
+    if polygon is not None:
+        area = ST_Transform(ST_GeomFromText(polygon.wkt, crs), TARGET_CRS)
+        stmt = stmt.where(ST_Intersects(geometry, area))
+    if start is not None:
+        stmt = stmt.where(landslides_view.c.datetime >= start)
+    if end is not None:
+        stmt = stmt.where(landslides_view.c.datetime < end)
+    if classifications:
+        stmt = stmt.where(
+            landslides_view.c.classification_name.in_(classifications)
+        )
+    if sources:
+        stmt = stmt.where(landslides_view.c.source_name.in_(sources))
+    if after_id is not None:
+        stmt = stmt.where(landslides_view.c.id > after_id)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+
+    return stmt
+
+
+def _select_columns(columns: Sequence[str] | None) -> tuple[str, ...]:
+    """Validate the requested columns, always include id & geometry."""
+    available = tuple(landslides_view.c.keys())
+    if columns is None:
+        return available
+
+    unknown = set(columns).difference(available)
+    if unknown:
+        raise ValueError(
+            f"Unknown columns: {unknown}. Available columns: {available}"
+        )
+    return tuple(
+        name
+        for name in available
+        if name in columns or name in ("id", "geometry")
+    )
+
+
+def within_bbox(
+    xmin: float, ymin: float, xmax: float, ymax: float, **kwargs
+) -> gpd.GeoDataFrame:
+    """Events within a bounding box, see query_landslides()."""
+    return query_landslides(bbox=(xmin, ymin, xmax, ymax), **kwargs)
+
+
+def within_radius(
+    x: float, y: float, radius_meters: float, **kwargs
+) -> gpd.GeoDataFrame:
+    """Events within a radius around a point, see query_landslides()."""
+    return query_landslides(
+        point=(x, y), radius_meters=radius_meters, **kwargs
+    )
+
+
+def within_polygon(polygon: BaseGeometry, **kwargs) -> gpd.GeoDataFrame:
+    """Events within a polygon, see query_landslides()."""
+    return query_landslides(polygon=polygon, **kwargs)
+
+
+def in_time_window(
+    start: datetime | None, end: datetime | None, **kwargs
+) -> gpd.GeoDataFrame:
+    """Events in [start, end), see query_landslides()."""
+    return query_landslides(start=start, end=end, **kwargs)
+
+
+def by_classification(
+    classifications: Sequence[str], **kwargs
+) -> gpd.GeoDataFrame:
+    """Events with the given classifications, see query_landslides()."""
+    return query_landslides(classifications=classifications, **kwargs)
+
+
+def by_source(sources: Sequence[str], **kwargs) -> gpd.GeoDataFrame:
+    """Events of the given sources, see query_landslides()."""
+    return query_landslides(sources=sources, **kwargs)
+
+
+def iter_pages(
+    page_size: int = 10_000, **kwargs
+) -> Iterator[gpd.GeoDataFrame]:
+    """
+    Iterate over all matching events with keyset pagination (by ID), pages
+    are not cached. Keyword arguments are passed to query_landslides().
+
+    Args:
+        page_size (int): Maximum number of events per page.
+    Yields:
+        gpd.GeoDataFrame: The next page of events.
+    """
+    after_id = kwargs.pop("after_id", None)
+    while True:
+        page = query_landslides(
+            after_id=after_id, limit=page_size, use_cache=False, **kwargs
+        )
+        if page.empty:
+            return
+        yield page
+        if len(page) < page_size:
+            return
+        after_id = int(page["id"].iloc[-1])
@@ -0,0 +1,100 @@
+from datetime import date
+from typing import Any, Dict, Iterable
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from db.models import Classification, Sources
+from db.utils import source_values_from_metadata
+
+
+class ReferenceData:
+    """
+    Process-level cache of the reference tables `classification` and
+    `sources`. Both are loaded once, names are resolved to IDs in memory.
+    Writes go through bulk get-or-create statements
+    (`ON CONFLICT DO NOTHING`), which invalidate the affected cache.
+    """
+
+    def __init__(self):
+        self._classifications: dict[str, int] | None = None
+        self._sources: dict[tuple[str, date], int] | None = None
+
+    def invalidate(self):
+        """Drop all cached reference data, e.g., after a schema reset."""
+        self._classifications = None
+        self._sources = None
+
+    def classification_ids(self, session: Session) -> dict[str, int]:
+        """Map classification names to their IDs."""
+        if self._classifications is None:
+            rows = session.execute(
+                select(Classification.name, Classification.id)
+            )
+            self._classifications = dict(rows.tuples())
+        return self._classifications
+
+    def ensure_classifications(
+        self, session: Session, names: Iterable[str]
+    ) -> int:
+        """
+        Add all missing classifications in one statement and commit.
+
+        Args:
+            session (Session): Active SQLAlchemy session.
+            names (Iterable[str]): Classification names.
+        Returns:
+            int: Number of newly added classifications.
+        """
+        missing = sorted(set(names) - set(self.classification_ids(session)))
+        if not missing:
+            return 0
+
+        added = session.scalars(
+            insert(Classification)
+            .values([{"name": name} for name in missing])
+            .on_conflict_do_nothing(index_elements=["name"])
+            .returning(Classification.id)
+        ).all()
+        session.commit()
+        self._classifications = None
+        return len(added)
+
+    def source_id(self, session: Session, metadata: Dict[str, Any]) -> int:
+        """
+        Get the ID of a source, identified by its name and download date. The
+        source is created (and committed) if it does not exist yet.
+
+        Args:
+            session (Session): Active SQLAlchemy session.
+            metadata (Dict[str, Any]): Content of the metadata file.
+        Returns:
+            int: ID of the source.
+        """
+        values = source_values_from_metadata(metadata)
+        key = (values["name"], values["downloaded"])
+        if self._sources is None:
+            self._load_sources(session)
+
+        if key not in self._sources:
+            session.execute(
+                insert(Sources)
+                .values(**values)
+                .on_conflict_do_nothing(index_elements=["name", "downloaded"])
+            )
+            session.commit()
+            # reload, the source might have been added concurrently
+            self._load_sources(session)
+
+        return self._sources[key]
+
+    def _load_sources(self, session: Session):
+        rows = session.execute(
+            select(Sources.name, Sources.downloaded, Sources.id)
+        )
+        self._sources = {(name, d): id_ for name, d, id_ in rows}
+
+
+# shared by all processors of a process
+REFERENCE_DATA = ReferenceData()
@@ -0,0 +1,61 @@
+import geopandas as gpd
+import pandas as pd
+from sqlalchemy import Select, func, select
+
+from db.aggregates import GRID_CELL_SIZES
+from db.models import Classification, LandslidesGrid, Sources
+from db.query import query_landslides
+from db.utils import create_db_session
+
+# Coarsest grid, the fewest rows to sum up; counts are the same for every
+# resolution
+_CELL_SIZE = max(GRID_CELL_SIZES)
+
+
+def _counts(stmt: Select, name: str) -> pd.Series:
+    """Sum the grid counts grouped by the (single) selected column."""
+    total = func.sum(LandslidesGrid.count).label("count")
+    (key,) = stmt.selected_columns
+    stmt = (
+        stmt.add_columns(total)
+        .where(LandslidesGrid.cell_size == _CELL_SIZE)
+        .group_by(key)
+        .order_by(key)
+    )
+    Session = create_db_session()  # noqa: N806
+    with Session() as session:
+        rows = session.execute(stmt).all()
+
+    return pd.Series(
+        {row[0]: int(row[1]) for row in rows}, name="count", dtype="int64"
+    ).rename_axis(name)
+
+
+def year_counts() -> pd.Series:
+    """Number of events per year, sorted by year."""
+    return _counts(select(LandslidesGrid.year), "year")
+
+
+def classification_counts() -> pd.Series:
+    """Number of events per classification, sorted descending."""
+    stmt = select(Classification.name).join(
+        LandslidesGrid,
+        LandslidesGrid.classification_id == Classification.id,
+    )
+    counts = _counts(stmt, "classification_name")
+    return counts.sort_values(ascending=False)
+
+
+def source_counts() -> pd.Series:
+    """Number of events per source, sorted descending."""
+    stmt = select(Sources.name).join(
+        LandslidesGrid, LandslidesGrid.source_id == Sources.id
+    )
+    counts = _counts(stmt, "source_name")
+    return counts.sort_values(ascending=False)
+
+
+def map_points() -> gpd.GeoDataFrame:
+    """Geometries and classification names of all events, i.e., only the
+    columns needed to map them."""
+    return query_landslides(columns=["classification_name"], use_cache=False)
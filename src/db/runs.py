@@ -0,0 +1,111 @@
+from importlib.metadata import version
+from typing import Any
+
+from sqlalchemy import delete, func, insert, or_, select, update
+
+from db.aggregates import refresh_grid
+from db.maintenance import optimize
+from db.models import (
+    DuplicateLinks,
+    ImportRuns,
+    Landslides,
+    QuarantinedRecords,
+)
+from db.utils import create_db_session, import_version
+
+
+def start_run() -> int:
+    """Add a running import to the `import_runs` ledger, returns its ID."""
+    Session = create_db_session()  # noqa: N806
+    with Session() as session:
+        run_id = session.scalar(
+            insert(ImportRuns)
+            .values(imported_with_version=version("ocomma-db"))
+            .returning(ImportRuns.id)
+        )
+        session.commit()
+    return run_id
+
+
+def finish_run(
+    run_id: int,
+    counts: dict[str, dict[str, Any]],
+    status: str | None = None,
+) -> str:
+    """
+    Record the end of an import run.
+
+    Args:
+        run_id (int): ID of the run.
+        counts (dict[str, dict[str, Any]]): Counts per source, see
+            `BaseProcessor.counts`.
+        status (str | None, optional): Status of the run. By default,
+            `failed` if any insert failed, otherwise `succeeded`.
+    Returns:
+        str: Status of the run.
+    """
+    if status is None:
+        failed = any(source["errors"] for source in counts.values())
+        status = "failed" if failed else "succeeded"
+
+    Session = create_db_session()  # noqa: N806
+    with Session() as session:
+        session.execute(
+            update(ImportRuns)
+            .where(ImportRuns.id == run_id)
+            .values(finished_at=func.now(), status=status, counts=counts)
+        )
+        session.commit()
+    return status
+
+
+def rollback_run(run_id: int) -> int:
+    """
+    Remove all records of an import run (a single indexed delete), the
+    duplicate links of the run or pointing to its records, its quarantined
+    records, rebuild the grid aggregates and vacuum the tables (see
+    db.maintenance.optimize()). Adds a row to the `version` table, which
+    invalidates the caches of db.query and the feature API.
+
+    Args:
+        run_id (int): ID of the run.
+    Returns:
+        int: Number of removed records.
+    """
+    Session = create_db_session()  # noqa: N806
+    with Session() as session:
+        session.execute(
+            delete(DuplicateLinks).where(
+                or_(
+                    DuplicateLinks.run_id == run_id,
+                    DuplicateLinks.landslide_id.in_(
+                        select(Landslides.id).where(
+                            Landslides.run_id == run_id
+                        )
+                    ),
+                )
+            )
+        )
+        session.execute(
+            delete(QuarantinedRecords).where(
+                QuarantinedRecords.run_id == run_id
+            )
+        )
+        n_deleted = session.execute(
+            delete(Landslides).where(Landslides.run_id == run_id)
+        ).rowcount
+        session.execute(
+            update(ImportRuns)
+            .where(ImportRuns.id == run_id)
+            .values(status="rolled back")
+        )
+        session.commit()
+
+    # the caches are keyed on the latest version
+    import_version()
+    # removed records can't be tracked incrementally
+    refresh_grid()
+    # reclaim the space of the removed records
+    optimize()
+    print(f"Removed {n_deleted} records of import run {run_id}.")
+    return n_deleted
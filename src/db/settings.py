@@ -12,12 +12,27 @@ def _read_env_variable(var_name: str) -> str:
     return value
 
 
-# use naming of supported env variables
-# see https://hub.docker.com/r/postgis/postgis/#supported-environment-variables
-db_user = _read_env_variable("POSTGRES_USER")
-db_password = _read_env_variable("POSTGRES_PASSWORD")
-db_host = _read_env_variable("POSTGRES_HOST")
-db_port = _read_env_variable("POSTGRES_PORT")
-db_name = _read_env_variable("POSTGRES_DB")
-
-DB_URI = f"postgresql+psycopg://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
+# Storage backend, either "postgis" (default) or "embedded", i.e., a single
+# GeoPackage file without a data base server (see db.embedded)
+BACKEND = os.getenv("DB_BACKEND", "postgis")
+if BACKEND not in ("postgis", "embedded"):
+    raise ValueError(f"Unknown DB_BACKEND {BACKEND}.")
+
+EMBEDDED_DB_PATH = os.getenv("EMBEDDED_DB_PATH", "./data/ocomma-db.gpkg")
+
+# Manual corrections of the source data (see db.corrections), defaults to the
+# corrections shipped with the package
+CORRECTIONS_FILE = os.getenv("CORRECTIONS_FILE")
+
+if BACKEND == "postgis":
+    # use naming of supported env variables
+    # see https://hub.docker.com/r/postgis/postgis/#supported-environment-variables
+    db_user = _read_env_variable("POSTGRES_USER")
+    db_password = _read_env_variable("POSTGRES_PASSWORD")
+    db_host = _read_env_variable("POSTGRES_HOST")
+    db_port = _read_env_variable("POSTGRES_PORT")
+    db_name = _read_env_variable("POSTGRES_DB")
+
+    DB_URI = f"postgresql+psycopg://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
+else:
+    DB_URI = None
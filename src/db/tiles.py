@@ -0,0 +1,234 @@
+import gzip
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import Engine, text
+
+from db.constants import TARGET_CRS
+from db.utils import create_db_engine
+
+# Half the extent of the Web Mercator (EPSG:3857) square
+MERCATOR_EXTENT = 20037508.342789244
+LAYER_NAME = "landslides"
+
+# Renders a single tile from the stored Web Mercator geometries, neither the
+# tile envelope nor the points need to be re-projected
+TILE_SQL = text("""
+    WITH bounds AS (
+        SELECT ST_TileEnvelope(:z, :x, :y) AS geom
+    ),
+    features AS (
+        SELECT
+            ST_AsMVTGeom(l.geometry_3857, bounds.geom, buffer => 0) AS geom,
+            l.id,
+            l.datetime::text AS datetime,
+            c.name AS classification_name,
+            s.name AS source_name
+        FROM public.landslides l
+        JOIN public.classification c ON l.classification_id = c.id
+        JOIN public.sources s ON l.source_id = s.id,
+            bounds
+        WHERE l.geometry_3857 && bounds.geom
+    )
+    SELECT ST_AsMVT(features, :layer, 4096, 'geom')
+    FROM features
+    WHERE geom IS NOT NULL
+""")
+
+
+def tiles_of_points(
+    x: np.ndarray, y: np.ndarray, zoom: int
+) -> set[tuple[int, int, int]]:
+    """XYZ tiles (z, x, y) containing the given Web Mercator coordinates."""
+    n_tiles = 2**zoom
+    columns = np.floor((x + MERCATOR_EXTENT) / (2 * MERCATOR_EXTENT) * n_tiles)
+    rows = np.floor((MERCATOR_EXTENT - y) / (2 * MERCATOR_EXTENT) * n_tiles)
+    tiles = np.unique(
+        np.clip(np.column_stack([columns, rows]), 0, n_tiles - 1).astype(int),
+        axis=0,
+    )
+    return {(zoom, int(column), int(row)) for column, row in tiles}
+
+
+def _init_mbtiles(conn: sqlite3.Connection):
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS metadata (name TEXT, value TEXT);
+        CREATE UNIQUE INDEX IF NOT EXISTS metadata_index ON metadata (name);
+        CREATE TABLE IF NOT EXISTS tiles (
+            zoom_level INTEGER,
+            tile_column INTEGER,
+            tile_row INTEGER,
+            tile_data BLOB
+        );
+        CREATE UNIQUE INDEX IF NOT EXISTS tile_index
+            ON tiles (zoom_level, tile_column, tile_row);
+    """)
+
+
+def _read_metadata(conn: sqlite3.Connection, name: str) -> str | None:
+    row = conn.execute(
+        "SELECT value FROM metadata WHERE name = ?", (name,)
+    ).fetchone()
+    return row[0] if row else None
+
+
+def _write_metadata(conn: sqlite3.Connection, metadata: dict[str, str]):
+    conn.executemany(
+        "INSERT OR REPLACE INTO metadata (name, value) VALUES (?, ?)",
+        metadata.items(),
+    )
+
+
+def _render_tile(engine: Engine, tile: tuple[int, int, int]) -> bytes:
+    z, x, y = tile
+    with engine.connect() as conn:
+        mvt = conn.execute(
+            TILE_SQL, {"z": z, "x": x, "y": y, "layer": LAYER_NAME}
+        ).scalar()
+    return bytes(mvt) if mvt else b""
+
+
+def render_tiles(
+    output_file: str | Path,
+    max_zoom: int = 12,
+    min_zoom: int = 0,
+    full: bool = False,
+    workers: int = 8,
+) -> int:
+    """
+    Pre-render the vector tiles of the landslides into an MBTiles file.
+
+    Only tiles containing records added since the last run are rendered (the
+    highest rendered landslide ID is kept in the MBTiles metadata). With
+    `full`, a new file or another zoom range than the rendered one (kept in
+    the metadata), all tiles containing any record are rendered.
+    Tiles are rendered in parallel by PostGIS (`ST_AsMVT`).
+
+    Args:
+        output_file (str | Path): The MBTiles file.
+        max_zoom (int): Highest zoom level to render. Defaults to 12.
+        min_zoom (int): Lowest zoom level to render. Defaults to 0.
+        full (bool): Re-render all tiles, e.g., after records were deleted.
+        workers (int): Number of tiles rendered concurrently.
+    Returns:
+        int: Number of rendered tiles.
+    """
+    output_file = Path(output_file)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    if full:
+        output_file.unlink(missing_ok=True)
+
+    engine = create_db_engine(pool_size=workers)
+    try:
+        # closing() closes the file, the inner context commits
+        with closing(sqlite3.connect(output_file)) as mbtiles, mbtiles:
+            _init_mbtiles(mbtiles)
+            rendered_until = _read_metadata(mbtiles, "max_landslide_id")
+            rendered_zooms = (
+                _read_metadata(mbtiles, "minzoom"),
+                _read_metadata(mbtiles, "maxzoom"),
+            )
+            if rendered_until is not None and rendered_zooms != (
+                str(min_zoom),
+                str(max_zoom),
+            ):
+                # other zoom levels, start from scratch
+                mbtiles.execute("DELETE FROM tiles")
+                rendered_until = None
+            rendered_until = int(rendered_until or 0)
+
+            with engine.connect() as conn:
+                points = conn.execute(
+                    text("""
+                        SELECT
+                            id,
+                            ST_X(geometry_3857) AS x,
+                            ST_Y(geometry_3857) AS y
+                        FROM public.landslides
+                        WHERE id > :rendered_until
+                    """),
+                    {"rendered_until": rendered_until},
+                ).all()
+
+            if not points:
+                print("Tile cache is up to date.")
+                return 0
+
+            ids, x, y = np.array(points, dtype=float).T
+            tiles = sorted(
+                tile
+                for zoom in range(min_zoom, max_zoom + 1)
+                for tile in tiles_of_points(x, y, zoom)
+            )
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                rendered = executor.map(
+                    lambda tile: _render_tile(engine, tile), tiles
+                )
+                for (z, tile_x, tile_y), mvt in zip(
+                    tiles, rendered, strict=True
+                ):
+                    mbtiles.execute(
+                        "INSERT OR REPLACE INTO tiles VALUES (?, ?, ?, ?)",
+                        # MBTiles uses the TMS scheme (flipped y axis)
+                        (z, tile_x, 2**z - 1 - tile_y, gzip.compress(mvt)),
+                    )
+
+            bounds = mbtiles_bounds(engine)
+            _write_metadata(
+                mbtiles,
+                {
+                    "name": LAYER_NAME,
+                    "format": "pbf",
+                    "type": "overlay",
+                    "minzoom": str(min_zoom),
+                    "maxzoom": str(max_zoom),
+                    "bounds": ",".join(f"{value:.6f}" for value in bounds),
+                    "json": json.dumps(
+                        {
+                            "vector_layers": [
+                                {
+                                    "id": LAYER_NAME,
+                                    "minzoom": min_zoom,
+                                    "maxzoom": max_zoom,
+                                    "fields": {
+                                        "id": "Number",
+                                        "datetime": "String",
+                                        "classification_name": "String",
+                                        "source_name": "String",
+                                    },
+                                }
+                            ]
+                        }
+                    ),
+                    "max_landslide_id": str(int(ids.max())),
+                },
+            )
+    finally:
+        engine.dispose()
+
+    print(f"Rendered {len(tiles)} tiles to {output_file}.")
+    return len(tiles)
+
+
+def mbtiles_bounds(engine: Engine) -> tuple[float, float, float, float]:
+    """Extent of all landslides in EPSG:4326 (west, south, east, north)."""
+    with engine.connect() as conn:
+        extent = conn.execute(
+            text("""
+                SELECT
+                    ST_XMin(e), ST_YMin(e), ST_XMax(e), ST_YMax(e)
+                FROM (
+                    SELECT ST_Transform(
+                        ST_SetSRID(ST_Extent(geometry)::geometry, :srid), 4326
+                    ) AS e
+                    FROM public.landslides
+                ) AS extent
+            """),
+            {"srid": TARGET_CRS},
+        ).one()
+    return tuple(extent)
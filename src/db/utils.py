@@ -5,11 +5,12 @@ from typing import Any, Dict
 
 import geopandas as gpd
 import pandas as pd
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine, func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
-from db.models import Sources, Version
-from db.settings import DB_URI
+from db.models import Landslides, Sources, Version
+from db.settings import BACKEND, DB_URI
 
 
 def convert_to_gpkg(
@@ -26,25 +27,22 @@ def convert_to_gpkg(
     print("Converted!")
 
 
-def dump_gpkg(
-    data: gpd.GeoDataFrame,
-    output_file: str | Path,
-    overwrite: bool = True,
-) -> None:
-    """Dump the processed data to a file."""
-    if Path(output_file).exists() and not overwrite:
-        raise FileExistsError(
-            f"File {output_file} already exists. Skipping dump. "
-            f"Set overwrite=True to overwrite."
-        )
-    # delete an existing GeoPackage, overwriting leads to issues
-    Path(output_file).unlink(missing_ok=True)
-    data.to_file(output_file, driver="GPKG")
+def create_db_engine(**kwargs) -> Engine:
+    """Create an engine for the data base. Keyword arguments, e.g., the
+    `pool_size`, are passed to the engine."""
+    return create_engine(DB_URI, echo=False, plugins=["geoalchemy2"], **kwargs)
 
 
 def create_db_session():
-    engine = create_engine(DB_URI, echo=False, plugins=["geoalchemy2"])
-    return sessionmaker(bind=engine)
+    return sessionmaker(bind=create_db_engine())
+
+
+def create_async_db_engine(**kwargs) -> AsyncEngine:
+    """Create an asyncio engine (psycopg async) for the data base. Keyword
+    arguments, e.g., the `pool_size`, are passed to the engine."""
+    return create_async_engine(
+        DB_URI, echo=False, plugins=["geoalchemy2"], **kwargs
+    )
 
 
 def read_metadata(file_path: str | Path) -> dict[str, Any]:
@@ -70,29 +68,55 @@ def read_metadata(file_path: str | Path) -> dict[str, Any]:
         return json.load(f)
 
 
-def create_source_from_metadata(metadata: Dict[str, Any]) -> Sources:
-    """Creates a Source object from a metadata dictionary."""
+def source_values_from_metadata(metadata: Dict[str, Any]) -> dict[str, Any]:
+    """Column values of the `sources` table from a metadata dictionary."""
     # modified is nullable
     modified_date = metadata.get("modified")
     if modified_date:
         modified_date = pd.to_datetime(modified_date).date()
 
-    return Sources(
-        name=metadata["name"],
-        downloaded=pd.to_datetime(metadata["downloaded"]).date(),
-        modified=modified_date,
-        license=metadata["license"],
-        url=metadata["url"],
-        description=metadata.get("description"),  # nullable
-        doi=metadata.get("doi"),  # nullable
-    )
+    return {
+        "name": metadata["name"],
+        "downloaded": pd.to_datetime(metadata["downloaded"]).date(),
+        "modified": modified_date,
+        "license": metadata["license"],
+        "url": metadata["url"],
+        "description": metadata.get("description"),  # nullable
+        "doi": metadata.get("doi"),  # nullable
+    }
+
+
+def create_source_from_metadata(metadata: Dict[str, Any]) -> Sources:
+    """Creates a Source object from a metadata dictionary."""
+    return Sources(**source_values_from_metadata(metadata))
 
 
 def import_version() -> None:
     """Add the current package version to a dedicated table."""
     __version__ = version("ocomma-db")
 
+    if BACKEND == "embedded":
+        from db.embedded import embedded_store
+
+        embedded_store().add_version(__version__)
+        return
+
     Session = create_db_session()  # noqa: N806
     with Session() as session:
         session.add(Version(imported_with_version=__version__))
         session.commit()
+
+
+def max_landslide_id() -> int:
+    """Highest ID in the `landslides` table, 0 if empty. Records imported
+    afterwards have a higher ID."""
+    if BACKEND == "embedded":
+        from db.embedded import embedded_store
+
+        return embedded_store().max_landslide_id()
+
+    Session = create_db_session()  # noqa: N806
+    with Session() as session:
+        return session.scalar(
+            select(func.coalesce(func.max(Landslides.id), 0))
+        )
@@ -0,0 +1,187 @@
+import datetime as dt
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+
+from db.models import Landslides
+
+# column_map keys which do not share the name of their `landslides` column
+DB_COLUMNS = {"classification": "classification_id"}
+# Row labels listed per violation
+MAX_EXAMPLES = 5
+
+
+@dataclass(frozen=True)
+class Violation:
+    """Rows of a data set violating a single check."""
+
+    column: str
+    check: str
+    rows: pd.Index
+
+    def __str__(self) -> str:
+        examples = ", ".join(map(str, self.rows[:MAX_EXAMPLES]))
+        if len(self.rows) > MAX_EXAMPLES:
+            examples += ", ..."
+        return (
+            f"{self.column}: {len(self.rows)} rows {self.check} ({examples})"
+        )
+
+
+class ValidationError(ValueError):
+    """Data violating the schema of the `landslides` table."""
+
+    def __init__(self, dataset_name: str, violations: list[Violation]):
+        self.violations = violations
+        super().__init__(
+            f"{dataset_name} data violates the landslides schema:\n"
+            + "\n".join(f"- {violation}" for violation in violations)
+        )
+
+
+def _rows(data: pd.DataFrame, mask: np.ndarray | pd.Series) -> pd.Index:
+    return data.index[np.asarray(mask, dtype=bool)]
+
+
+def _check_values(
+    data: pd.DataFrame, key: str, column: str, python_type: type
+) -> list[Violation]:
+    """Type checks of a (non-null) column by the Python type of its data
+    base column."""
+    values = data[column]
+    present = values.notna().to_numpy()
+    if python_type is dt.datetime:
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return []
+        parsed = pd.to_datetime(values, errors="coerce", format="mixed")
+        invalid = present & parsed.isna().to_numpy()
+        check = "are no valid datetimes"
+    elif python_type is str:
+        if pd.api.types.infer_dtype(values, skipna=True) in (
+            "string",
+            "empty",
+        ):
+            return []
+        is_str = np.frompyfunc(lambda value: isinstance(value, str), 1, 1)
+        invalid = present & ~is_str(values.to_numpy()).astype(bool)
+        check = "are no strings"
+    else:
+        return []
+    if not invalid.any():
+        return []
+    return [Violation(f"{key} ({column})", check, _rows(data, invalid))]
+
+
+def _check_geometry(data: gpd.GeoDataFrame, crs: int) -> list[Violation]:
+    """The geometry has to be a single 2D point with finite coordinates in
+    the target CRS."""
+    if data.crs != crs:
+        return [
+            Violation(
+                "geometry",
+                f"are in {data.crs}, expected EPSG:{crs}",
+                data.index,
+            )
+        ]
+    geometries = data.geometry.to_numpy()
+    missing = shapely.is_missing(geometries)
+    checks = {
+        "are missing": missing,
+        "are no points": ~missing
+        & (shapely.get_type_id(geometries) != shapely.GeometryType.POINT),
+        "are empty": ~missing & shapely.is_empty(geometries),
+        "have a Z coordinate": shapely.has_z(geometries),
+    }
+    points = ~(checks["are no points"] | checks["are empty"] | missing)
+    checks["have non-finite coordinates"] = points & ~np.isfinite(
+        shapely.bounds(geometries)
+    ).all(axis=1)
+    return [
+        Violation("geometry", check, _rows(data, invalid))
+        for check, invalid in checks.items()
+        if invalid.any()
+    ]
+
+
+def validate_landslides(
+    data: gpd.GeoDataFrame,
+    column_map: dict[str, str],
+    classification_names: Iterable[str],
+    crs: int,
+) -> list[Violation]:
+    """
+    Check records against the schema of the `landslides` table before any
+    import work. The checks follow from the table definition: mapped
+    columns have to exist (in the data and in `landslides`), columns which
+    are not nullable must not hold missing values, values have to match the
+    column type and classifications must be known. All checks are
+    vectorized over the whole data set.
+
+    Args:
+        data (gpd.GeoDataFrame): Records to import.
+        column_map (dict[str, str]): Maps the database columns to the
+            DataFrame columns, see BaseProcessor.column_map.
+        classification_names (Iterable[str]): Known classifications.
+        crs (int): Expected CRS (EPSG code) of the geometries.
+    Returns:
+        list[Violation]: All violations, empty if the data is valid.
+    """
+    table = Landslides.__table__
+    violations = []
+    for key in ("datetime", "classification", "original_classification"):
+        if key not in column_map:
+            violations.append(
+                Violation(key, "are not mapped (column_map)", data.index)
+            )
+
+    for key, column in column_map.items():
+        db_column = table.c.get(DB_COLUMNS.get(key, key))
+        if db_column is None:
+            violations.append(
+                Violation(
+                    f"{key} ({column})",
+                    "are mapped to no column of landslides (column_map)",
+                    data.index,
+                )
+            )
+            continue
+        if column not in data.columns:
+            if not db_column.nullable:
+                violations.append(
+                    Violation(
+                        f"{key} ({column})", "miss the column", data.index
+                    )
+                )
+            continue
+        missing = data[column].isna().to_numpy()
+        if not db_column.nullable and missing.any():
+            violations.append(
+                Violation(
+                    f"{key} ({column})", "are missing", _rows(data, missing)
+                )
+            )
+        if key == "classification":
+            unknown = (
+                ~missing
+                & ~data[column].isin(list(classification_names)).to_numpy()
+            )
+            if unknown.any():
+                names = ", ".join(map(str, data.loc[unknown, column].unique()))
+                violations.append(
+                    Violation(
+                        f"{key} ({column})",
+                        f"have an unknown classification: {names}",
+                        _rows(data, unknown),
+                    )
+                )
+        else:
+            violations.extend(
+                _check_values(data, key, column, db_column.type.python_type)
+            )
+
+    violations.extend(_check_geometry(data, crs))
+    return violations
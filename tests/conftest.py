@@ -0,0 +1,24 @@
+import os
+
+import geopandas as gpd
+from shapely.geometry import box
+
+# db.settings requires the connection variables, the tests don't connect to
+# a data base
+for name in (
+    "POSTGRES_USER",
+    "POSTGRES_PASSWORD",
+    "POSTGRES_HOST",
+    "POSTGRES_PORT",
+    "POSTGRES_DB",
+):
+    os.environ.setdefault(name, "test")
+
+import db.constants  # noqa: E402
+
+# The Austrian border is stored with git lfs, use a stand-in region (in
+# TARGET_CRS) such that processors can be created without it
+REGION = box(400_000, 5_150_000, 900_000, 5_450_000)
+db.constants._austria = lambda: gpd.GeoDataFrame(
+    geometry=[REGION], crs=db.constants.TARGET_CRS
+)
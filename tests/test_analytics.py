@@ -0,0 +1,131 @@
+import geopandas as gpd
+import pandas as pd
+import pytest
+import shapely
+
+from db.constants import TARGET_CRS
+
+duckdb = pytest.importorskip("duckdb")
+
+from db.analytics import Analytics  # noqa: E402
+
+# Two pairs of WLV and GeoSphere events at the same date, 1 km and 500 m
+# apart; the other events are of another date or far off
+EVENTS = gpd.GeoDataFrame(
+    {
+        "id": [1, 2, 3, 4, 5, 6],
+        "datetime": pd.to_datetime(
+            [
+                "2020-05-01 10:00",
+                "2020-05-01 18:00",
+                "2021-07-01 00:00",
+                "2021-07-01 12:00",
+                "2021-07-02 12:00",
+                "2021-07-01 12:00",
+            ]
+        ),
+        "source_name": ["WLV", "GeoSphere"] * 3,
+        "classification_name": ["rockfall"] * 4 + ["slide"] * 2,
+    },
+    geometry=shapely.points(
+        [500_000, 501_000, 600_000, 600_500, 600_000, 700_000],
+        5_300_000,
+    ),
+    crs=TARGET_CRS,
+)
+
+
+@pytest.fixture(params=["parquet", "gpkg"])
+def analytics(request, tmp_path):
+    """Analytics over EVENTS, attached as `landslides` from a GeoParquet or a
+    GeoPackage file (in a directory with a quote in its name)."""
+    try:
+        analytics = Analytics(threads=1)
+    except duckdb.Error as e:
+        pytest.skip(f"DuckDB spatial extension unavailable: {e}")
+    directory = tmp_path / "o'clock"
+    directory.mkdir()
+    path = directory / f"landslides.{request.param}"
+    if request.param == "parquet":
+        EVENTS.to_parquet(path)
+    else:
+        EVENTS.to_file(path, driver="GPKG")
+    analytics.attach(path, "landslides")
+    return analytics
+
+
+def test_yearly_counts(analytics):
+    counts = analytics.yearly_counts()
+
+    assert counts.to_dict("records") == [
+        {
+            "year": 2020,
+            "source_name": "GeoSphere",
+            "classification_name": "rockfall",
+            "count": 1,
+        },
+        {
+            "year": 2020,
+            "source_name": "WLV",
+            "classification_name": "rockfall",
+            "count": 1,
+        },
+        {
+            "year": 2021,
+            "source_name": "GeoSphere",
+            "classification_name": "rockfall",
+            "count": 1,
+        },
+        {
+            "year": 2021,
+            "source_name": "GeoSphere",
+            "classification_name": "slide",
+            "count": 1,
+        },
+        {
+            "year": 2021,
+            "source_name": "WLV",
+            "classification_name": "rockfall",
+            "count": 1,
+        },
+        {
+            "year": 2021,
+            "source_name": "WLV",
+            "classification_name": "slide",
+            "count": 1,
+        },
+    ]
+
+
+def test_cross_source_overlap(analytics):
+    overlap = analytics.cross_source_overlap()
+
+    assert overlap.to_dict("records") == [
+        {"source": "GeoSphere", "other_source": "WLV", "count": 2},
+        {"source": "WLV", "other_source": "GeoSphere", "count": 2},
+    ]
+    # the pair of 2020 is 1 km apart
+    assert analytics.cross_source_overlap(search_radius_meters=600).to_dict(
+        "records"
+    ) == [
+        {"source": "GeoSphere", "other_source": "WLV", "count": 1},
+        {"source": "WLV", "other_source": "GeoSphere", "count": 1},
+    ]
+
+
+def test_paths_with_quotes(tmp_path):
+    """Paths are quoted as SQL literals, also without the spatial extension
+    (GeoParquet geometries are read as WKB)."""
+    analytics = Analytics.__new__(Analytics)
+    analytics.con = duckdb.connect()
+    directory = tmp_path / "o'clock"
+    directory.mkdir()
+    pd.DataFrame({"id": [1, 2], "geometry": [b"a", b"b"]}).to_parquet(
+        directory / "input.parquet"
+    )
+
+    analytics.attach(directory / "input.parquet", "input")
+    analytics.to_parquet("input", directory / "output.parquet")
+
+    output = pd.read_parquet(directory / "output.parquet")
+    assert output.to_dict("list") == {"id": [1, 2], "geom": [b"a", b"b"]}
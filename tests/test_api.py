@@ -0,0 +1,143 @@
+import io
+from datetime import datetime
+from email.message import Message
+
+import pytest
+
+import db.api
+from db.api import (
+    DEFAULT_LIMIT,
+    MAX_LIMIT,
+    BadRequestError,
+    FeatureHandler,
+    _etag,
+    parse_params,
+)
+
+IMPORTED_AT = datetime(2025, 1, 1, 12, 0, 0, 500_000)
+
+
+def _handler(path="/landslides", **headers):
+    """Handler of a request with the given headers, without a connection."""
+    handler = FeatureHandler.__new__(FeatureHandler)
+    handler.path = path
+    handler.headers = Message()
+    for name, value in headers.items():
+        handler.headers[name.replace("_", "-")] = value
+    handler.command, handler.request_version = "GET", "HTTP/1.1"
+    handler.requestline = f"GET {path} HTTP/1.1"
+    handler.client_address = ("127.0.0.1", 0)
+    handler.wfile = io.BytesIO()
+    return handler
+
+
+def test_parse_params_defaults():
+    assert parse_params("") == {
+        "after_id": None,
+        "limit": DEFAULT_LIMIT,
+        "start": None,
+        "end": None,
+        "f": "geojson",
+    }
+
+
+def test_parse_params():
+    params = parse_params(
+        "bbox=9,46,17,49&start=2020-01-01&end=2020-12-31T12:00"
+        "&classification=rockfall,debris%20flow&classification=slide"
+        "&after_id=10&limit=5&limit=50&f=ndjson"
+    )
+
+    assert params == {
+        "after_id": 10,
+        # the last value of repeated parameters wins
+        "limit": 50,
+        "start": datetime(2020, 1, 1),
+        "end": datetime(2020, 12, 31, 12),
+        "bbox": (9.0, 46.0, 17.0, 49.0),
+        "classifications": ["rockfall", "debris flow", "slide"],
+        "f": "ndjson",
+    }
+
+
+@pytest.mark.parametrize(
+    ("query", "message"),
+    [
+        ("bbox=1,2,3", "bbox requires four values"),
+        ("bbox=a,b,c,d", "could not convert"),
+        ("start=yesterday", "Invalid isoformat"),
+        ("after_id=first", "invalid literal"),
+        ("limit=0", "limit must be within"),
+        (f"limit={MAX_LIMIT + 1}", "limit must be within"),
+        ("f=csv", "f must be one of"),
+    ],
+)
+def test_parse_params_invalid(query, message):
+    with pytest.raises(BadRequestError, match=message):
+        parse_params(query)
+
+
+def test_etag():
+    etag = _etag(1, "/landslides?limit=10")
+
+    assert etag.startswith('"')
+    assert etag.endswith('"')
+    assert etag == _etag(1, "/landslides?limit=10")
+    # new imports and other requests are tagged differently
+    assert etag != _etag(2, "/landslides?limit=10")
+    assert etag != _etag(1, "/landslides?limit=20")
+
+
+@pytest.mark.parametrize(
+    ("if_none_match", "expected"),
+    [
+        ('"a"', True),
+        ('"b", "a"', True),
+        ('"b"', False),
+    ],
+)
+def test_not_modified_etag(if_none_match, expected):
+    handler = _handler(
+        If_None_Match=if_none_match,
+        # ignored with If-None-Match
+        If_Modified_Since="Wed, 01 Jan 2025 12:00:00 GMT",
+    )
+
+    assert handler._not_modified('"a"', IMPORTED_AT) is expected
+
+
+@pytest.mark.parametrize(
+    ("if_modified_since", "expected"),
+    [
+        # imported_at is in UTC, Last-Modified truncates the microseconds
+        ("Wed, 01 Jan 2025 12:00:00 GMT", True),
+        ("Wed, 01 Jan 2025 13:00:00 +0100", True),
+        ("Wed, 01 Jan 2025 11:59:59 GMT", False),
+        ("Wed, 01 Jan 2025 12:00:00 +0100", False),
+        ("yesterday", False),
+    ],
+)
+def test_not_modified_since(if_modified_since, expected):
+    handler = _handler(If_Modified_Since=if_modified_since)
+
+    assert handler._not_modified('"a"', IMPORTED_AT) is expected
+
+
+def test_not_modified_without_import():
+    handler = _handler(If_Modified_Since="Wed, 01 Jan 2025 12:00:00 GMT")
+
+    assert not handler._not_modified('"a"', None)
+    assert not _handler()._not_modified('"a"', IMPORTED_AT)
+
+
+def test_get_not_modified(monkeypatch):
+    monkeypatch.setattr(db.api, "latest_import", lambda: (3, IMPORTED_AT))
+    path = "/landslides?limit=10"
+    handler = _handler(path, If_None_Match=_etag(3, path))
+
+    handler.do_GET()
+
+    response = handler.wfile.getvalue().decode()
+    assert response.startswith("HTTP/1.1 304")
+    assert f"ETag: {_etag(3, path)}" in response
+    assert "Last-Modified: Wed, 01 Jan 2025 12:00:00 GMT" in response
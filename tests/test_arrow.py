@@ -0,0 +1,44 @@
+import pytest
+import shapely
+
+from db.arrow import _storage, _to_geodataframe
+from db.constants import TARGET_CRS
+
+pa = pytest.importorskip("pyarrow")
+
+POINTS = [shapely.Point(500_000, 5_300_000), shapely.Point(600_000, 5_200_000)]
+OPAQUE = pa.opaque(pa.binary(), "geometry", "PostgreSQL")
+
+
+def _geometries(geometry_type):
+    # PostGIS returns EWKB with the SRID
+    ewkb = shapely.to_wkb(
+        shapely.set_srid(POINTS, TARGET_CRS), include_srid=True
+    ).tolist()
+    storage = pa.array([*ewkb, None], type=pa.binary())
+    if geometry_type == pa.binary():
+        return storage
+    return pa.ExtensionArray.from_storage(geometry_type, storage)
+
+
+def test_storage_of_opaque_type():
+    column = pa.chunked_array([_geometries(OPAQUE), _geometries(OPAQUE)])
+
+    storage = _storage(column)
+
+    assert storage.type == pa.binary()
+    assert storage.to_pylist() == 2 * _geometries(pa.binary()).to_pylist()
+
+
+@pytest.mark.parametrize(
+    "geometry_type", [pa.binary(), OPAQUE], ids=["binary", "opaque"]
+)
+def test_to_geodataframe(geometry_type):
+    table = pa.table({"id": [1, 2, 3], "geometry": _geometries(geometry_type)})
+
+    data = _to_geodataframe(table, "geometry", TARGET_CRS)
+
+    assert data.crs.to_epsg() == TARGET_CRS
+    assert data["id"].tolist() == [1, 2, 3]
+    assert data.geometry.iloc[:2].tolist() == POINTS
+    assert data.geometry.iloc[2] is None
@@ -0,0 +1,27 @@
+import numpy as np
+
+from db.audit import cluster_pairs
+
+
+def test_cluster_pairs_connected_components():
+    # chain 7-3-9, pair 20-21 and the chain 5-4-2-1 (given unordered)
+    id_a = np.array([3, 3, 20, 4, 2, 1])
+    id_b = np.array([7, 9, 21, 5, 4, 2])
+
+    np.testing.assert_array_equal(
+        cluster_pairs(id_a, id_b), [3, 3, 20, 1, 1, 1]
+    )
+
+
+def test_cluster_pairs_long_chain():
+    # worst case for label propagation, a single path in reverse order
+    ids = np.arange(10_000, 0, -1)
+    clusters = cluster_pairs(ids[1:], ids[:-1])
+
+    assert (clusters == 1).all()
+
+
+def test_cluster_pairs_empty():
+    empty = np.array([], dtype="int64")
+
+    assert len(cluster_pairs(empty, empty)) == 0
@@ -0,0 +1,88 @@
+import geopandas as gpd
+import pandas as pd
+import pytest
+import shapely
+
+from db.constants import TARGET_CRS
+from db.corrections import corrections, read_corrections
+
+CORRECTIONS = """\
+# comment
+source,date,x,y,tolerance,field,value
+Test,2020-01-01,100,100,5,classification,rockfall
+Test,2020-01-01,100,100,5,count,7
+Test,2020-01-01,104,100,5,classification,debris flow
+Test,2020-01-02,200,200,,classification,rockfall
+Other,2020-01-01,100,100,5,classification,other
+"""
+
+
+@pytest.fixture
+def test_corrections(tmp_path):
+    file_path = tmp_path / "corrections.csv"
+    file_path.write_text(CORRECTIONS)
+    return read_corrections(file_path)
+
+
+def _data(dates, x, y):
+    return gpd.GeoDataFrame(
+        {
+            "date": pd.to_datetime(dates),
+            "classification": "undefined",
+            "count": 1,
+        },
+        geometry=shapely.points(x, y),
+        crs=TARGET_CRS,
+    )
+
+
+def test_apply(test_corrections):
+    data = _data(
+        [
+            "2020-01-01 10:00",  # closest to (100, 100)
+            "2020-01-01 00:00",  # closest to (104, 100)
+            "2020-01-02 00:00",  # different date than (100, 100)
+            "2020-01-02 00:00",  # within the default tolerance of 1 m
+            "2020-01-02 00:00",  # outside of the default tolerance
+        ],
+        [101, 103.5, 100, 200.5, 202],
+        [100, 100, 100, 200, 200],
+    )
+
+    assert test_corrections.apply("Test", data, "date") == 3
+    assert data["classification"].tolist() == [
+        "rockfall",
+        "debris flow",
+        "undefined",
+        "rockfall",
+        "undefined",
+    ]
+    # the closest correction does not override count
+    assert data["count"].tolist() == [7, 1, 1, 1, 1]
+    assert data["count"].dtype == "int64"
+
+
+def test_apply_unknown_source(test_corrections):
+    data = _data(["2020-01-01"], [100], [100])
+
+    assert test_corrections.apply("Unknown", data, "date") == 0
+    assert data["classification"].tolist() == ["undefined"]
+
+
+def test_apply_unknown_field(test_corrections):
+    data = _data(["2020-01-01"], [100], [100]).drop(columns="count")
+
+    with pytest.raises(KeyError, match="count"):
+        test_corrections.apply("Test", data, "date")
+
+
+def test_missing_columns(tmp_path):
+    file_path = tmp_path / "corrections.csv"
+    file_path.write_text("source,date,x,y\n")
+
+    with pytest.raises(ValueError, match="field, tolerance, value"):
+        read_corrections(file_path)
+
+
+def test_shipped_corrections():
+    assert "Global Fatal Landslides" in corrections()
@@ -0,0 +1,118 @@
+import json
+
+import geopandas as gpd
+import pandas as pd
+import pytest
+import shapely
+
+from db.constants import TARGET_CRS
+from db.embedded import EmbeddedStore
+from db.processors.base import BaseProcessor
+
+METADATA = {
+    "name": "Test",
+    "downloaded": "2025-01-01",
+    "license": "CC-BY-4.0",
+    "url": "https://example.org",
+}
+
+
+class TestProcessor(BaseProcessor):
+    __test__ = False
+
+    column_map = {
+        "datetime": "date",
+        "classification": "kind",
+        "original_classification": "kind",
+    }
+
+    def __init__(self, *, file_path):
+        super().__init__(file_path=file_path, dataset_name="Test")
+
+    def process(self):
+        pass
+
+
+def _source_file(path, dates, x):
+    data = gpd.GeoDataFrame(
+        {"date": pd.to_datetime(dates), "kind": "rockfall"},
+        geometry=shapely.points(x, 5_300_000.0),
+        crs=TARGET_CRS,
+    )
+    path.mkdir()
+    file_path = path / "source.gpkg"
+    data.to_file(file_path, driver="GPKG")
+    (path / "source.meta.json").write_text(json.dumps(METADATA))
+    return file_path
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = EmbeddedStore(tmp_path / "db.gpkg")
+    store.ensure_classifications(["rockfall"])
+    monkeypatch.setattr("db.processors.base.BACKEND", "embedded")
+    monkeypatch.setattr("db.processors.base.embedded_store", lambda: store)
+    return store
+
+
+def test_import_with_duplicate_links(tmp_path, store):
+    first = TestProcessor(
+        file_path=_source_file(
+            tmp_path / "first",
+            ["2020-01-01", "2020-01-02"],
+            [500_000, 600_000],
+        )
+    )
+    first.run()
+    second = TestProcessor(
+        file_path=_source_file(
+            tmp_path / "second",
+            # duplicate of the first record, other date, out of reach
+            ["2020-01-01 10:00", "2020-01-01 00:00", "2020-01-02 00:00"],
+            [500_100, 600_000, 610_000],
+        )
+    )
+    with pytest.warns(UserWarning, match="Found 1 duplicate"):
+        second.run()
+
+    assert first.counts["inserted"] == 2
+    assert second.counts["duplicates"] == 1
+    assert second.counts["inserted"] == 2
+    assert store.landslides["id"].tolist() == [1, 2, 3, 4]
+    (link,) = store.duplicate_links.itertuples()
+    assert link.landslide_id == 1
+    assert link.matched_source_id == link.source_id
+    assert link.distance == pytest.approx(100)
+    assert link.geometry == shapely.Point(500_100, 5_300_000)
+
+    # the layers are persisted
+    reloaded = EmbeddedStore(store.path)
+    assert len(reloaded.landslides) == 4
+    assert reloaded.duplicate_links["landslide_id"].tolist() == [1]
+
+
+def test_resolve_duplicates_closest_match(store):
+    store.insert(
+        [
+            {
+                "datetime": pd.Timestamp("2020-01-01"),
+                "report": None,
+                "report_source": None,
+                "report_url": None,
+                "original_classification": "rockfall",
+                "geometry": f"SRID={TARGET_CRS};POINT ({x} 0)",
+                "classification_id": 1,
+                "source_id": 1,
+                "run_id": None,
+            }
+            for x in (0, 300, 1000)
+        ]
+    )
+
+    matches = store.resolve_duplicates(
+        pd.to_datetime(["2020-01-01", "2020-01-01", "2020-01-02"]),
+        gpd.GeoSeries(shapely.points([400, 5000, 0], 0)),
+    )
+
+    assert matches["landslide_id"].tolist() == [2, pd.NA, pd.NA]
+    assert matches["distance"].iloc[0] == pytest.approx(100)
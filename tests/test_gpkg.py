@@ -0,0 +1,59 @@
+import sqlite3
+from contextlib import closing
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pyogrio
+import pytest
+import shapely
+
+from db.constants import TARGET_CRS
+from db.gpkg import DumpWriter
+
+
+def _chunk(start, n):
+    return gpd.GeoDataFrame(
+        {
+            "id": np.arange(start, start + n),
+            "date": pd.date_range("2020-01-01", periods=n),
+        },
+        geometry=shapely.points(np.arange(start, start + n), 0.0),
+        crs=TARGET_CRS,
+    )
+
+
+def _rtree_size(gpkg_file):
+    with closing(sqlite3.connect(gpkg_file)) as gpkg:
+        table, geom = gpkg.execute(
+            "SELECT table_name, column_name FROM gpkg_extensions "
+            "WHERE extension_name = 'gpkg_rtree_index'"
+        ).fetchone()
+        return gpkg.execute(
+            f'SELECT count(*) FROM "rtree_{table}_{geom}"'
+        ).fetchone()[0]
+
+
+@pytest.mark.parametrize("append", [False, True])
+def test_dump_with_spatial_index(tmp_path, capsys, append):
+    output_file = tmp_path / "dump.gpkg"
+    chunks = [_chunk(0, 10), _chunk(10, 5), _chunk(15, 20)]
+    if not append:
+        chunks = [pd.concat(chunks, ignore_index=True)]
+    dumps = DumpWriter()
+
+    for chunk in chunks:
+        dumps.submit(chunk, output_file, append=append)
+    reports = dumps.wait()
+
+    # reports are printed by the caller, not the background thread
+    assert capsys.readouterr().out == ""
+    assert [report.split(" in ")[0] for report in reports] == [
+        f"Dumped {len(chunk)} records to dump.gpkg" for chunk in chunks
+    ]
+    expected = pd.concat(chunks, ignore_index=True)
+    dumped = pyogrio.read_dataframe(output_file)
+    assert dumped["id"].tolist() == expected["id"].tolist()
+    assert dumped.geometry.tolist() == expected.geometry.tolist()
+    assert _rtree_size(output_file) == len(expected)
+    assert list(tmp_path.iterdir()) == [output_file]
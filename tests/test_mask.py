@@ -0,0 +1,41 @@
+import geopandas as gpd
+import numpy as np
+import pytest
+import shapely
+from shapely.geometry import Point, Polygon
+
+from db.mask import RegionMask
+
+# Concave region with a hole, not aligned with the tiles
+REGION = Polygon(
+    [(0, 0), (100, 10), (90, 100), (50, 60), (5, 95)],
+    holes=[[(40, 30), (60, 30), (50, 45)]],
+)
+
+
+@pytest.mark.parametrize("tile_size", [3.0, 10.0, 1000.0])
+def test_contains_xy_matches_shapely(tile_size):
+    mask = RegionMask(REGION, tile_size=tile_size)
+    rng = np.random.default_rng(0)
+    x = rng.uniform(-20, 120, 20_000)
+    y = rng.uniform(-20, 120, 20_000)
+
+    np.testing.assert_array_equal(
+        mask.contains_xy(x, y), shapely.intersects_xy(REGION, x, y)
+    )
+
+
+def test_points_on_border_and_bounds():
+    mask = RegionMask(REGION, tile_size=10.0)
+    x, y = np.array([0.0, 100.0, 50.0, 5.0]), np.array([0.0, 10.0, 30.0, 95.0])
+
+    assert mask.contains_xy(x, y).all()
+
+
+def test_contains_missing_and_empty_geometries():
+    mask = RegionMask(REGION, tile_size=10.0)
+    geometries = gpd.GeoSeries([Point(50, 20), None, Point(), Point(50, 35)])
+
+    np.testing.assert_array_equal(
+        mask.contains(geometries), [True, False, False, False]
+    )
@@ -0,0 +1,73 @@
+import math
+from contextlib import nullcontext
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from db.models import Landslides
+from db.quarantine import _to_json, insert_isolating
+
+
+class FailingSession:
+    """Stands in for a session, rejects batches with negative values (like
+    a check constraint). Savepoints are no-ops, as failing batches are not
+    stored anyway."""
+
+    def __init__(self):
+        self.inserted = []
+        self.n_statements = 0
+
+    def begin_nested(self):
+        return nullcontext()
+
+    def execute(self, statement, records):  # noqa: ARG002
+        self.n_statements += 1
+        if any(record["value"] < 0 for record in records):
+            raise IntegrityError(
+                "INSERT", records, Exception("violates check constraint")
+            )
+        self.inserted.extend(records)
+
+
+@pytest.mark.parametrize(
+    ("n", "bad"),
+    [(1, []), (1, [0]), (1000, []), (1000, [0, 3, 500, 501, 999])],
+)
+def test_insert_isolating(n, bad):
+    records = [{"value": -1 if i in bad else i} for i in range(n)]
+    session = FailingSession()
+
+    n_inserted, failed = insert_isolating(session, Landslides, records)
+
+    assert n_inserted == n - len(bad)
+    assert session.inserted == [r for r in records if r["value"] >= 0]
+    assert [record for record, _ in failed] == [records[i] for i in bad]
+    assert all(error == "violates check constraint" for _, error in failed)
+    # about k * log2(n) statements for k failing records
+    assert session.n_statements <= 1 + 2 * len(bad) * math.ceil(
+        math.log2(n) + 1
+    )
+
+
+def test_to_json():
+    values = [
+        pd.Timestamp("2020-01-01 12:00"),
+        np.int64(3),
+        np.float64("nan"),
+        pd.NaT,
+        None,
+        "text",
+        1.5,
+    ]
+
+    assert [_to_json(value) for value in values] == [
+        "2020-01-01T12:00:00",
+        3,
+        None,
+        None,
+        None,
+        "text",
+        1.5,
+    ]
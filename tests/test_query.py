@@ -0,0 +1,87 @@
+import geopandas as gpd
+import pytest
+import shapely
+
+import db.query
+from db.constants import TARGET_CRS
+from db.query import clear_cache, query_landslides
+
+
+@pytest.fixture
+def fetched(monkeypatch):
+    """Stands in for the data base, records the fetched statements."""
+    version = {"id": 1}
+    statements = []
+
+    def read_geodataframe(stmt, crs):
+        statements.append(stmt)
+        return gpd.GeoDataFrame(
+            {"id": [len(statements)]},
+            geometry=[shapely.Point(0, 0)],
+            crs=crs,
+        )
+
+    monkeypatch.setattr(db.query, "import_version_id", lambda: version["id"])
+    monkeypatch.setattr(db.query, "read_geodataframe", read_geodataframe)
+    clear_cache()
+    yield statements, version
+    clear_cache()
+
+
+def test_list_parameters(fetched):
+    statements, _ = fetched
+
+    by_list = query_landslides(
+        bbox=[0, 0, 1, 1], point=[0, 0], radius_meters=10
+    )
+    by_tuple = query_landslides(
+        bbox=(0, 0, 1, 1), point=(0, 0), radius_meters=10
+    )
+
+    assert len(statements) == 1
+    assert by_list["id"].tolist() == by_tuple["id"].tolist() == [1]
+
+
+def test_cache_key(fetched):
+    statements, version = fetched
+
+    query_landslides(classifications=["b", "a"])
+    query_landslides(classifications=["a", "b"])
+    assert len(statements) == 1
+
+    query_landslides(classifications=["a"])
+    query_landslides(classifications=["a", "b"], crs=TARGET_CRS, limit=5)
+    assert len(statements) == 3
+
+    # a new import invalidates the cache
+    version["id"] = 2
+    query_landslides(classifications=["a", "b"])
+    assert len(statements) == 4
+
+    query_landslides(classifications=["a", "b"], use_cache=False)
+    assert len(statements) == 5
+
+
+@pytest.mark.usefixtures("fetched")
+def test_cached_results_are_copies():
+    query_landslides()["id"] = 42
+
+    assert query_landslides()["id"].tolist() == [1]
+
+
+def test_cache_size(fetched, monkeypatch):
+    statements, _ = fetched
+    monkeypatch.setattr(db.query, "CACHE_SIZE", 2)
+
+    for after_id in (1, 2, 3, 1):
+        query_landslides(after_id=after_id)
+
+    # the least recently used query was evicted
+    assert len(statements) == 4
+    query_landslides(after_id=3)
+    assert len(statements) == 4
+
+
+def test_radius_requires_point():
+    with pytest.raises(ValueError, match="radius search"):
+        query_landslides(point=(0, 0))
@@ -0,0 +1,89 @@
+import json
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+import shapely
+
+from db.constants import TARGET_CRS
+from db.processors.base import BaseProcessor
+
+
+class CollectingProcessor(BaseProcessor):
+    """Processor with a per-row and a global step, collects the imported
+    data instead of writing it to a data base."""
+
+    column_map = {
+        "classification": "classification",
+        "datetime": "date",
+        "original_classification": "kind",
+    }
+    global_columns = ("date", "geometry")
+
+    def __init__(self, *, file_path, chunk_size=None):
+        super().__init__(
+            file_path=file_path, dataset_name="Test", chunk_size=chunk_size
+        )
+        self.imported = []
+
+    def process(self):
+        self.data = self.data[self.data["kind"] != "skip"]
+        self.data["classification"] = self.data["kind"].str.upper()
+
+    def finalize(self):
+        # keep the first event per date and location
+        self.data = self.data[
+            ~self.data.assign(wkt=self.data.geometry.to_wkt()).duplicated(
+                ["date", "wkt"]
+            )
+        ]
+
+    def import_to_db(self, file_dump=None):  # noqa: ARG002
+        self.imported.append(self.data.copy())
+
+
+@pytest.fixture
+def source_file(tmp_path):
+    rng = np.random.default_rng(42)
+    n = 103
+    x = rng.choice([500_000.0, 600_000.0, 700_000.0], n)
+    # a few records outside of the region
+    x[:5] = 100_000.0
+    data = gpd.GeoDataFrame(
+        {
+            "date": pd.to_datetime("2020-01-01")
+            + pd.to_timedelta(rng.integers(0, 5, n), unit="D"),
+            "kind": rng.choice(["rockfall", "debris flow", "skip"], n),
+        },
+        geometry=shapely.points(x, np.full(n, 5_300_000.0)),
+        crs=TARGET_CRS,
+    )
+    file_path = tmp_path / "source.gpkg"
+    data.to_file(file_path, driver="GPKG")
+    (tmp_path / "source.meta.json").write_text(json.dumps({"name": "Test"}))
+    return file_path
+
+
+def _imported(processor: CollectingProcessor) -> pd.DataFrame:
+    data = pd.concat(processor.imported, ignore_index=True)
+    columns = ["date", "kind", "classification"]
+    return (
+        data.assign(x=data.geometry.x)[[*columns, "x"]]
+        .sort_values([*columns, "x"])
+        .reset_index(drop=True)
+    )
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 50, 1000])
+def test_stream_matches_single_pass(source_file, chunk_size):
+    single = CollectingProcessor(file_path=source_file)
+    single.run()
+    streamed = CollectingProcessor(
+        file_path=source_file, chunk_size=chunk_size
+    )
+    streamed.run()
+
+    pd.testing.assert_frame_equal(_imported(streamed), _imported(single))
+    assert streamed.counts["read"] == single.counts["read"] == 98
+    assert streamed.counts["cleaned"] == single.counts["cleaned"]
@@ -0,0 +1,81 @@
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+import db.tiles
+from db.tiles import render_tiles
+
+
+class FakeEngine:
+    """Stands in for an engine of an empty data base, records the
+    parameters of the queries."""
+
+    def __init__(self):
+        self.params = []
+        self.disposed = False
+
+    def connect(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, statement, params):  # noqa: ARG002
+        self.params.append(params)
+        return self
+
+    def all(self):
+        return []
+
+    def dispose(self):
+        self.disposed = True
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    engine = FakeEngine()
+    monkeypatch.setattr(db.tiles, "create_db_engine", lambda **_: engine)
+    return engine
+
+
+@pytest.fixture
+def mbtiles_file(tmp_path):
+    """Tiles rendered up to landslide 5 with zoom levels 0 to 12."""
+    file_path = tmp_path / "landslides.mbtiles"
+    with closing(sqlite3.connect(file_path)) as mbtiles, mbtiles:
+        db.tiles._init_mbtiles(mbtiles)
+        db.tiles._write_metadata(
+            mbtiles,
+            {"minzoom": "0", "maxzoom": "12", "max_landslide_id": "5"},
+        )
+        mbtiles.execute("INSERT INTO tiles VALUES (0, 0, 0, x'00')")
+    return file_path
+
+
+def _n_tiles(file_path):
+    with closing(sqlite3.connect(file_path)) as mbtiles:
+        return mbtiles.execute("SELECT count(*) FROM tiles").fetchone()[0]
+
+
+def test_up_to_date(engine, mbtiles_file):
+    assert render_tiles(mbtiles_file, max_zoom=12, min_zoom=0) == 0
+
+    assert engine.params == [{"rendered_until": 5}]
+    assert engine.disposed
+    assert _n_tiles(mbtiles_file) == 1
+
+
+@pytest.mark.parametrize(("min_zoom", "max_zoom"), [(2, 12), (0, 10)])
+def test_other_zoom_levels(engine, mbtiles_file, min_zoom, max_zoom):
+    assert (
+        render_tiles(mbtiles_file, max_zoom=max_zoom, min_zoom=min_zoom) == 0
+    )
+
+    # all records are rendered again
+    assert engine.params == [{"rendered_until": 0}]
+    assert engine.disposed
+    assert _n_tiles(mbtiles_file) == 0
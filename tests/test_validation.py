@@ -0,0 +1,141 @@
+import datetime as dt
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+import shapely
+
+from db import PROCESSORS, get_processor
+from db.constants import TARGET_CRS
+from db.validation import ValidationError, validate_landslides
+
+CLASSIFICATIONS = {"rockfall": 1, "mass movement (undefined type)": 2}
+COLUMN_MAP = {
+    "datetime": "date",
+    "classification": "classification",
+    "original_classification": "original",
+    "report": "report",
+}
+
+
+def _data(column_map, n=3, **columns):
+    data = {
+        column: (
+            pd.date_range("2020-01-01", periods=n)
+            if key == "datetime"
+            else ["rockfall"] * n
+        )
+        for key, column in column_map.items()
+    }
+    return gpd.GeoDataFrame(
+        {**data, **columns},
+        geometry=shapely.points(np.arange(n), np.arange(n)),
+        crs=TARGET_CRS,
+    )
+
+
+def _checks(violations):
+    return {(v.column, v.check.split(":")[0]) for v in violations}
+
+
+@pytest.mark.parametrize("name", list(PROCESSORS))
+def test_builtin_column_maps(name):
+    column_map = get_processor(name).column_map
+    data = _data(column_map)
+
+    assert (
+        validate_landslides(data, column_map, CLASSIFICATIONS, TARGET_CRS)
+        == []
+    )
+
+
+def test_valid_data():
+    data = _data(COLUMN_MAP, report=["a", None, np.nan])
+
+    assert (
+        validate_landslides(data, COLUMN_MAP, CLASSIFICATIONS, TARGET_CRS)
+        == []
+    )
+
+
+def test_all_violations_at_once():
+    data = gpd.GeoDataFrame(
+        {
+            "date": [dt.date(2020, 1, 1), None, "garbage", "2020-01-02"],
+            "classification": ["rockfall", "rockfal", None, "rockfall"],
+            "original": ["a", None, "b", 3],
+        },
+        geometry=[
+            shapely.Point(1, 2),
+            shapely.Point(1, 2, 3),
+            shapely.Point(),
+            shapely.LineString([(0, 0), (1, 1)]),
+        ],
+        crs=TARGET_CRS,
+    )
+
+    violations = validate_landslides(
+        data, COLUMN_MAP, CLASSIFICATIONS, TARGET_CRS
+    )
+
+    assert _checks(violations) == {
+        ("datetime (date)", "are missing"),
+        ("datetime (date)", "are no valid datetimes"),
+        ("classification (classification)", "are missing"),
+        ("classification (classification)", "have an unknown classification"),
+        ("original_classification (original)", "are missing"),
+        ("original_classification (original)", "are no strings"),
+        ("geometry", "are no points"),
+        ("geometry", "are empty"),
+        ("geometry", "have a Z coordinate"),
+    }
+    unknown = next(v for v in violations if "unknown" in v.check)
+    assert unknown.rows.tolist() == [1]
+    assert "rockfal" in unknown.check
+
+
+def test_column_map_errors():
+    column_map = {
+        "datetime": "date",
+        "classification": "missing",
+        "description": "description",
+    }
+    data = _data({"datetime": "date", "description": "description"})
+
+    violations = validate_landslides(
+        data, column_map, CLASSIFICATIONS, TARGET_CRS
+    )
+
+    assert _checks(violations) == {
+        ("original_classification", "are not mapped (column_map)"),
+        ("classification (missing)", "miss the column"),
+        (
+            "description (description)",
+            "are mapped to no column of landslides (column_map)",
+        ),
+    }
+
+
+def test_crs_mismatch():
+    data = _data(COLUMN_MAP).to_crs(4326)
+
+    (violation,) = validate_landslides(
+        data, COLUMN_MAP, CLASSIFICATIONS, TARGET_CRS
+    )
+
+    assert violation.column == "geometry"
+    assert len(violation.rows) == len(data)
+
+
+def test_validation_error_message():
+    data = _data(COLUMN_MAP, n=8, classification=["unknown"] * 8)
+    violations = validate_landslides(
+        data, COLUMN_MAP, CLASSIFICATIONS, TARGET_CRS
+    )
+
+    message = str(ValidationError("Test", violations))
+
+    assert message.startswith("Test data violates the landslides schema:")
+    assert "8 rows have an unknown classification: unknown" in message
+    assert "(0, 1, 2, 3, 4, ...)" in message